@@ -0,0 +1,60 @@
+"""
+Benchmark: perfil de estudiante en modo 'agrupado' vs 'un_shuffle'.
+
+Compara número de tareas del grafo y tiempo de pared de DataTransformer.procesar
+sobre los CSV de data/raw, y verifica que ambos modos producen la misma tabla.
+
+Uso:
+    python benchmarks/bench_perfil_estudiante.py [--data-dir data] [--repeticiones 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import pandas as pd
+from config import settings
+from src.etl.extract import DataExtractor
+from src.etl.transform import DataTransformer
+
+
+def contar_tareas(ddf):
+    return len(ddf.optimize().__dask_graph__())
+
+
+def ordenar(pdf):
+    return pdf.sort_values(list(pdf.columns)).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', default=str(settings.DATA_DIR))
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    extractor = DataExtractor(data_dir=args.data_dir, blocksize=settings.CSV_BLOCKSIZE)
+    ddf_est = extractor.leer_estudiantes()
+    ddf_hist = extractor.leer_historico()
+
+    resultados = {}
+    for modo in DataTransformer.MODOS_PERFIL:
+        ddf_final = DataTransformer(modo_perfil=modo).procesar(ddf_est.copy(), ddf_hist)
+        tareas = contar_tareas(ddf_final)
+        tiempos = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            pdf = ddf_final.compute()
+            tiempos.append(time.perf_counter() - inicio)
+        resultados[modo] = (tareas, min(tiempos), pdf)
+        print(f"{modo:>10}: {tareas:6d} tareas | {min(tiempos):8.3f} s (mejor de {args.repeticiones}) | {len(pdf):,} filas")
+
+    base, nuevo = (resultados[m][2] for m in DataTransformer.MODOS_PERFIL)
+    pd.testing.assert_frame_equal(ordenar(base), ordenar(nuevo[base.columns]), check_categorical=False)
+    print("Salidas idénticas en ambos modos.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: perfiles de escritura Parquet de la tabla maestra.
+
+Reescribe data/curated/master_table.parquet con cada perfil de
+src.etl.perfiles_parquet en un directorio temporal y reporta tamaño en disco,
+número de archivos/row groups y latencia de lectura completa con pandas
+(la lectura que hace el dashboard).
+
+Uso:
+    python benchmarks/bench_perfiles_parquet.py [--entrada data/curated/master_table.parquet] [--repeticiones 5]
+                                                [--particiones 16]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import dask.dataframe as dd
+import pandas as pd
+import pyarrow.parquet as pq
+from config import settings
+from src.etl.load import DataLoader
+from src.etl.perfiles_parquet import PERFILES_PARQUET
+
+
+def medir_disco(ruta):
+    archivos = list(Path(ruta).rglob('*.parquet'))
+    tamano = sum(a.stat().st_size for a in archivos)
+    row_groups = sum(pq.ParquetFile(a).num_row_groups for a in archivos)
+    return tamano, len(archivos), row_groups
+
+
+def medir_lectura(ruta, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        pd.read_parquet(ruta)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entrada', default=str(settings.CURATED_DATA_DIR / "master_table.parquet"))
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--particiones', type=int, default=None,
+                        help="Reparticionar la entrada (simula una corrida con más particiones Dask)")
+    args = parser.parse_args()
+
+    ddf = dd.read_parquet(args.entrada, engine='pyarrow')
+    if args.particiones:
+        ddf = ddf.repartition(npartitions=args.particiones).persist()
+    print(f"Entrada: {args.entrada} ({ddf.npartitions} particiones)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for perfil in PERFILES_PARQUET:
+            # create_engine no abre conexiones: solo se usa la escritura Parquet
+            loader = DataLoader(db_url=settings.DATABASE_URL, perfil_parquet=perfil)
+
+            ruta = Path(tmp) / perfil
+            inicio = time.perf_counter()
+            loader.guardar_parquet(ddf, str(ruta))
+            escritura = time.perf_counter() - inicio
+
+            tamano, archivos, row_groups = medir_disco(ruta)
+            lectura = medir_lectura(ruta, args.repeticiones)
+            print(f"{perfil:>18}: {tamano / 2**20:8.2f} MiB | {archivos:4d} archivos | {row_groups:5d} row groups | "
+                  f"escritura {escritura:7.3f} s | lectura {lectura:7.3f} s (mejor de {args.repeticiones})")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,9 @@ DATA_DIR = BASE_DIR / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 CURATED_DATA_DIR = DATA_DIR / "curated"
 FEATURES_DIR = DATA_DIR / "features"
+CACHE_DATA_DIR = DATA_DIR / "cache"
+MODELS_DIR = DATA_DIR / "models"
+COEFICIENTES_DIR = BASE_DIR / "config" / "coeficientes"
 
 # Base de Datos
 DB_USER = os.getenv("DB_USER", "postgres")
@@ -18,10 +21,45 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "opitlearn")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Driver explícito (requirements.txt instala psycopg2-binary): con "postgresql://",
+# SQLAlchemy >= 2.1 elige psycopg 3
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Cache columnar de CSV crudos: "stat" (tamaño+mtime) o "hash" (contenido)
+EXTRACT_CACHE_HUELLA = os.getenv("EXTRACT_CACHE_HUELLA", "stat")
+# Tamaño de bloque del parser CSV (una partición Dask por bloque)
+CSV_BLOCKSIZE = os.getenv("CSV_BLOCKSIZE", "64MB")
+
+# Construcción del perfil de estudiante: "un_shuffle" o "agrupado" (legado)
+PERFIL_MODO = os.getenv("PERFIL_MODO", "un_shuffle")
+
+# Reconstrucción de master_table: "completo" o "incremental" (solo estudiantes modificados)
+PIPELINE_MODO = os.getenv("PIPELINE_MODO", "completo")
+
+# Particionado Hive de master_table, ej. "programa" o "programa,estrato" (vacío: sin particionar)
+MASTER_PARTICIONES = [c.strip() for c in os.getenv("MASTER_PARTICIONES", "").split(",") if c.strip()]
+
+# Perfil de escritura Parquet de master_table: "lectura_analitica", "archivo_compacto" o "dask"
+PARQUET_PERFIL = os.getenv("PARQUET_PERFIL", "lectura_analitica")
+
+# Cuarentena: filas que violan reglas de validación van a quarantine.parquet en lugar de master_table
+VALIDACION_CUARENTENA = os.getenv("VALIDACION_CUARENTENA", "1") == "1"
+
+# Snapshot Arrow IPC de master_table (master_table.arrow) que los workers del dashboard abren con mmap
+SNAPSHOT_ARROW = os.getenv("SNAPSHOT_ARROW", "1") == "1"
+
+# Scoring en el ETL: modelos del registro (data/models) cuya probabilidad se escribe en master_table,
+# ej. "desercion_logistica,desercion_hist_gb". Los coeficientes de COEFICIENTES_DIR siempre se aplican.
+SCORING_MODELOS = [m.strip() for m in os.getenv("SCORING_MODELOS", "").split(",") if m.strip()]
 
 # Configuración Dask
+# Scheduler: threads | processes | sync | local_cluster | distribuido
+DASK_SCHEDULER = os.getenv("DASK_SCHEDULER", "threads")
 DASK_SCHEDULER_HOST = os.getenv("DASK_SCHEDULER_HOST", "localhost")
+DASK_SCHEDULER_PORT = int(os.getenv("DASK_SCHEDULER_PORT", "8786"))
+DASK_N_WORKERS = int(os.getenv("DASK_N_WORKERS", "0")) or None  # None: según CPUs
+DASK_THREADS_PER_WORKER = int(os.getenv("DASK_THREADS_PER_WORKER", "0")) or None
+DASK_MEMORY_LIMIT = os.getenv("DASK_MEMORY_LIMIT", "auto")  # por worker, ej. "4GB"
 
 # Parámetros Académicos
 MIN_PASSING_GRADE = 3.0
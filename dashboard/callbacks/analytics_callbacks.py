@@ -3,7 +3,10 @@ Analytics page callbacks
 """
 from dash import Input, Output, State, dash_table, html
 import dash_bootstrap_components as dbc
-from components.data_loader import load_master_data, get_filtered_data, get_unique_programs, get_unique_estratos
+from components.data_loader import (
+    load_master_data, get_filtered_data, get_unique_programs, get_unique_estratos,
+    get_metrics_cube, build_filters, memoize_callback
+)
 from components.charts import (
     create_credits_vs_gpa_scatter,
     create_program_distribution_chart,
@@ -55,34 +58,7 @@ def register_callbacks(app):
         if pathname != '/analytics':
             return None, None, None, None
         
-        df = get_filtered_data(programa, estrato)
-        
-        if df.empty:
-            empty_msg = dbc.Alert("No hay datos disponibles con los filtros seleccionados", color="info")
-            return empty_msg, empty_msg, empty_msg, empty_msg
-        
-        # Charts
-        chart1 = create_credits_vs_gpa_scatter(df)
-        chart2 = create_program_distribution_chart(df)
-        heatmap = create_performance_heatmap(df)
-        
-        # Data table
-        display_cols = ['estudiante_id', 'programa', 'promedio_ultimo_semestre', 
-                       'total_creditos_aprobados', 'total_materias_reprobadas']
-        display_cols = [col for col in display_cols if col in df.columns]
-        
-        table = dash_table.DataTable(
-            data=df[display_cols].head(100).to_dict('records'),
-            columns=[{'name': col, 'id': col} for col in display_cols],
-            page_size=10,
-            style_table={'overflowX': 'auto'},
-            style_cell={'textAlign': 'left', 'padding': '10px'},
-            style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'},
-            filter_action="native",
-            sort_action="native",
-        )
-        
-        return chart1, chart2, heatmap, table
+        return analytics_outputs(programa, estrato)
     
     @app.callback(
         Output('filter-programa', 'value'),
@@ -117,3 +93,36 @@ def register_callbacks(app):
         """Export filtered data to Excel"""
         df = get_filtered_data(programa, estrato)
         return dict(content=df.to_excel(index=False, engine='openpyxl'), filename="opitlearn_data.xlsx")
+
+@memoize_callback('analytics')
+def analytics_outputs(programa, estrato):
+    """Analytics charts and table for a filter combination (memoized per data version)"""
+    df = get_filtered_data(programa, estrato)
+    
+    if df.empty:
+        empty_msg = dbc.Alert("No hay datos disponibles con los filtros seleccionados", color="info")
+        return empty_msg, empty_msg, empty_msg, empty_msg
+    
+    # Charts
+    chart1 = create_credits_vs_gpa_scatter(df)
+    chart2 = create_program_distribution_chart(df)
+    heatmap = create_performance_heatmap(df, get_metrics_cube().program_means(build_filters(programa, estrato)))
+    
+    # Data table
+    display_cols = ['estudiante_id', 'programa', 'promedio_ultimo_semestre', 
+                   'total_creditos_aprobados', 'total_materias_reprobadas']
+    display_cols = [col for col in display_cols if col in df.columns]
+    
+    table = dash_table.DataTable(
+        data=df[display_cols].head(100).to_dict('records'),
+        columns=[{'name': col, 'id': col} for col in display_cols],
+        page_size=10,
+        style_table={'overflowX': 'auto'},
+        style_cell={'textAlign': 'left', 'padding': '10px'},
+        style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'},
+        filter_action="native",
+        sort_action="native",
+    )
+    
+    return chart1, chart2, heatmap, table
+
@@ -1,10 +1,9 @@
 """
 Overview page callbacks
 """
-from dash import Input, Output, html
+from dash import Input, Output, State, html, no_update
 import dash_bootstrap_components as dbc
-from components.data_loader import load_master_data
-from components.metrics import calculate_kpis
+from components.data_loader import load_master_data, get_metrics_cube, sync_data_version
 from components.charts import (
     create_kpi_card,
     create_program_distribution_chart,
@@ -25,13 +24,22 @@ def register_callbacks(app):
             Output('chart-gpa-distribution', 'children'),
             Output('chart-estrato-distribution', 'children'),
             Output('quick-stats', 'children'),
+            Output('overview-data-version', 'data'),
         ],
-        Input('overview-interval', 'n_intervals')
+        Input('overview-interval', 'n_intervals'),
+        State('overview-data-version', 'data')
     )
-    def update_overview(n):
+    def update_overview(n, rendered_version):
         """Update all overview components"""
+        # Idle ticks: the data has not changed since this tab last rendered
+        version = sync_data_version()
+        if version == rendered_version:
+            return [no_update] * 9
+        
         df = load_master_data()
-        kpis = calculate_kpis(df)
+        # Aggregates come from the metrics cube (cost depends on cells, not students)
+        cube = get_metrics_cube()
+        kpis = cube.kpis()
         
         # KPI Cards
         kpi_students = create_kpi_card(
@@ -63,16 +71,19 @@ def register_callbacks(app):
         )
         
         # Charts
-        chart_programs = create_program_distribution_chart(df)
+        has_programa = 'programa' in cube.dimensions and not df.empty
+        has_estrato = 'estrato' in cube.dimensions and not df.empty
+        chart_programs = create_program_distribution_chart(df, cube.counts('programa') if has_programa else None)
         chart_gpa = create_gpa_distribution_chart(df)
-        chart_estrato = create_estrato_distribution_pie(df)
+        chart_estrato = create_estrato_distribution_pie(df, cube.counts('estrato') if has_estrato else None)
+        totals = cube.rollup().iloc[0] if not df.empty else None
         
         # Quick stats
         stats = html.Div([
             html.P([html.Strong("Total de Registros: "), f"{len(df):,}"]),
-            html.P([html.Strong("Programas Activos: "), f"{df['programa'].nunique() if not df.empty else 0}"]),
+            html.P([html.Strong("Programas Activos: "), f"{len(cube.counts('programa')) if has_programa else 0}"]),
             html.P([html.Strong("Créditos Promedio: "), 
-                   f"{df['total_creditos_aprobados'].mean():.1f}" if not df.empty and 'total_creditos_aprobados' in df.columns else "N/A"]),
+                   f"{totals['total_creditos_aprobados_mean']:.1f}" if totals is not None and 'total_creditos_aprobados_mean' in totals else "N/A"]),
         ])
         
-        return kpi_students, kpi_gpa, kpi_retention, kpi_risk, chart_programs, chart_gpa, chart_estrato, stats
+        return kpi_students, kpi_gpa, kpi_retention, kpi_risk, chart_programs, chart_gpa, chart_estrato, stats, version
@@ -3,8 +3,8 @@ Predictions page callbacks
 """
 from dash import Input, Output, html, dash_table
 import dash_bootstrap_components as dbc
-from components.data_loader import load_master_data
-from components.metrics import identify_at_risk_students, calculate_risk_scores_vectorized
+from components.data_loader import load_master_data, memoize_callback
+from components.metrics import identify_at_risk_students, calculate_risk_scores_vectorized, risk_levels, HIGH_RISK_SCORE
 import pandas as pd
 import numpy as np
 
@@ -26,66 +26,75 @@ def register_callbacks(app):
         if pathname != '/predictions':
             return "0", "0", "0", None, None
         
-        df = load_master_data()
-        
-        if df.empty:
-            empty_msg = dbc.Alert("No hay datos disponibles", color="info")
-            return "0", "0", "0", empty_msg, empty_msg
-        
-        # Calculate risk scores (Vectorized)
-        df['risk_score'] = calculate_risk_scores_vectorized(df)
-        
-        # Categorize risk levels
-        high_risk = df[df['risk_score'] >= 70]
-        medium_risk = df[(df['risk_score'] >= 40) & (df['risk_score'] < 70)]
-        low_risk = df[df['risk_score'] < 40]
-        
-        # At-risk table
-        at_risk_df = high_risk.copy()
-        if not at_risk_df.empty:
-            display_cols = ['estudiante_id', 'programa', 'promedio_ultimo_semestre', 
-                           'total_materias_reprobadas', 'risk_score']
-            display_cols = [col for col in display_cols if col in at_risk_df.columns]
-            
-            table = dash_table.DataTable(
-                data=at_risk_df[display_cols].head(50).to_dict('records'),
-                columns=[{'name': col, 'id': col} for col in display_cols],
-                page_size=10,
-                style_table={'overflowX': 'auto'},
-                style_cell={'textAlign': 'left', 'padding': '12px', 'backgroundColor': 'rgba(30, 41, 59, 0.7)', 'color': '#f8fafc', 'border': 'none'},
-                style_header={'backgroundColor': '#0f172a', 'fontWeight': 'bold', 'color': '#f8fafc', 'borderBottom': '1px solid #334155'},
-                style_data_conditional=[
-                    {
-                        'if': {'filter_query': '{risk_score} >= 70'},
-                        'backgroundColor': 'rgba(239, 68, 68, 0.2)',
-                        'color': '#fca5a5'
-                    }
-                ],
-                sort_action="native",
-            )
-        else:
-            table = dbc.Alert("No hay estudiantes en alto riesgo", color="success")
+        return prediction_outputs()
+
+@memoize_callback('predictions')
+def prediction_outputs():
+    """Risk counts, at-risk table and recommendations (memoized per data version)"""
+    df = load_master_data()
+    
+    if df.empty:
+        empty_msg = dbc.Alert("No hay datos disponibles", color="info")
+        return "0", "0", "0", empty_msg, empty_msg
+    
+    # Risk scores and levels are precomputed by the ETL scoring stage;
+    # older master tables without them are scored here without touching the cached frame
+    if 'risk_score' not in df.columns:
+        df = df.assign(risk_score=calculate_risk_scores_vectorized(df))
+    risk_level = df['risk_level'] if 'risk_level' in df.columns else risk_levels(df['risk_score'])
+    
+    # Categorize risk levels
+    high_risk = df[risk_level == 'Alto']
+    medium_risk = df[risk_level == 'Medio']
+    low_risk = df[risk_level == 'Bajo']
+    
+    # At-risk table
+    at_risk_df = high_risk.copy()
+    if not at_risk_df.empty:
+        display_cols = ['estudiante_id', 'programa', 'promedio_ultimo_semestre', 
+                       'total_materias_reprobadas', 'risk_score']
+        display_cols += [col for col in at_risk_df.columns if col.startswith('prob_')]
+        display_cols = [col for col in display_cols if col in at_risk_df.columns]
         
-        # Recommendations
-        recommendations = html.Div([
-            dbc.ListGroup([
-                dbc.ListGroupItem([
-                    html.H6("📚 Tutorías Académicas", className="mb-1"),
-                    html.P(f"Asignar tutores a {len(high_risk)} estudiantes de alto riesgo", className="mb-0 small")
-                ]),
-                dbc.ListGroupItem([
-                    html.H6("👥 Asesoría Psicológica", className="mb-1"),
-                    html.P(f"Ofrecer apoyo emocional a estudiantes con múltiples reprobaciones", className="mb-0 small")
-                ]),
-                dbc.ListGroupItem([
-                    html.H6("📊 Monitoreo Continuo", className="mb-1"),
-                    html.P(f"Seguimiento semanal de {len(medium_risk)} estudiantes en riesgo moderado", className="mb-0 small")
-                ]),
-                dbc.ListGroupItem([
-                    html.H6("💰 Apoyo Financiero", className="mb-1"),
-                    html.P("Evaluar becas para estudiantes de estratos bajos con buen desempeño", className="mb-0 small")
-                ]),
-            ])
+        table = dash_table.DataTable(
+            data=at_risk_df[display_cols].head(50).round(3).to_dict('records'),
+            columns=[{'name': col, 'id': col} for col in display_cols],
+            page_size=10,
+            style_table={'overflowX': 'auto'},
+            style_cell={'textAlign': 'left', 'padding': '12px', 'backgroundColor': 'rgba(30, 41, 59, 0.7)', 'color': '#f8fafc', 'border': 'none'},
+            style_header={'backgroundColor': '#0f172a', 'fontWeight': 'bold', 'color': '#f8fafc', 'borderBottom': '1px solid #334155'},
+            style_data_conditional=[
+                {
+                    'if': {'filter_query': f'{{risk_score}} >= {HIGH_RISK_SCORE:g}'},
+                    'backgroundColor': 'rgba(239, 68, 68, 0.2)',
+                    'color': '#fca5a5'
+                }
+            ],
+            sort_action="native",
+        )
+    else:
+        table = dbc.Alert("No hay estudiantes en alto riesgo", color="success")
+    
+    # Recommendations
+    recommendations = html.Div([
+        dbc.ListGroup([
+            dbc.ListGroupItem([
+                html.H6("📚 Tutorías Académicas", className="mb-1"),
+                html.P(f"Asignar tutores a {len(high_risk)} estudiantes de alto riesgo", className="mb-0 small")
+            ]),
+            dbc.ListGroupItem([
+                html.H6("👥 Asesoría Psicológica", className="mb-1"),
+                html.P(f"Ofrecer apoyo emocional a estudiantes con múltiples reprobaciones", className="mb-0 small")
+            ]),
+            dbc.ListGroupItem([
+                html.H6("📊 Monitoreo Continuo", className="mb-1"),
+                html.P(f"Seguimiento semanal de {len(medium_risk)} estudiantes en riesgo moderado", className="mb-0 small")
+            ]),
+            dbc.ListGroupItem([
+                html.H6("💰 Apoyo Financiero", className="mb-1"),
+                html.P("Evaluar becas para estudiantes de estratos bajos con buen desempeño", className="mb-0 small")
+            ]),
         ])
-        
-        return str(len(high_risk)), str(len(medium_risk)), str(len(low_risk)), table, recommendations
+    ])
+    
+    return str(len(high_risk)), str(len(medium_risk)), str(len(low_risk)), table, recommendations
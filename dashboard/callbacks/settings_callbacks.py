@@ -3,7 +3,8 @@ Settings page callbacks
 """
 from dash import Input, Output, html
 import dash_bootstrap_components as dbc
-from components.data_loader import load_master_data, refresh_data
+from components.data_loader import load_master_data, refresh_data, get_data_version
+from components.memo import CALLBACK_CACHE
 from datetime import datetime
 import pandas as pd
 
@@ -33,6 +34,7 @@ def register_callbacks(app):
             return None
         
         df = load_master_data()
+        cache = CALLBACK_CACHE.stats()
         
         info = html.Div([
             html.P([html.Strong("Versión del Sistema: "), "1.0.0"]),
@@ -41,6 +43,10 @@ def register_callbacks(app):
             html.P([html.Strong("Tamaño de Datos: "), f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB" if not df.empty else "0 MB"]),
             html.P([html.Strong("Framework: "), "Dash (Plotly)"]),
             html.P([html.Strong("Backend: "), "Flask + Pandas"]),
+            html.P([html.Strong("Versión de Datos: "), get_data_version()]),
+            html.P([html.Strong("Caché de Callbacks: "),
+                    f"{cache['entries']} resultados, {cache['bytes'] / 1024 / 1024:.1f} / {cache['max_bytes'] / 1024 / 1024:.0f} MB, "
+                    f"{cache['hits']} aciertos / {cache['misses']} fallos ({cache['hit_rate']:.0%})"]),
         ])
         
         return info
@@ -271,8 +271,11 @@ def create_sunburst_chart(df):
     if not all(col in df.columns for col in ['programa', 'estrato']):
         return dcc.Graph(figure=go.Figure())
     
-    # Add risk level
-    if 'total_materias_reprobadas' in df.columns:
+    # Risk level precomputed by the ETL; otherwise derived on a copy (df is the shared cached frame)
+    if 'risk_level' in df.columns:
+        df = df.assign(risk_level=df['risk_level'].astype(str))
+    elif 'total_materias_reprobadas' in df.columns:
+        df = df.copy()
         df['risk_level'] = pd.cut(
             df['total_materias_reprobadas'],
             bins=[-1, 0, 2, 100],
@@ -15,12 +15,17 @@ DARK_LAYOUT = dict(
     margin=dict(l=40, r=40, t=40, b=40)
 )
 
-def create_program_distribution_chart(df):
-    """Create bar chart of student distribution by program"""
-    if df.empty or 'programa' not in df.columns:
+def create_program_distribution_chart(df, counts=None):
+    """
+    Create bar chart of student distribution by program.
+    `counts` (programa, students) from the metrics cube replaces the scan of df.
+    """
+    if counts is not None:
+        program_counts = counts.copy()
+    elif df.empty or 'programa' not in df.columns:
         return dcc.Graph(figure=go.Figure())
-    
-    program_counts = df['programa'].value_counts().reset_index()
+    else:
+        program_counts = df['programa'].value_counts().reset_index()
     program_counts.columns = ['Programa', 'Estudiantes']
     
     fig = px.bar(
@@ -100,12 +105,17 @@ def create_credits_vs_gpa_scatter(df):
     
     return dcc.Graph(figure=fig, config={'displayModeBar': False})
 
-def create_estrato_distribution_pie(df):
-    """Create pie chart of socioeconomic stratum distribution"""
-    if df.empty or 'estrato' not in df.columns:
+def create_estrato_distribution_pie(df, counts=None):
+    """
+    Create pie chart of socioeconomic stratum distribution.
+    `counts` (estrato, students) from the metrics cube replaces the scan of df.
+    """
+    if counts is not None:
+        estrato_counts = counts.copy()
+    elif df.empty or 'estrato' not in df.columns:
         return dcc.Graph(figure=go.Figure())
-    
-    estrato_counts = df['estrato'].value_counts().reset_index()
+    else:
+        estrato_counts = df['estrato'].value_counts().reset_index()
     estrato_counts.columns = ['Estrato', 'Estudiantes']
     estrato_counts['Estrato'] = estrato_counts['Estrato'].astype(str)
     
@@ -122,18 +132,24 @@ def create_estrato_distribution_pie(df):
     
     return dcc.Graph(figure=fig, config={'displayModeBar': False})
 
-def create_performance_heatmap(df):
-    """Create heatmap of performance metrics by program"""
-    if df.empty or 'programa' not in df.columns:
+def create_performance_heatmap(df, metrics=None):
+    """
+    Create heatmap of performance metrics by program.
+    `metrics` (per-program means from the metrics cube) replaces the groupby over df.
+    """
+    if metrics is None:
+        if df.empty or 'programa' not in df.columns:
+            return dcc.Graph(figure=go.Figure())
+        
+        # Calculate metrics by program
+        metrics = df.groupby('programa').agg({
+            'promedio_ultimo_semestre': 'mean',
+            'total_creditos_aprobados': 'mean',
+            'total_materias_reprobadas': 'mean'
+        }).reset_index()
+    elif metrics.empty:
         return dcc.Graph(figure=go.Figure())
     
-    # Calculate metrics by program
-    metrics = df.groupby('programa').agg({
-        'promedio_ultimo_semestre': 'mean',
-        'total_creditos_aprobados': 'mean',
-        'total_materias_reprobadas': 'mean'
-    }).reset_index()
-    
     # Normalize for heatmap
     programs = metrics['programa'].tolist()
     
@@ -1,18 +1,71 @@
 """
 Data loading utilities for OpitLearn Dashboard
 Handles loading and caching of parquet data
+
+Backends (OPITLEARN_DATA_BACKEND):
+- "arrow": memory-map the Arrow IPC snapshot written by the pipeline
+  (master_table.arrow). Column buffers stay in the OS page cache and are
+  shared by every worker process instead of being copied into each one.
+- "parquet": decode master_table.parquet into a private pandas copy.
+- "auto" (default): arrow when the snapshot exists, parquet otherwise.
 """
+import hashlib
+import os
 import pandas as pd
+import pyarrow as pa
 from pathlib import Path
 from functools import lru_cache
+from components.filter_index import FilterIndex
+from components.metrics_cube import MetricsCube
+from components.memo import CALLBACK_CACHE, memoize
 
 # Path to curated data
 DATA_DIR = Path(__file__).parent.parent.parent / "data" / "curated"
 MASTER_TABLE = DATA_DIR / "master_table.parquet"
+MASTER_SNAPSHOT = DATA_DIR / "master_table.arrow"
+DATA_BACKEND = os.getenv("OPITLEARN_DATA_BACKEND", "auto")
+
+def _use_snapshot():
+    if DATA_BACKEND == "arrow":
+        return True
+    return DATA_BACKEND == "auto" and MASTER_SNAPSHOT.exists()
+
+@lru_cache(maxsize=1)
+def _open_snapshot():
+    """Memory-map the Arrow snapshot (zero-copy: no data is read until used)"""
+    source = pa.memory_map(str(MASTER_SNAPSHOT), 'r')
+    return pa.ipc.open_file(source).read_all()
+
+_ARROW_DTYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+    # Nullable Int8/Int16 would be copied into numpy values + mask
+    pa.int8(): pd.ArrowDtype(pa.int8()),
+    pa.int16(): pd.ArrowDtype(pa.int16()),
+}
+
+def _arrow_dtype(arrow_type):
+    # Categoricals would be copied into int8 codes (the snapshot stores int32 indices)
+    if pa.types.is_dictionary(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return _ARROW_DTYPES.get(arrow_type)
+
+def _to_pandas(table):
+    """
+    Pandas view of an Arrow table: float/int64 columns without nulls stay
+    numpy, strings, small integers and dictionaries become pyarrow-backed
+    dtypes; all of them reference the mapped buffers instead of copying.
+    """
+    return table.to_pandas(split_blocks=True, types_mapper=_arrow_dtype)
 
 @lru_cache(maxsize=1)
 def load_master_data():
     """Load the master table with caching"""
+    # Pin the version before reading, so cached results are never newer than the data
+    get_data_version()
+    if _use_snapshot():
+        return _to_pandas(_open_snapshot())
+
     if not MASTER_TABLE.exists():
         # Return empty dataframe if file doesn't exist
         return pd.DataFrame()
@@ -20,36 +73,134 @@ def load_master_data():
     df = pd.read_parquet(MASTER_TABLE)
     return df
 
-def get_filtered_data(programa=None, estrato=None):
-    """Get filtered data based on criteria"""
+def _data_files():
+    """Files the current backend reads"""
+    if _use_snapshot():
+        return [MASTER_SNAPSHOT] if MASTER_SNAPSHOT.exists() else []
+    if MASTER_TABLE.is_dir():
+        return sorted(MASTER_TABLE.rglob('*.parquet'))
+    return [MASTER_TABLE] if MASTER_TABLE.exists() else []
+
+def current_data_version():
+    """
+    Version token of the data on disk: a hash of the name, size and mtime of
+    the files the backend reads. Only stats files, never reads them.
+    """
+    digest = hashlib.sha1()
+    for path in _data_files():
+        stat = path.stat()
+        digest.update(f"{path.relative_to(DATA_DIR)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+@lru_cache(maxsize=1)
+def get_data_version():
+    """Version of the loaded data; changes only when refresh_data reloads"""
+    return current_data_version()
+
+def sync_data_version():
+    """
+    Version of the loaded data, reloading first if the files on disk changed.
+    Cheap when nothing changed (a stat per data file), so it can run on every
+    interval tick.
+    """
+    if current_data_version() != get_data_version():
+        refresh_data()
+    return get_data_version()
+
+def memoize_callback(name=None, **kwargs):
+    """Memoize a callback helper on (loaded data version, name, inputs); see components.memo"""
+    return memoize(get_data_version, name=name, **kwargs)
+
+def load_columns(columns):
+    """
+    Build a frame with only `columns`. With the Arrow snapshot this is a
+    zero-copy view, cheap enough to build per request without caching.
+    """
+    if _use_snapshot():
+        table = _open_snapshot()
+        return _to_pandas(table.select([c for c in columns if c in table.column_names]))
+    df = load_master_data()
+    return df[[c for c in columns if c in df.columns]]
+
+@lru_cache(maxsize=1)
+def get_filter_index():
+    """Filter index of the loaded master table (built once per data load)"""
+    return FilterIndex(load_master_data())
+
+def _selection(value):
+    """Normalize a filter input: None/"Todos"/empty multi-select mean no filter"""
+    if value is None or value == "Todos":
+        return None
+    if isinstance(value, (list, set)):
+        value = [v for v in value if v != "Todos"]
+        return value or None
+    return value
+
+@lru_cache(maxsize=1)
+def get_metrics_cube():
+    """Metrics cube of the loaded master table (built once per data load)"""
+    return MetricsCube(load_master_data())
+
+def build_filters(programa=None, estrato=None, semestre=None):
+    """
+    Filter spec shared by get_filtered_data and the metrics cube.
+    Each filter takes a value, a list of values (any of them) or a
+    (low, high) tuple for an inclusive range, e.g. estrato=(1, 3).
+    """
+    return {
+        'programa': _selection(programa),
+        'estrato': _selection(estrato),
+        'ultimo_semestre_cursado': _selection(semestre),
+    }
+
+def get_filtered_data(programa=None, estrato=None, semestre=None):
+    """Get filtered data based on criteria (see build_filters)"""
     df = load_master_data()
     
     if df.empty:
         return df
     
+    positions = get_filter_index().positions(build_filters(programa, estrato, semestre))
+    if positions is None:
+        return df
+    return df.take(positions)
+
+def load_partition(programa=None, estrato=None, columns=None):
+    """
+    Read only the rows for a programa/estrato without loading the whole table.
+    On a Hive-partitioned master table (programa=X/estrato=Y) the filter prunes
+    whole directories, so one program only touches that program's files.
+    """
+    if not MASTER_TABLE.exists():
+        return pd.DataFrame()
+
+    filters = []
     if programa and programa != "Todos":
-        df = df[df['programa'] == programa]
-    
+        filters.append(('programa', '==', programa))
     if estrato and estrato != "Todos":
-        df = df[df['estrato'] == int(estrato)]
-    
-    return df
+        filters.append(('estrato', '==', int(estrato)))
+
+    return pd.read_parquet(MASTER_TABLE, columns=columns, filters=filters or None)
 
 def get_unique_programs():
     """Get list of unique programs"""
-    df = load_master_data()
-    if df.empty or 'programa' not in df.columns:
-        return []
-    return sorted(df['programa'].dropna().unique().tolist())
+    return [value for value, _ in get_filter_index().catalog('programa')]
 
 def get_unique_estratos():
     """Get list of unique estratos"""
-    df = load_master_data()
-    if df.empty or 'estrato' not in df.columns:
-        return []
-    return sorted(df['estrato'].dropna().unique().tolist())
+    return [value for value, _ in get_filter_index().catalog('estrato')]
+
+def get_dimension_catalog():
+    """Values and row counts of every indexed filter dimension"""
+    index = get_filter_index()
+    return {name: index.catalog(name) for name in index.dimensions}
 
 def refresh_data():
     """Clear cache and reload data"""
+    _open_snapshot.cache_clear()
     load_master_data.cache_clear()
+    get_filter_index.cache_clear()
+    get_metrics_cube.cache_clear()
+    get_data_version.cache_clear()
+    CALLBACK_CACHE.clear()
     return load_master_data()
@@ -0,0 +1,112 @@
+"""
+Filter index for the master table
+Built once per data load; answers filter queries without scanning columns
+
+For every dimension the index keeps:
+- a sorted catalog of its values (with row counts) for the filter dropdowns;
+- one packed bitmap per value (1 bit per row);
+- the row positions of each value, grouped by value (CSR layout).
+
+A filter value can be a scalar, a list/set (multi-select, OR) or a
+(low, high) tuple (inclusive range). Filters on different dimensions are
+combined with AND.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ('programa', 'estrato', 'ultimo_semestre_cursado')
+
+class _Dimension:
+    """Catalog, bitmaps and row positions of one column"""
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values, sort=True)
+        self.n_rows = len(codes)
+        self.values = [v.item() if isinstance(v, np.generic) else v for v in uniques]
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        # Accept the dropdown's string form ("3") as well as the value itself
+        self.lookup = {}
+        for code, value in enumerate(self.values):
+            self.lookup[value] = code
+            self.lookup.setdefault(str(value), code)
+
+        order = np.argsort(codes, kind='stable')
+        self.offsets = np.searchsorted(codes[order], np.arange(len(self.values) + 1))
+        self.positions = order.astype(np.int64)
+        self.bitmaps = np.zeros((len(self.values), (self.n_rows + 7) // 8), dtype=np.uint8)
+        for code in range(len(self.values)):
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[self.rows(code)] = True
+            self.bitmaps[code] = np.packbits(mask)
+
+    def rows(self, code):
+        return self.positions[self.offsets[code]:self.offsets[code + 1]]
+
+    def codes(self, selection):
+        """Value codes matched by a scalar, a list/set or a (low, high) range"""
+        if isinstance(selection, tuple):
+            low, high = selection
+            return [
+                code for code, value in enumerate(self.values)
+                if (low is None or value >= type(value)(low)) and (high is None or value <= type(value)(high))
+            ]
+        if not isinstance(selection, (list, set, frozenset)):
+            selection = [selection]
+        return sorted({self.lookup[v] for v in selection if v in self.lookup})
+
+class FilterIndex:
+    """Row-position and bitmap index over the filter dimensions of a dataframe"""
+
+    def __init__(self, df, dimensions=DIMENSIONS):
+        self.n_rows = len(df)
+        self.dimensions = {
+            name: _Dimension(df[name].to_numpy())
+            for name in dimensions if name in df.columns
+        }
+
+    def catalog(self, name):
+        """Sorted values of a dimension with their row counts"""
+        dimension = self.dimensions.get(name)
+        if dimension is None:
+            return []
+        return [(value, int(count)) for value, count in zip(dimension.values, dimension.counts)]
+
+    def positions(self, filters):
+        """
+        Sorted row positions matching all `filters` ({dimension: selection}),
+        or None when no filter applies (all rows).
+        """
+        selected = {
+            name: self.dimensions[name].codes(selection)
+            for name, selection in filters.items()
+            if selection is not None
+        }
+        if not selected:
+            return None
+
+        if len(selected) == 1:
+            # One dimension: the positions are stored grouped by value
+            (name, codes), = selected.items()
+            dimension = self.dimensions[name]
+            if len(codes) == 1:
+                return dimension.rows(codes[0])
+            rows = [dimension.rows(code) for code in codes]
+            return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+        bits = None
+        for name, codes in selected.items():
+            dimension = self.dimensions[name]
+            if not codes:
+                return np.empty(0, dtype=np.int64)
+            union = np.bitwise_or.reduce(dimension.bitmaps[codes], axis=0)
+            bits = union if bits is None else np.bitwise_and(bits, union, out=bits)
+        return _bit_positions(bits, self.n_rows)
+
+def _bit_positions(bits, n_rows):
+    """Positions of the set bits of a packed bitmap"""
+    nonzero = np.flatnonzero(bits != 0)
+    if len(nonzero) * 4 < len(bits):
+        # Selective filter: only unpack the bytes that have a set bit
+        rows, offsets = np.nonzero(np.unpackbits(bits[nonzero, None], axis=1).view(bool))
+        return nonzero[rows] * 8 + offsets
+    return np.flatnonzero(np.unpackbits(bits, count=n_rows).view(bool))
@@ -0,0 +1,141 @@
+"""
+Memoization of callback outputs
+Results are keyed by (data version, callback name, normalized inputs)
+
+Entries are evicted least-recently-used first once the cached outputs exceed
+a memory ceiling (OPITLEARN_CALLBACK_CACHE_MB, default 256). Sizes are
+estimated once, on insert, by walking each output (array buffers, strings,
+containers) instead of serializing it. Keys carry the data version,
+so results of an older load are never served; refresh_data also clears the
+cache so their memory is released at once.
+"""
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+
+class CallbackMemo:
+    """Thread-safe LRU cache with byte accounting and hit/miss counters"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        size = _size_of(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+def _size_of(value):
+    """
+    Approximate memory held by a callback output: buffer sizes of arrays and
+    frames plus container and string overheads. Much cheaper than pickling
+    the plotly figures it walks through.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        if getattr(value, 'dtype', None) == object and value.size:
+            # Object arrays (e.g. customdata): pointers plus the objects, estimated
+            # from a sample; repeated objects (category labels) are counted once
+            sample = np.ravel(value)[:64]
+            distinct = {id(v): v for v in sample}.values()
+            nbytes += value.size * sum(map(_size_of, distinct)) // len(sample)
+        return nbytes
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(deep=False).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size_of(k) + _size_of(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_size_of(v) for v in value)
+    if isinstance(getattr(value, '_data', None), list) and hasattr(value, '_layout'):
+        # plotly figure: its raw trace/layout dicts (to_plotly_json would deep-copy them)
+        return _size_of(value._data) + _size_of(value._layout)
+    to_json = getattr(value, 'to_plotly_json', None)
+    if to_json is not None:
+        # Dash component: its props, including children and figures
+        return _size_of(to_json())
+    return sys.getsizeof(value)
+
+def normalize_inputs(*args):
+    """
+    Default key for callback inputs: "Todos"/empty selections as None,
+    multi-selects (lists/sets) sorted. Tuples are (low, high) ranges and keep
+    their order.
+    """
+    normalized = []
+    for value in args:
+        if value == "Todos" or value == [] or value == "":
+            value = None
+        elif isinstance(value, (list, set)):
+            value = tuple(sorted(str(v) for v in value if v != "Todos")) or None
+        normalized.append(value)
+    return tuple(normalized)
+
+CALLBACK_CACHE = CallbackMemo(int(float(os.getenv("OPITLEARN_CALLBACK_CACHE_MB", "256")) * 1024 * 1024))
+
+def memoize(version, name=None, normalize=normalize_inputs, cache=CALLBACK_CACHE):
+    """
+    Decorator: memoize `func(*args)` on (version(), name, normalize(*args)).
+    `version` returns the version of the data the callback reads.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = (version(), label, normalize(*args))
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = func(*args)
+            cache.put(key, value)
+            return value
+
+        return wrapper
+    return decorator
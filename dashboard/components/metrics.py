@@ -1,8 +1,19 @@
 """
 KPI and metrics calculation for OpitLearn Dashboard
 """
+import sys
+from pathlib import Path
 import pandas as pd
-import numpy as np
+
+# Risk score formula and bands are shared with the ETL scoring stage (src/models/scoring.py)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from src.models.scoring import BANDAS_RIESGO, banda_riesgo, puntaje_riesgo
+
+# Lowest risk score of the 'Alto' band
+HIGH_RISK_SCORE = BANDAS_RIESGO[0][0]
 
 def calculate_kpis(df):
     """Calculate key performance indicators from dataframe"""
@@ -80,55 +91,21 @@ def identify_at_risk_students(df, threshold_gpa=3.0, threshold_failed=3):
 def calculate_risk_scores_vectorized(df):
     """
     Calculate risk scores for the entire dataframe utilizing vectorization (0-100).
-    Faster than row-by-row application.
+    Same formula as the ETL `risk_score` column (GPA 40, failed courses 30, credits 30).
     """
     if df.empty:
         return pd.Series(dtype=float)
+    return pd.Series(puntaje_riesgo(df), index=df.index)
 
-    scores = pd.Series(0.0, index=df.index)
-
-    # GPA component (40 points)
-    if 'promedio_ultimo_semestre' in df.columns:
-        gpa = df['promedio_ultimo_semestre'].fillna(3.0)  # Neutral fill
-        gpa_score = np.maximum(0, (3.0 - gpa) / 3.0 * 40)
-        scores += gpa_score
-
-    # Failed courses component (30 points)
-    if 'total_materias_reprobadas' in df.columns:
-        failed = df['total_materias_reprobadas'].fillna(0)
-        failed_score = np.minimum(failed / 5 * 30, 30)
-        scores += failed_score
-
-    # Credit progress component (30 points)
-    if 'total_creditos_aprobados' in df.columns:
-        credits_aprob = df['total_creditos_aprobados'].fillna(30) # Neutral fill
-        credits_score = np.maximum(0, (30 - credits_aprob) / 30 * 30)
-        scores += credits_score
-    
-    return np.minimum(scores, 100)
+def risk_levels(scores):
+    """
+    Risk level per score with the ETL bands (BANDAS_RIESGO): Alto, Medio, Bajo.
+    """
+    return pd.Series(banda_riesgo(scores), index=scores.index)
 
 def calculate_risk_score(row):
     """
     Calculate risk score for a student (0-100) - Legacy row-wise version.
     Kept for backward compatibility if needed, but vectorized is preferred.
     """
-    score = 0
-    
-    # GPA component (40 points)
-    if 'promedio_ultimo_semestre' in row and pd.notna(row['promedio_ultimo_semestre']):
-        gpa = row['promedio_ultimo_semestre']
-        if gpa < 3.0:
-            score += (3.0 - gpa) / 3.0 * 40
-    
-    # Failed courses component (30 points)
-    if 'total_materias_reprobadas' in row and pd.notna(row['total_materias_reprobadas']):
-        failed = row['total_materias_reprobadas']
-        score += min(failed / 5 * 30, 30)
-    
-    # Credit progress component (30 points)
-    if 'total_creditos_aprobados' in row and pd.notna(row['total_creditos_aprobados']):
-        credits_val = row['total_creditos_aprobados']
-        if credits_val < 30:  # Assuming 30 is low
-            score += (30 - credits_val) / 30 * 30
-    
-    return min(score, 100)
+    return float(puntaje_riesgo(pd.DataFrame([row]))[0])
@@ -0,0 +1,220 @@
+"""
+Pre-aggregated metrics cube for the dashboard
+Sufficient statistics per programa x estrato x ultimo_semestre_cursado cell
+
+Built once per data load. Every cell keeps, for each measure column, the
+non-null count, sum, sum of squares, min, max and null count, plus the
+threshold counts used by the KPIs. Means, standard deviations and counts
+for any filter and any grouping are rolled up from the cells, so their cost
+depends on the number of cells and not on the number of students.
+"""
+import numpy as np
+import pandas as pd
+from components.filter_index import DIMENSIONS
+
+MEASURES = ('promedio_ultimo_semestre', 'total_creditos_aprobados', 'total_materias_reprobadas')
+
+# KPI thresholds (same as calculate_kpis)
+THRESHOLDS = {
+    'gpa_below_3': ('promedio_ultimo_semestre', '<', 3.0),
+    'credits_above_0': ('total_creditos_aprobados', '>', 0),
+    'failed_above_3': ('total_materias_reprobadas', '>', 3),
+}
+
+# cohort_stats columns (same as perform_cohort_analysis)
+COHORT_COLUMNS = {
+    'ultimo_semestre_cursado': 'Semestre',
+    'students': 'Total Estudiantes',
+    'promedio_ultimo_semestre_mean': 'Promedio GPA',
+    'total_creditos_aprobados_mean': 'Créditos Promedio',
+    'total_materias_reprobadas_mean': 'Materias Reprobadas Promedio',
+}
+
+class MetricsCube:
+    """Cube of sufficient statistics with a roll-up query layer"""
+
+    def __init__(self, df):
+        self.dimensions = [d for d in DIMENSIONS if d in df.columns]
+        self.measures = [m for m in MEASURES if m in df.columns]
+        self.cells = self._build(df)
+
+    def _build(self, df):
+        data = {name: df[name] for name in self.dimensions}
+        data['students'] = np.ones(len(df), dtype=np.int64)
+        for measure in self.measures:
+            values = df[measure].astype('float64')
+            data[f'{measure}__n'] = values.notna().astype(np.int64)
+            data[f'{measure}__sum'] = values
+            data[f'{measure}__sumsq'] = values * values
+            data[f'{measure}__min'] = values
+            data[f'{measure}__max'] = values
+        for name, (measure, op, limit) in THRESHOLDS.items():
+            if measure in self.measures:
+                values = df[measure].astype('float64')
+                data[name] = (values < limit if op == '<' else values > limit).astype(np.int64)
+        frame = pd.DataFrame(data)
+        if not self.dimensions:
+            frame['_all'] = 0
+        keys = self.dimensions or ['_all']
+        cells = frame.groupby(keys, dropna=False, observed=True, sort=True).agg(
+            {col: self._reducer(col) for col in frame.columns if col not in keys}
+        )
+        return cells.reset_index()
+
+    @staticmethod
+    def _reducer(column):
+        if column.endswith('__min'):
+            return 'min'
+        if column.endswith('__max'):
+            return 'max'
+        return 'sum'
+
+    def _index(self):
+        """Numpy view of the cells: dimension codes and statistic blocks"""
+        if hasattr(self, '_codes'):
+            return
+        self._codes, self._values = {}, {}
+        for name in self.dimensions:
+            codes, uniques = pd.factorize(self.cells[name], sort=True)
+            self._codes[name] = codes
+            self._values[name] = uniques
+        stats = [c for c in self.cells.columns if c not in self.dimensions and c != '_all']
+        self._stats = {
+            kind: [c for c in stats if self._reducer(c) == kind] for kind in ('sum', 'min', 'max')
+        }
+        self._blocks = {kind: self.cells[cols].to_numpy(dtype=np.float64) for kind, cols in self._stats.items()}
+
+    def _allowed(self, name, selection):
+        """Boolean lookup over the sorted values of `name` for one filter selection"""
+        values = self._values[name]
+        numeric = pd.api.types.is_numeric_dtype(values)
+        if isinstance(selection, tuple):
+            low, high = selection
+            allowed = np.ones(len(values), dtype=bool)
+            if low is not None:
+                allowed &= np.asarray(values >= (float(low) if numeric else low), dtype=bool)
+            if high is not None:
+                allowed &= np.asarray(values <= (float(high) if numeric else high), dtype=bool)
+            return allowed
+        wanted = selection if isinstance(selection, (list, set, frozenset)) else [selection]
+        if numeric:
+            return np.asarray(values.isin(pd.to_numeric(pd.Series(list(wanted)), errors='coerce').dropna()), dtype=bool)
+        return np.asarray(values.astype(str).isin([str(v) for v in wanted]), dtype=bool)
+
+    def _mask(self, filters):
+        self._index()
+        mask = np.ones(len(self.cells), dtype=bool)
+        for name, selection in (filters or {}).items():
+            if selection is None or name not in self._codes:
+                continue
+            codes = self._codes[name]
+            # Cells with a null key (code -1) never match a filter
+            allowed = np.append(self._allowed(name, selection), False)
+            mask &= allowed[codes]
+        return mask
+
+    def select(self, filters=None):
+        """Cells matching `filters` ({dimension: value, list of values or (low, high) range})"""
+        return self.cells[self._mask(filters)]
+
+    def rollup(self, by=(), filters=None):
+        """
+        Statistics grouped by the dimensions in `by` (all selected cells when empty):
+        students, <measure>_count/_mean/_std/_min/_max/_nulls and threshold counts.
+        Groups with a null key are dropped, as in pandas groupby.
+        """
+        mask = self._mask(filters)
+        by = [b for b in by if b in self.dimensions]
+        for name in by:
+            mask &= self._codes[name] >= 0
+
+        if by:
+            # Mixed-radix group key over the codes of the `by` dimensions
+            key = np.zeros(int(mask.sum()), dtype=np.int64)
+            for name in by:
+                key = key * len(self._values[name]) + self._codes[name][mask]
+            groups, inverse = np.unique(key, return_inverse=True)
+        else:
+            groups, inverse = np.zeros(1, dtype=np.int64), np.zeros(int(mask.sum()), dtype=np.int64)
+
+        # Cells sorted by group: each group is a contiguous run reduced with reduceat
+        order = np.argsort(inverse, kind='stable')
+        starts = np.searchsorted(inverse[order], np.arange(len(groups)))
+        blocks = {}
+        for kind, init, reducer in (('sum', 0.0, np.add), ('min', np.inf, np.fmin), ('max', -np.inf, np.fmax)):
+            rows = self._blocks[kind][mask][order]
+            if len(rows):
+                out = reducer.reduceat(rows, starts, axis=0)
+            else:
+                out = np.full((len(groups), len(self._stats[kind])), init)
+            blocks.update(zip(self._stats[kind], out.T))
+        for kind, empty in (('min', np.inf), ('max', -np.inf)):
+            for column in self._stats[kind]:
+                blocks[column] = np.where(blocks[column] == empty, np.nan, blocks[column])
+
+        result = {}
+        if by:
+            remainder = groups
+            for name in reversed(by):
+                radix = len(self._values[name])
+                result[name] = np.asarray(self._values[name])[remainder % radix]
+                remainder = remainder // radix
+            result = {name: result[name] for name in by}
+        result['students'] = blocks['students'].astype(np.int64)
+        for threshold in THRESHOLDS:
+            if threshold in blocks:
+                result[threshold] = blocks[threshold].astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for measure in self.measures:
+                n = blocks[f'{measure}__n']
+                mean = np.where(n > 0, blocks[f'{measure}__sum'] / n, np.nan)
+                variance = np.where(n > 1, (blocks[f'{measure}__sumsq'] - n * mean * mean) / (n - 1), np.nan)
+                result[f'{measure}_count'] = n.astype(np.int64)
+                result[f'{measure}_mean'] = mean
+                result[f'{measure}_std'] = np.sqrt(np.maximum(variance, 0))
+                result[f'{measure}_min'] = blocks[f'{measure}__min']
+                result[f'{measure}_max'] = blocks[f'{measure}__max']
+                result[f'{measure}_nulls'] = result['students'] - result[f'{measure}_count']
+        return pd.DataFrame(result)
+
+    def kpis(self, filters=None):
+        """Same output as calculate_kpis, from the cube"""
+        totals = self.rollup(filters=filters).iloc[0]
+        if totals['students'] == 0:
+            return {'total_students': 0, 'avg_gpa': 0, 'retention_rate': 0, 'at_risk_count': 0}
+        students = int(totals['students'])
+        gpa = totals.get('promedio_ultimo_semestre_mean', np.nan)
+        return {
+            'total_students': students,
+            'avg_gpa': gpa if pd.notna(gpa) else 0,
+            'retention_rate': totals['credits_above_0'] / students * 100 if 'credits_above_0' in totals else 0,
+            'at_risk_count': int(totals.get('gpa_below_3', 0) + totals.get('failed_above_3', 0)),
+        }
+
+    def counts(self, dimension, filters=None):
+        """Students per value of `dimension`, largest first (like value_counts)"""
+        counts = self.rollup([dimension], filters)[[dimension, 'students']]
+        return counts.sort_values('students', ascending=False, kind='stable').reset_index(drop=True)
+
+    def program_stats(self, filters=None):
+        """Same output as calculate_program_stats"""
+        stats = self.rollup(['programa'], filters)
+        stats = stats[['programa', 'students', 'promedio_ultimo_semestre_mean', 'total_creditos_aprobados_mean']]
+        stats.columns = ['Programa', 'Total Estudiantes', 'Promedio GPA', 'Créditos Promedio']
+        return stats
+
+    def program_means(self, filters=None):
+        """Per-program means of the measures (performance heatmap input)"""
+        means = self.rollup(['programa'], filters)
+        return means[['programa'] + [f'{m}_mean' for m in self.measures]].rename(
+            columns={f'{m}_mean': m for m in self.measures}
+        )
+
+    def cohort_stats(self, filters=None):
+        """Same output as perform_cohort_analysis"""
+        if 'ultimo_semestre_cursado' not in self.dimensions:
+            return pd.DataFrame()
+        stats = self.rollup(['ultimo_semestre_cursado'], filters)
+        stats = stats[['ultimo_semestre_cursado', 'students'] + [f'{m}_mean' for m in self.measures]]
+        # Measures missing from the table stay as NaN columns, so the cohort chart keeps its layout
+        return stats.rename(columns=COHORT_COLUMNS).reindex(columns=list(COHORT_COLUMNS.values()))
@@ -56,6 +56,8 @@ def create_layout():
         ]),
         
         # Hidden div for triggering updates
-        dcc.Interval(id='overview-interval', interval=60000, n_intervals=0)
+        dcc.Interval(id='overview-interval', interval=60000, n_intervals=0),
+        # Data version last rendered by this tab (ticks with the same version are skipped)
+        dcc.Store(id='overview-data-version')
         
     ], fluid=True)
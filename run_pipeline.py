@@ -1,6 +1,8 @@
 import logging
 import sys
 from pathlib import Path
+import dask
+import pandas as pd
 
 # Configurar path
 ROOT_DIR = Path(__file__).resolve().parent.parent
@@ -11,6 +13,10 @@ from opitlearn.src.etl.extract import DataExtractor
 from opitlearn.src.etl.transform import DataTransformer
 from opitlearn.src.etl.load import DataLoader
 from opitlearn.src.validation.validator import AcademicValidator
+from opitlearn.src.validation.reglas import REGLAS_ACADEMICAS, firma_reglas
+from opitlearn.src.models.scoring import EtapaScoring
+from opitlearn.src.utils.ejecuciones import ContadorEjecuciones
+from opitlearn.src.utils.cluster import scheduler_dask, direccion_scheduler, MonitorUtilizacion
 
 def configurar_logs():
     logging.basicConfig(
@@ -19,42 +25,142 @@ def configurar_logs():
         handlers=[logging.StreamHandler()]
     )
 
+def ejecutar_etapas(extractor, transformer, loader, validator, scoring, logger):
+    """
+    Extracción, transformación (completa o incremental), scoring, carga y validación completa de la salida.
+    """
+    # 1. Extracción
+    ddf_estudiantes = extractor.leer_estudiantes()
+    ddf_historico = extractor.leer_historico()
+
+    logger.info(f"Estudiantes cargados (lazy): {ddf_estudiantes.npartitions} particiones")
+    logger.info(f"Historico cargado (lazy): {ddf_historico.npartitions} particiones")
+
+    # 2. Estado de la última ejecución
+    output_path = settings.CURATED_DATA_DIR / "master_table.parquet"
+    quarantine_path = settings.CURATED_DATA_DIR / "quarantine.parquet"
+    cuarentena = settings.VALIDACION_CUARENTENA
+    estado_previo = loader.leer_estado_ejecucion(output_path)
+    resumen = {'modo_perfil': transformer.modo_perfil, 'firmas_esquema': extractor.firmas_esquema(),
+               'particiones': loader.particiones,
+               'firma_reglas': firma_reglas(REGLAS_ACADEMICAS) if cuarentena else None,
+               'firma_scoring': scoring.firma()}
+
+    incremental = (
+        settings.PIPELINE_MODO == 'incremental'
+        and estado_previo is not None
+        and estado_previo[0].get('modo_perfil') == resumen['modo_perfil']
+        and estado_previo[0].get('firmas_esquema') == resumen['firmas_esquema']
+        and estado_previo[0].get('particiones') == resumen['particiones']
+        and estado_previo[0].get('firma_reglas') == resumen['firma_reglas']
+        and estado_previo[0].get('firma_scoring') == resumen['firma_scoring']
+    )
+    if settings.PIPELINE_MODO == 'incremental' and not incremental:
+        logger.info("Sin estado previo compatible: se hace reconstrucción completa.")
+
+    # Huellas lazy: comparten la lectura de los datos crudos con la escritura
+    huellas_lazy = transformer.calcular_huellas(ddf_estudiantes, ddf_historico, compute=False)
+
+    if incremental:
+        # 3. Transformación solo de estudiantes nuevos o modificados
+        huellas = transformer.ensamblar_huellas(*dask.compute(*huellas_lazy))
+        cambiados, eliminados = transformer.detectar_cambios(huellas, estado_previo[1])
+        logger.info(f"Incremental: {len(cambiados)} estudiantes nuevos/modificados, {len(eliminados)} eliminados")
+        if cambiados or eliminados:
+            ddf_delta = scoring.aplicar(transformer.procesar_incremental(ddf_estudiantes, ddf_historico, cambiados))
+            escrituras = []
+            if cuarentena:
+                ddf_delta, ddf_delta_cuarentena, _ = validator.separar_cuarentena(ddf_delta)
+                escrituras.append(loader.actualizar_parquet(
+                    ddf_delta_cuarentena, str(quarantine_path), cambiados + eliminados, compute=False))
+            escrituras.append(loader.actualizar_parquet(
+                ddf_delta, str(output_path), cambiados + eliminados, compute=False))
+            # Cuarentena y tabla maestra comparten el delta: una sola ejecución del grafo
+            dask.compute(*escrituras)
+        resumen.update(modo='incremental', recalculados=len(cambiados), eliminados=len(eliminados))
+
+        if cuarentena:
+            # Toda fila inválida está en cuarentena: los conteos salen de sus etiquetas
+            df_cuarentena = loader.leer_particiones(quarantine_path) if loader.existe_parquet(quarantine_path) \
+                else pd.DataFrame({'reglas_violadas': pd.Series(dtype='string')})
+            violaciones = validator.contar_cuarentena(df_cuarentena)
+        else:
+            # Validación completa sobre la tabla ya fusionada: estadísticas de footers primero,
+            # solo se decodifican los row groups que podrían violar alguna regla
+            violaciones, _ = validator.validar_parquet(output_path)
+    else:
+        # 3. Transformación y Merge
+        ddf_final = transformer.procesar(ddf_estudiantes, ddf_historico)
+
+        # Scoring: puntaje, banda y probabilidades quedan en la tabla maestra (lazy, misma pasada)
+        ddf_final = scoring.aplicar(ddf_final)
+
+        # 4. Validación en la misma pasada: las filas inválidas van a cuarentena
+        escrituras = []
+        if cuarentena:
+            ddf_final, ddf_cuarentena, violaciones_lazy = validator.separar_cuarentena(ddf_final)
+            escrituras.append(loader.guardar_parquet(ddf_cuarentena, str(quarantine_path), compute=False))
+        else:
+            violaciones_lazy = validator.validar_dataset(ddf_final, compute=False)
+
+        # 5. Carga: tabla final, cuarentena, conteos y huellas se materializan en una sola ejecución
+        escrituras.append(loader.guardar_parquet(ddf_final, str(output_path), compute=False))
+        _, violaciones, huella_est, huella_hist = dask.compute(escrituras, violaciones_lazy, *huellas_lazy)
+        huellas = transformer.ensamblar_huellas(huella_est, huella_hist)
+        logger.info(f"Datos guardados en Parquet: {output_path}")
+        if cuarentena:
+            logger.info(f"Filas inválidas en cuarentena: {quarantine_path}")
+        resumen.update(modo='completo')
+
+    # Validación de salida: violaciones por regla sobre todas las filas
+    resumen['violaciones'] = validator.registrar_violaciones(violaciones)
+
+    if settings.SNAPSHOT_ARROW:
+        loader.guardar_snapshot_arrow(output_path, settings.CURATED_DATA_DIR / "master_table.arrow")
+
+    loader.guardar_estado_ejecucion(output_path, huellas, resumen)
+
+    # Vista previa desde la salida ya escrita
+    muestra = loader.leer_muestra(output_path)
+    logger.info("\nVista previa de datos curados:\n" + str(muestra.head()))
+
 def main():
     configurar_logs()
     logger = logging.getLogger("Orquestador")
     logger.info("Iniciando Pipeline OpitLearn con Datos Reales...")
 
-    extractor = DataExtractor(data_dir=settings.DATA_DIR)
-    transformer = DataTransformer()
-    loader = DataLoader(db_url=settings.DATABASE_URL)
+    extractor = DataExtractor(
+        data_dir=settings.DATA_DIR,
+        cache_dir=settings.CACHE_DATA_DIR,
+        huella=settings.EXTRACT_CACHE_HUELLA,
+        blocksize=settings.CSV_BLOCKSIZE
+    )
+    transformer = DataTransformer(modo_perfil=settings.PERFIL_MODO)
+    loader = DataLoader(
+        db_url=settings.DATABASE_URL,
+        particiones=settings.MASTER_PARTICIONES,
+        perfil_parquet=settings.PARQUET_PERFIL
+    )
     validator = AcademicValidator()
+    scoring = EtapaScoring.desde_configuracion(
+        coeficientes_dir=settings.COEFICIENTES_DIR,
+        registro_dir=settings.MODELS_DIR,
+        modelos=settings.SCORING_MODELOS
+    )
 
     try:
-        # 1. Extracción
-        ddf_estudiantes = extractor.leer_estudiantes()
-        ddf_historico = extractor.leer_historico()
-        
-        logger.info(f"Estudiantes cargados (lazy): {ddf_estudiantes.npartitions} particiones")
-        logger.info(f"Historico cargado (lazy): {ddf_historico.npartitions} particiones")
-
-        # 2. Transformación y Merge
-        ddf_final = transformer.procesar(ddf_estudiantes, ddf_historico)
-        
-        # 3. Validación (sobre una muestra o todo si es pequeño)
-        # Al ser lazy, esto no ejecuta todavía.
-        
-        # 4. Carga
-        output_path = settings.CURATED_DATA_DIR / "master_table.parquet"
-        loader.guardar_parquet(ddf_final, str(output_path))
-        
-        # Generar vista previa
-        preview = ddf_final.head()
-        logger.info("\nVista previa de datos curados:\n" + str(preview))
-        
-        # Validación de salida
-        valid_mask = validator.validar_reglas_negocio(preview) # Validar la muestra
-        if not valid_mask.all():
-            logger.warning("Algunos registros en la muestra fallaron validación.")
+        with scheduler_dask(
+            modo=settings.DASK_SCHEDULER,
+            direccion=direccion_scheduler(settings.DASK_SCHEDULER_HOST, settings.DASK_SCHEDULER_PORT),
+            n_workers=settings.DASK_N_WORKERS,
+            threads_por_worker=settings.DASK_THREADS_PER_WORKER,
+            memoria_por_worker=settings.DASK_MEMORY_LIMIT
+        ) as client:
+            with MonitorUtilizacion(client) as monitor, ContadorEjecuciones(client) as contador:
+                ejecutar_etapas(extractor, transformer, loader, validator, scoring, logger)
+
+            monitor.registrar(logger)
+            logger.info(f"Ejecuciones de grafo Dask en esta corrida: {contador.ejecuciones} ({contador.tareas} tareas)")
 
     except Exception as e:
         logger.critical(f"Pipeline falló: {e}")
@@ -0,0 +1,74 @@
+"""
+Entrenamiento de modelos de deserción y registro de versiones.
+
+Construye (o reutiliza) la matriz de features desde master_table.parquet y el
+histórico, entrena los modelos pedidos y guarda cada uno en el registro local
+(data/models/<modelo>/vNNNN) con métricas, tiempo de ajuste y throughput de scoring.
+
+Con --busqueda, en lugar de entrenar compara los candidatos de la grilla de cada
+modelo con CV en paralelo (successive halving) y guarda el leaderboard en CSV.
+
+Uso:
+    python run_training.py [--modelos logistica hist_gb xgboost] [--busqueda] [--workers 8]
+"""
+import argparse
+import logging
+from pathlib import Path
+
+from config import settings
+from src.etl.extract import DataExtractor
+from src.evaluation.busqueda import BusquedaParalela
+from src.features.matriz import ConstructorMatriz
+from src.models.entrenamiento import MODELOS, entrenar, coeficientes_logistica
+from src.models.registro import RegistroModelos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modelos', nargs='+', default=['logistica', 'hist_gb'], choices=sorted(MODELOS))
+    parser.add_argument('--ruta', default=str(settings.CURATED_DATA_DIR / "master_table.parquet"))
+    parser.add_argument('--registro', default=str(settings.MODELS_DIR))
+    parser.add_argument('--busqueda', action='store_true', help='Búsqueda de hiperparámetros en vez de entrenar')
+    parser.add_argument('--workers', type=int, help='Procesos de la búsqueda (por defecto: CPUs)')
+    parser.add_argument('--folds', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger("Entrenamiento")
+
+    extractor = DataExtractor(
+        data_dir=settings.DATA_DIR,
+        cache_dir=settings.CACHE_DATA_DIR,
+        huella=settings.EXTRACT_CACHE_HUELLA,
+        blocksize=settings.CSV_BLOCKSIZE
+    )
+    constructor = ConstructorMatriz(settings.FEATURES_DIR)
+    X, y, _, manifest = constructor.obtener(
+        args.ruta,
+        extractor.leer_historico(),
+        huella_historico=extractor.huellas_fuentes()['dataset_historico_v2']
+    )
+    logger.info(f"Matriz: {X.shape[0]} filas x {X.shape[1]} variables, {manifest['positivos']} desertores")
+
+    if args.busqueda:
+        for nombre in args.modelos:
+            salida = Path(args.registro) / f"leaderboard_{nombre}.csv"
+            leaderboard = BusquedaParalela(nombre, n_folds=args.folds, n_workers=args.workers).ejecutar(X, y, salida)
+            print(leaderboard.head(10).to_string(index=False))
+        return
+
+    registro = RegistroModelos(args.registro)
+    for nombre in args.modelos:
+        modelo, metricas = entrenar(nombre, X, y)
+        coeficientes = coeficientes_logistica(modelo, constructor.features) if nombre == 'logistica' else None
+        registro.guardar(
+            f"desercion_{nombre}", modelo, constructor.features,
+            metadatos={'modelo': nombre, 'metricas': metricas, 'huella_matriz': manifest['huella']},
+            coeficientes=coeficientes
+        )
+
+    print(registro.listar().to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -50,7 +50,9 @@ CREATE TABLE matriculas_semestrales (
     creditos_matriculados INTEGER,
     creditos_aprobados INTEGER,
     materias_reprobadas INTEGER DEFAULT 0,
-    CONSTRAINT chk_promedio CHECK (promedio_semestral BETWEEN 0 AND 5)
+    CONSTRAINT chk_promedio CHECK (promedio_semestral BETWEEN 0 AND 5),
+    -- Clave natural: una matrícula por estudiante y periodo (destino de ON CONFLICT en cargas incrementales)
+    CONSTRAINT uq_matricula_periodo UNIQUE (estudiante_id, anio_lectivo, periodo_lectivo)
 );
 
 -- 6. Tabla de Apoyos Financieros
@@ -1,7 +1,12 @@
 import dask.dataframe as dd
+import pandas as pd
+import hashlib
+import json
 import os
+import shutil
 import logging
 from pathlib import Path
+from src.etl.schemas import obtener_esquema, firma_esquema
 
 logger = logging.getLogger(__name__)
 
@@ -9,10 +14,21 @@ class DataExtractor:
     """
     Módulo encargado de la extracción de datos desde diversas fuentes.
     Soporta lectura diferida (lazy evaluation) con Dask.
+
+    Los CSV crudos se convierten una sola vez a una copia Parquet en `cache_dir`.
+    Mientras la huella del CSV (tamaño+mtime o hash del contenido) no cambie,
+    las lecturas siguientes usan la copia columnar en lugar de re-parsear el CSV.
+
+    El parseo usa el motor pyarrow y los dtypes compactos de `src.etl.schemas`.
     """
-    
-    def __init__(self, data_dir):
+
+    def __init__(self, data_dir, cache_dir=None, usar_cache=True, huella='stat', blocksize="64MB"):
         self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_dir / "cache"
+        self.usar_cache = usar_cache
+        # 'stat' (tamaño + mtime, barato) o 'hash' (sha256 del contenido, robusto)
+        self.huella = huella
+        self.blocksize = blocksize
 
     def leer_estudiantes(self):
         """
@@ -20,7 +36,7 @@ class DataExtractor:
         """
         path = self.data_dir / "raw" / "dataset_estudiantes_v2.csv"
         logger.info(f"Leyendo estudiantes: {path}")
-        return dd.read_csv(path, assume_missing=True)
+        return self._leer_csv_cacheado(path)
 
     def leer_historico(self):
         """
@@ -28,4 +44,121 @@ class DataExtractor:
         """
         path = self.data_dir / "raw" / "dataset_historico_v2.csv"
         logger.info(f"Leyendo historico: {path}")
-        return dd.read_csv(path, assume_missing=True)
+        return self._leer_csv_cacheado(path)
+
+    def huellas_fuentes(self):
+        """
+        Huella actual (sin parsear) de cada CSV crudo, para invalidar artefactos derivados.
+        """
+        return {
+            nombre: self._calcular_huella(self.data_dir / "raw" / f"{nombre}.csv")
+            for nombre in ('dataset_estudiantes_v2', 'dataset_historico_v2')
+        }
+
+    @staticmethod
+    def firmas_esquema():
+        """
+        Firma de los esquemas de ingesta de cada dataset crudo.
+        """
+        return {nombre: firma_esquema(nombre) for nombre in ('dataset_estudiantes_v2', 'dataset_historico_v2')}
+
+    def _leer_csv(self, path):
+        esquema = self._esquema_para(path)
+        return dd.read_csv(path, engine='pyarrow', dtype=esquema, blocksize=self.blocksize)
+
+    @staticmethod
+    def _esquema_para(path):
+        """
+        Esquema registrado restringido a las columnas presentes en la cabecera del CSV.
+        """
+        columnas = pd.read_csv(path, nrows=0).columns
+        return obtener_esquema(path.stem, columnas)
+
+    def medir_bytes_por_fila(self, path, n_filas=100_000):
+        """
+        Compara la memoria por fila de una muestra del CSV con los dtypes de antes
+        (`assume_missing=True`: enteros como float64) y con el esquema declarado.
+        """
+        muestra = pd.read_csv(path, nrows=n_filas)
+        filas = max(len(muestra), 1)
+        antes = muestra.astype({c: 'float64' for c in muestra.select_dtypes('integer').columns})
+        despues = muestra.astype(self._esquema_para(path))
+        return {
+            'antes': antes.memory_usage(deep=True).sum() / filas,
+            'despues': despues.memory_usage(deep=True).sum() / filas,
+        }
+
+    def _registrar_bytes_por_fila(self, path):
+        try:
+            medida = self.medir_bytes_por_fila(path)
+            logger.info(
+                f"{path.name}: {medida['antes']:.1f} -> {medida['despues']:.1f} bytes/fila "
+                f"con esquema declarado ({1 - medida['despues'] / medida['antes']:.0%} menos)"
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo medir bytes/fila de {path.name}: {e}")
+
+    def _leer_csv_cacheado(self, path):
+        """
+        Devuelve el CSV desde su copia Parquet si sigue vigente; si no, la reconstruye.
+        """
+        if not self.usar_cache:
+            self._registrar_bytes_por_fila(path)
+            return self._leer_csv(path)
+
+        ruta_cache = self.cache_dir / f"{path.stem}.parquet"
+        ruta_manifiesto = self.cache_dir / f"{path.stem}.manifest.json"
+        huella = self._calcular_huella(path)
+
+        if ruta_cache.exists() and self._leer_manifiesto(ruta_manifiesto) == huella:
+            logger.info(f"Cache columnar HIT para {path.name}: {ruta_cache}")
+        else:
+            logger.info(f"Cache columnar reconstruido para {path.name} (CSV nuevo o modificado)")
+            self._reconstruir_cache(path, ruta_cache, ruta_manifiesto, huella)
+
+        return dd.read_parquet(ruta_cache, engine='pyarrow')
+
+    def _calcular_huella(self, path):
+        """
+        Identifica la versión del archivo crudo sin necesidad de parsearlo.
+        Incluye la firma del esquema para que un cambio de dtypes reconstruya la copia.
+        """
+        if self.huella == 'hash':
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for bloque in iter(lambda: f.read(8 * 1024 * 1024), b''):
+                    sha.update(bloque)
+            return {'modo': 'hash', 'sha256': sha.hexdigest(), 'esquema': firma_esquema(path.stem)}
+
+        stat = os.stat(path)
+        return {'modo': 'stat', 'tamano': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                'esquema': firma_esquema(path.stem)}
+
+    @staticmethod
+    def _leer_manifiesto(ruta_manifiesto):
+        try:
+            with open(ruta_manifiesto, encoding='utf-8') as f:
+                return json.load(f).get('huella')
+        except (OSError, ValueError):
+            return None
+
+    def _reconstruir_cache(self, path, ruta_cache, ruta_manifiesto, huella):
+        """
+        Parsea el CSV una vez y lo persiste en Parquet.
+        Se escribe en un directorio temporal y se reemplaza al final para no dejar
+        caches a medio escribir si el proceso se interrumpe.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        ruta_tmp = ruta_cache.with_name(ruta_cache.name + ".tmp")
+        if ruta_tmp.exists():
+            shutil.rmtree(ruta_tmp)
+
+        self._leer_csv(path).to_parquet(ruta_tmp, engine='pyarrow', write_index=False)
+        self._registrar_bytes_por_fila(path)
+
+        if ruta_cache.exists():
+            shutil.rmtree(ruta_cache)
+        os.replace(ruta_tmp, ruta_cache)
+
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+            json.dump({'fuente': str(path), 'huella': huella}, f, indent=2)
@@ -1,23 +1,53 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+import io
+import json
 import logging
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import dask
 import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from src.etl.perfiles_parquet import obtener_perfil, opciones_escritor
 
 logger = logging.getLogger(__name__)
 
+# Claves naturales de las tablas de sql/script_db_academica.sql (destino de los upserts)
+CLAVES_NATURALES = {
+    'estudiantes': ('estudiante_id',),
+    'matriculas_semestrales': ('estudiante_id', 'anio_lectivo', 'periodo_lectivo'),
+}
+
+# Columna de staging de los upserts: posición de la fila en la fuente (partición, fila)
+ORDEN_CARGA = '_orden_carga'
+
 class DataLoader:
     """
     Módulo para cargar datos procesados a almacenamiento persistente (PostgreSQL).
     """
 
-    def __init__(self, db_url):
+    def __init__(self, db_url, particiones=None, max_conexiones=4, perfil_parquet='dask'):
         self.db_url = db_url
         self.engine = create_engine(self.db_url)
+        # Conexiones simultáneas de la carga por COPY (cada una serializa una partición a CSV)
+        self.max_conexiones = max_conexiones
+        # Columnas de partición Hive de la tabla maestra (ej. ['programa', 'estrato']); None: sin particionar
+        self.particiones = list(particiones) if particiones else None
+        # Perfil de escritura Parquet (ver src.etl.perfiles_parquet)
+        self.perfil_parquet = perfil_parquet
+        self._perfil = obtener_perfil(perfil_parquet)
 
     def guardar_en_sql(self, ddf, nombre_tabla, if_exists='append'):
         """
         Guarda un Dask DataFrame en SQL.
-        Se calcula (compute) y se guarda. Nota: Para muy grandes volúmenes, 
-        se recomienda usar COPY command o 'to_sql' por particiones.
+        Se calcula (compute) y se guarda. Nota: Para muy grandes volúmenes,
+        usar `guardar_en_sql_copy` (COPY por particiones en paralelo, sin INSERTs fila a fila).
         """
         logger.info(f"Guardando datos en tabla: {nombre_tabla}")
         
@@ -36,13 +66,460 @@ class DataLoader:
             logger.error(f"Error guardando en base de datos: {e}")
             raise
 
-    def guardar_parquet(self, ddf, ruta_salida):
+    def guardar_en_sql_copy(self, ddf, nombre_tabla, if_exists='append', staging=True):
+        """
+        Carga un Dask DataFrame en PostgreSQL con `COPY FROM STDIN`, partición a partición.
+
+        Las particiones se calculan en lotes de `max_conexiones`; cada una se serializa a
+        CSV en memoria y se envía por COPY en su propia transacción y conexión. En memoria
+        hay a lo sumo un lote de particiones.
+        Para tablas que salen de un shuffle o un merge (la tabla maestra), cargar desde el
+        Parquet ya escrito (`leer_parquet_dask`): cada lote re-ejecutaría el shuffle.
+
+        - staging=True: las particiones se copian a una tabla UNLOGGED temporal y se
+          pasan a `nombre_tabla` en una sola transacción al final; si una partición
+          falla, la tabla destino no cambia.
+        - staging=False: cada partición se confirma directamente en `nombre_tabla`.
+
+        Si la tabla no existe se crea vacía con las columnas de `ddf`.
+        if_exists='replace' vacía la tabla destino (en la transacción final si hay staging).
+        Retorna el número de filas cargadas.
+        """
+        if if_exists not in ('append', 'replace'):
+            raise ValueError(f"if_exists no soportado para COPY: {if_exists}. Opciones: ('append', 'replace')")
+        logger.info(f"Guardando datos en tabla {nombre_tabla} vía COPY ({ddf.npartitions} particiones, "
+                    f"{self.max_conexiones} conexiones, staging={staging})")
+
+        columnas = list(ddf.columns)
+        esquema, _, tabla = nombre_tabla.rpartition('.')
+        if not inspect(self.engine).has_table(tabla, schema=esquema or None):
+            ddf._meta.to_sql(name=tabla, schema=esquema or None, con=self.engine, index=False)
+
+        destino = _identificador(nombre_tabla)
+        tabla_copy = destino
+        try:
+            if staging:
+                tabla_copy = self._crear_staging(nombre_tabla, columnas)
+            elif if_exists == 'replace':
+                self._ejecutar(f"TRUNCATE {destino}")
+
+            filas = self._copiar_particiones(ddf, tabla_copy, columnas)
+
+            if staging:
+                lista = ", ".join(_identificador(c) for c in columnas)
+                sentencias = [f"INSERT INTO {destino} ({lista}) SELECT {lista} FROM {tabla_copy}"]
+                if if_exists == 'replace':
+                    sentencias.insert(0, f"TRUNCATE {destino}")
+                self._ejecutar(*sentencias)
+
+            logger.info(f"Carga COPY completada: {filas} filas en {nombre_tabla}")
+            return filas
+        except Exception as e:
+            logger.error(f"Error en carga COPY a {nombre_tabla}: {e}")
+            raise
+        finally:
+            if staging and tabla_copy != destino:
+                self._ejecutar(f"DROP TABLE IF EXISTS {tabla_copy}")
+
+    def upsert_sql(self, ddf, nombre_tabla, claves=None):
+        """
+        Inserta o actualiza filas de `ddf` en `nombre_tabla` según su clave natural.
+
+        Las particiones se copian por COPY a una tabla UNLOGGED de staging y se fusionan
+        con un único `INSERT ... ON CONFLICT (claves) DO UPDATE`. La actualización solo
+        se aplica si algún valor cambió, así que las filas idénticas no generan nuevas
+        versiones ni escrituras en los índices de la tabla destino.
+        Si la fuente repite una clave, gana su última fila en el orden de `ddf`
+        (particiones y filas): cada fila lleva su posición a staging, porque el orden
+        físico de los COPY en paralelo no es determinista.
+
+        `claves` por defecto sale de CLAVES_NATURALES; la tabla debe tener una
+        restricción UNIQUE/PRIMARY KEY sobre ellas (ver sql/script_db_academica.sql).
+        Retorna {'insertados', 'actualizados', 'sin_cambios'}.
+        """
+        claves = list(claves or CLAVES_NATURALES.get(nombre_tabla.rpartition('.')[2], ()))
+        if not claves:
+            raise ValueError(f"No hay clave natural registrada para {nombre_tabla}; indique `claves`.")
+        columnas = list(ddf.columns)
+        faltantes = [c for c in claves if c not in columnas]
+        if faltantes:
+            raise ValueError(f"Las claves {faltantes} no están en las columnas a cargar")
+        logger.info(f"Upsert en {nombre_tabla} por ({', '.join(claves)}): {ddf.npartitions} particiones")
+
+        destino = _identificador(nombre_tabla)
+        lista = ", ".join(_identificador(c) for c in columnas)
+        lista_claves = ", ".join(_identificador(c) for c in claves)
+        no_claves = [_identificador(c) for c in columnas if c not in claves]
+        if no_claves:
+            actual = ", ".join(f"{destino}.{c}" for c in no_claves)
+            nuevo = ", ".join(f"EXCLUDED.{c}" for c in no_claves)
+            conflicto = (f"DO UPDATE SET ({', '.join(no_claves)}) = ROW({nuevo}) "
+                         f"WHERE ROW({actual}) IS DISTINCT FROM ROW({nuevo})")
+        else:
+            conflicto = "DO NOTHING"
+
+        tabla_staging = None
+        try:
+            tabla_staging = self._crear_staging(nombre_tabla, columnas, orden_carga=True)
+            con_orden = ddf.map_partitions(_con_orden_carga, meta=_con_orden_carga(ddf._meta))
+            self._copiar_particiones(con_orden, tabla_staging, columnas + [ORDEN_CARGA])
+            sentencia = f"""
+                WITH fuente AS (
+                    SELECT DISTINCT ON ({lista_claves}) {lista}
+                    FROM {tabla_staging} ORDER BY {lista_claves}, {_identificador(ORDEN_CARGA)} DESC
+                ), escritas AS (
+                    INSERT INTO {destino} ({lista}) SELECT {lista} FROM fuente
+                    ON CONFLICT ({lista_claves}) {conflicto}
+                    RETURNING (xmax = 0) AS insertada
+                )
+                SELECT (SELECT count(*) FROM fuente),
+                       count(*) FILTER (WHERE insertada),
+                       count(*) FILTER (WHERE NOT insertada)
+                FROM escritas
+            """
+            (total, insertados, actualizados), = self._ejecutar(sentencia)
+        except Exception as e:
+            logger.error(f"Error en upsert a {nombre_tabla}: {e}")
+            raise
+        finally:
+            if tabla_staging is not None:
+                self._ejecutar(f"DROP TABLE IF EXISTS {tabla_staging}")
+
+        resultado = {'insertados': insertados, 'actualizados': actualizados,
+                     'sin_cambios': total - insertados - actualizados}
+        logger.info(f"Upsert en {nombre_tabla}: {resultado['insertados']} insertados, "
+                    f"{resultado['actualizados']} actualizados, {resultado['sin_cambios']} sin cambios")
+        return resultado
+
+    def _crear_staging(self, nombre_tabla, columnas, orden_carga=False):
+        """
+        Crea una tabla UNLOGGED vacía con las `columnas` (y tipos) de `nombre_tabla`,
+        más la columna bigint ORDEN_CARGA si `orden_carga`.
+        Sin defaults ni índices: no consume secuencias SERIAL y el COPY es más barato.
+        """
+        tabla_staging = _identificador(f"{nombre_tabla}_staging_{uuid.uuid4().hex[:8]}")
+        lista = ", ".join(_identificador(c) for c in columnas)
+        if orden_carga:
+            lista += f", NULL::bigint AS {_identificador(ORDEN_CARGA)}"
+        self._ejecutar(f"CREATE UNLOGGED TABLE {tabla_staging} AS "
+                       f"SELECT {lista} FROM {_identificador(nombre_tabla)} WITH NO DATA")
+        return tabla_staging
+
+    def _copiar_particiones(self, ddf, tabla, columnas):
+        """
+        COPY de todas las particiones en lotes de `max_conexiones`.
+
+        Cada lote se calcula en un solo `dask.compute` (un scheduler, no uno por hilo) y
+        sus particiones se copian en paralelo; el siguiente lote se calcula cuando el
+        anterior ya se envió. Si las particiones comparten un shuffle, cada lote lo
+        vuelve a ejecutar: ver `guardar_en_sql_copy`.
+        """
+        particiones = ddf.to_delayed()
+        filas = 0
+        with ThreadPoolExecutor(max_workers=self.max_conexiones) as pool:
+            for inicio in range(0, len(particiones), self.max_conexiones):
+                lote = dask.compute(*particiones[inicio:inicio + self.max_conexiones])
+                filas += sum(pool.map(lambda pdf: self._copiar_particion(pdf, tabla, columnas), lote))
+        return filas
+
+    def _copiar_particion(self, pdf, tabla, columnas):
+        """
+        Envía una partición ya calculada por COPY en una transacción propia.
+        """
+        if pdf.empty:
+            return 0
+        buffer = io.StringIO()
+        pdf[columnas].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        lista = ", ".join(_identificador(c) for c in columnas)
+        conexion = self.engine.raw_connection()
+        try:
+            with conexion.cursor() as cursor:
+                _copy_desde(cursor, f"COPY {tabla} ({lista}) FROM STDIN WITH (FORMAT csv)", buffer)
+            conexion.commit()
+        except Exception:
+            conexion.rollback()
+            raise
+        finally:
+            conexion.close()
+        return len(pdf)
+
+    def _ejecutar(self, *sentencias):
+        """
+        Ejecuta sentencias SQL en una sola transacción.
+        Retorna las filas de la última sentencia, si produce resultados.
+        """
+        conexion = self.engine.raw_connection()
+        try:
+            with conexion.cursor() as cursor:
+                for sentencia in sentencias:
+                    cursor.execute(sentencia)
+                filas = cursor.fetchall() if cursor.description else None
+            conexion.commit()
+            return filas
+        except Exception:
+            conexion.rollback()
+            raise
+        finally:
+            conexion.close()
+
+    def guardar_parquet(self, ddf, ruta_salida, compute=True):
         """
         Guarda en formato Parquet (eficiente para analítica local).
+        Con compute=False retorna la escritura lazy para ejecutarla junto con otros
+        resultados en un solo `dask.compute`.
+
+        Si el loader tiene `particiones`, la tabla se escribe particionada estilo Hive
+        (`programa=X/estrato=Y/part.N.parquet`), ordenada por estudiante_id dentro de
+        cada archivo y con un `_metadata` que resume todos los footers.
+        Codec, row groups, diccionarios, estadísticas y tamaño de archivo salen del
+        perfil `perfil_parquet`.
         """
         try:
-            ddf.to_parquet(ruta_salida, engine='pyarrow')
+            ddf, opciones = self._preparar_escritura(ddf)
+            # overwrite: una tabla previa con más particiones dejaría archivos huérfanos
+            escritura = ddf.to_parquet(
+                ruta_salida, engine='pyarrow', overwrite=True, compute=compute, **opciones
+            )
+            if not compute:
+                return escritura
             logger.info(f"Datos guardados en Parquet: {ruta_salida}")
         except Exception as e:
             logger.error(f"Error exportando a Parquet: {e}")
             raise
+
+    def _preparar_escritura(self, ddf):
+        """
+        Aplica el perfil Parquet y el particionado a `ddf`.
+        Retorna el DataFrame a escribir y los argumentos de `to_parquet`.
+        """
+        fusion = self._perfil.get('fusionar_particiones', 1)
+        if fusion > 1 and ddf.npartitions > 1:
+            # Concatena particiones contiguas: archivos más grandes sin shuffle
+            ddf = ddf.repartition(npartitions=max(1, -(-ddf.npartitions // fusion)))
+
+        ordenar_por = self._perfil.get('ordenar_por') or ('estudiante_id' if self.particiones else None)
+        if ordenar_por and ordenar_por in ddf.columns:
+            ddf = self.ordenar_particiones(ddf, ordenar_por)
+
+        opciones = opciones_escritor(self._perfil, ddf.columns)
+        if self.particiones:
+            faltantes = [col for col in self.particiones if col not in ddf.columns]
+            if faltantes:
+                raise ValueError(f"Columnas de partición inexistentes en la tabla: {faltantes}")
+            opciones.update(partition_on=self.particiones, write_metadata_file=True)
+        return ddf, opciones
+
+    @staticmethod
+    def ordenar_particiones(ddf, columna='estudiante_id'):
+        """
+        Ordena cada partición por `columna` (sin shuffle global): cada archivo escrito
+        queda ordenado y sus estadísticas min/max por row group son estrechas.
+        """
+        return ddf.map_partitions(_ordenar_por, columna, meta=ddf._meta)
+
+    @staticmethod
+    def leer_particiones(ruta_salida, filtros=None, columnas=None):
+        """
+        Lee la tabla maestra (pandas) cargando solo las particiones que necesita `filtros`.
+
+        `filtros` es un dict columna -> valor o lista de valores, ej.
+        {'programa': 'MEDICINA', 'estrato': [1, 2]}. Sobre columnas de partición Hive
+        el filtro poda directorios completos antes de abrir archivos; sobre el resto
+        se aplica con las estadísticas de cada row group.
+        """
+        dataset = ds.dataset(ruta_salida, format='parquet', partitioning='hive')
+        expresion = None
+        for columna, valor in (filtros or {}).items():
+            valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+            tipo = dataset.schema.field(columna).type
+            if pa.types.is_dictionary(tipo):
+                tipo = tipo.value_type
+            condicion = ds.field(columna).isin(pa.array(list(valores)).cast(tipo))
+            expresion = condicion if expresion is None else expresion & condicion
+        tabla = dataset.to_table(columns=columnas, filter=expresion)
+        return tabla.to_pandas()
+
+    @staticmethod
+    def leer_parquet_dask(ruta_salida, columnas=None):
+        """
+        Lee una tabla ya escrita como Dask DataFrame (lazy), con sus columnas de partición Hive.
+        Cada partición es un archivo, sin dependencias entre ellas: es la entrada para
+        `guardar_en_sql_copy`/`upsert_sql` de tablas que se produjeron con un shuffle.
+        Los tipos de las columnas de partición se infieren una vez sobre todo el
+        directorio (archivo por archivo, `__HIVE_DEFAULT_PARTITION__` no tiene tipo).
+        """
+        esquema = ds.dataset(ruta_salida, format='parquet', partitioning='hive').partitioning.schema
+        particionado = ds.partitioning(esquema, flavor='hive')
+        return dd.read_parquet(ruta_salida, engine='pyarrow', columns=columnas,
+                               dataset={'partitioning': particionado})
+
+    @staticmethod
+    def leer_muestra(ruta_salida, n_filas=1000):
+        """
+        Muestra de la tabla ya escrita: primeras filas del primer archivo (con las
+        columnas de partición Hive, si las hay). No re-ejecuta el grafo que la produjo.
+        """
+        if not DataLoader.existe_parquet(ruta_salida):
+            return pd.DataFrame()
+        dataset = ds.dataset(ruta_salida, format='parquet', partitioning='hive')
+        return dataset.head(n_filas).to_pandas()
+
+    @staticmethod
+    def existe_parquet(ruta_salida):
+        """
+        True si `ruta_salida` tiene al menos un archivo de datos Parquet.
+        """
+        return Path(ruta_salida).exists() and any(Path(ruta_salida).rglob('*.parquet'))
+
+    def actualizar_parquet(self, ddf_delta, ruta_salida, ids_reemplazados, compute=True):
+        """
+        Fusiona perfiles recalculados en una tabla maestra Parquet existente.
+        Las filas de `ids_reemplazados` se descartan y se agregan las de `ddf_delta`;
+        el resto se copia tal cual, sin recalcular. Se escribe en un directorio
+        temporal y se reemplaza al final. Si aún no hay datos escritos, se escribe el delta.
+
+        Con compute=False retorna la escritura lazy (el reemplazo del directorio es su
+        última tarea) para ejecutar varias actualizaciones que comparten el delta en un
+        solo `dask.compute`.
+        """
+        ruta_salida = Path(ruta_salida)
+        ruta_tmp = ruta_salida.with_name(ruta_salida.name + ".tmp")
+        if not self.existe_parquet(ruta_salida):
+            return self.guardar_parquet(ddf_delta, str(ruta_salida), compute=compute)
+        try:
+            existente = self._leer_existente(ruta_salida, ddf_delta._meta)
+            conservado = existente[~existente['estudiante_id'].isin(list(ids_reemplazados))]
+            combinado = dd.concat([conservado, ddf_delta[list(existente.columns)]])
+
+            if ruta_tmp.exists():
+                shutil.rmtree(ruta_tmp)
+            combinado, opciones = self._preparar_escritura(combinado)
+            escritura = combinado.to_parquet(ruta_tmp, engine='pyarrow', write_index=False, compute=False, **opciones)
+            reemplazo = dask.delayed(_reemplazar_directorio)(escritura, ruta_tmp, ruta_salida, len(ids_reemplazados))
+            if not compute:
+                return reemplazo
+            reemplazo.compute()
+        except Exception as e:
+            logger.error(f"Error en actualización incremental de Parquet: {e}")
+            raise
+
+    def _leer_existente(self, ruta_salida, meta):
+        """
+        Lee la tabla escrita con los dtypes de `meta` en sus columnas de partición.
+
+        Sin esquema, los valores de los directorios Hive se infieren archivo por archivo:
+        vuelven como categóricas (que no se pueden concatenar con el Int8 del delta) y
+        un directorio `__HIVE_DEFAULT_PARTITION__` (valor nulo) no tiene tipo inferible.
+        """
+        if not self.particiones:
+            return dd.read_parquet(ruta_salida, engine='pyarrow')
+        esquema = pa.Schema.from_pandas(meta[self.particiones], preserve_index=False)
+        # Las categóricas se leen como su tipo de valores y se vuelven a convertir abajo
+        campos = [
+            pa.field(campo.name, campo.type.value_type if pa.types.is_dictionary(campo.type) else campo.type)
+            for campo in esquema
+        ]
+        particionado = ds.partitioning(pa.schema(campos), flavor='hive')
+        existente = dd.read_parquet(ruta_salida, engine='pyarrow', dataset={'partitioning': particionado})
+        # Categorías con el mismo tipo que las del delta (object/str, no string[pyarrow]):
+        # si no, un archivo que junte particiones de ambos no se puede concatenar
+        categoricas = [col for col in self.particiones if isinstance(meta[col].dtype, pd.CategoricalDtype)]
+        existente = existente.astype({col: meta[col].cat.categories.dtype for col in categoricas})
+        return existente.astype({
+            col: 'category' if col in categoricas else meta[col].dtype
+            for col in self.particiones
+        })
+
+    @staticmethod
+    def guardar_snapshot_arrow(ruta_salida, ruta_snapshot):
+        """
+        Copia la tabla maestra a un archivo Arrow IPC sin compresión.
+
+        El dashboard lo abre con memory-map: los buffers se leen directo del page cache,
+        sin decodificar Parquet ni copiar a cada proceso worker. Se escribe como un solo
+        record batch (una tabla por estudiante cabe en memoria del pipeline) para que
+        cada columna sea un buffer contiguo y pandas pueda usarlo sin concatenar trozos.
+        Se escribe en un temporal y se reemplaza con os.replace, así que los procesos
+        que ya tienen mapeado el snapshot anterior siguen leyendo un archivo válido.
+        """
+        ruta_snapshot = Path(ruta_snapshot)
+        ruta_tmp = ruta_snapshot.with_name(ruta_snapshot.name + ".tmp")
+        tabla = ds.dataset(ruta_salida, format='parquet', partitioning='hive').to_table().combine_chunks()
+        with pa.OSFile(str(ruta_tmp), 'wb') as destino, pa.ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla, max_chunksize=max(tabla.num_rows, 1))
+        os.replace(ruta_tmp, ruta_snapshot)
+        logger.info(f"Snapshot Arrow guardado: {ruta_snapshot} ({tabla.num_rows} filas)")
+
+    @staticmethod
+    def _rutas_estado(ruta_salida):
+        ruta_salida = Path(ruta_salida)
+        base = ruta_salida.with_suffix('')
+        return base.with_name(base.name + ".estado.json"), base.with_name(base.name + ".huellas.parquet")
+
+    def guardar_estado_ejecucion(self, ruta_salida, huellas, resumen):
+        """
+        Persiste qué se procesó: huellas por estudiante (Parquet) y un resumen de la corrida (JSON).
+        """
+        ruta_estado, ruta_huellas = self._rutas_estado(ruta_salida)
+        huellas.to_parquet(ruta_huellas, index=False)
+        estado = dict(resumen, fecha=datetime.now().isoformat(timespec='seconds'),
+                      estudiantes=len(huellas), huellas=ruta_huellas.name)
+        with open(ruta_estado, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, indent=2, default=str)
+        logger.info(f"Estado de ejecución guardado: {ruta_estado}")
+
+    def leer_estado_ejecucion(self, ruta_salida):
+        """
+        Retorna (resumen, huellas) de la última corrida, o None si no hay estado utilizable.
+        """
+        ruta_estado, ruta_huellas = self._rutas_estado(ruta_salida)
+        if not (Path(ruta_salida).exists() and ruta_estado.exists() and ruta_huellas.exists()):
+            return None
+        try:
+            with open(ruta_estado, encoding='utf-8') as f:
+                resumen = json.load(f)
+            return resumen, pd.read_parquet(ruta_huellas)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Estado de ejecución ilegible, se hará reconstrucción completa: {e}")
+            return None
+
+
+def _reemplazar_directorio(_escritura, ruta_tmp, ruta_salida, n_reemplazados):
+    """
+    Última tarea de `actualizar_parquet`: la tabla nueva ya está completa en `ruta_tmp`.
+    """
+    shutil.rmtree(ruta_salida)
+    os.replace(ruta_tmp, ruta_salida)
+    logger.info(f"{ruta_salida.name} actualizado incrementalmente: {n_reemplazados} estudiantes reemplazados")
+
+
+def _ordenar_por(pdf, columna):
+    return pdf.sort_values(columna, kind='stable').reset_index(drop=True)
+
+
+def _copy_desde(cursor, sentencia, buffer):
+    """
+    `COPY ... FROM STDIN` con el cursor de psycopg2 (`copy_expert`) o de psycopg 3 (`copy`).
+    """
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sentencia, buffer)
+    else:
+        with cursor.copy(sentencia) as copia:
+            copia.write(buffer.getvalue())
+
+
+def _con_orden_carga(pdf, partition_info=None):
+    """
+    Agrega ORDEN_CARGA: número de partición en los 32 bits altos y fila dentro de ella en los bajos.
+    """
+    particion = partition_info['number'] if partition_info else 0
+    return pdf.assign(**{ORDEN_CARGA: (particion << 32) + np.arange(len(pdf), dtype=np.int64)})
+
+
+def _identificador(nombre):
+    """
+    Cita un identificador SQL (admite esquema.tabla).
+    """
+    return ".".join('"' + parte.replace('"', '""') + '"' for parte in nombre.split('.'))
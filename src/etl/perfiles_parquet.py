@@ -0,0 +1,66 @@
+"""
+Perfiles de escritura Parquet para la tabla maestra.
+
+Cada perfil fija lo que antes dependía de cómo quedara cada partición Dask:
+- compresión (codec y nivel),
+- filas por row group (`row_group_size`),
+- columnas con codificación de diccionario,
+- estadísticas min/max por row group,
+- tamaño de archivo: cuántas particiones Dask contiguas se fusionan en cada
+  archivo (`fusionar_particiones`, sin shuffle ni pasada extra),
+- orden dentro de cada archivo (`ordenar_por`), que estrecha las estadísticas.
+
+Los valores de `lectura_analitica` (perfil por defecto, settings.PARQUET_PERFIL)
+salen de benchmarks/bench_perfiles_parquet.py; las cifras están en
+benchmarks/resultados_perfiles_parquet.md.
+"""
+
+PERFILES_PARQUET = {
+    # Escritura de Dask sin ajustes (referencia para los benchmarks)
+    'dask': {},
+    # Lectura completa desde el dashboard: zstd nivel 1 (se descomprime tan rápido como
+    # snappy y ocupa ~40 % menos), diccionario en todas las columnas (también en los
+    # float de dos decimales), pocos archivos grandes, estadísticas en todas las columnas
+    'lectura_analitica': {
+        'compression': 'zstd',
+        'compression_level': 1,
+        'row_group_size': 1_000_000,
+        'use_dictionary': True,
+        'write_statistics': True,
+        'fusionar_particiones': 4,
+        'ordenar_por': 'estudiante_id',
+    },
+    # Histórico/archivo: máxima compresión, diccionario en todo, estadísticas solo en la clave
+    'archivo_compacto': {
+        'compression': 'zstd',
+        'compression_level': 9,
+        'row_group_size': 1_000_000,
+        'use_dictionary': True,
+        'write_statistics': ['estudiante_id'],
+        'fusionar_particiones': 8,
+        'ordenar_por': 'estudiante_id',
+    },
+}
+
+# Claves del perfil que no son argumentos del escritor pyarrow
+_OPCIONES_DASK = ('fusionar_particiones', 'ordenar_por')
+
+
+def obtener_perfil(nombre):
+    """
+    Devuelve una copia del perfil `nombre`.
+    """
+    if nombre not in PERFILES_PARQUET:
+        raise KeyError(f"Perfil Parquet no soportado: {nombre}. Opciones: {tuple(PERFILES_PARQUET)}")
+    return dict(PERFILES_PARQUET[nombre])
+
+
+def opciones_escritor(perfil, columnas):
+    """
+    Argumentos de `to_parquet` del perfil, con las listas de columnas restringidas a `columnas`.
+    """
+    opciones = {k: v for k, v in perfil.items() if k not in _OPCIONES_DASK}
+    for clave in ('use_dictionary', 'write_statistics'):
+        if isinstance(opciones.get(clave), list):
+            opciones[clave] = [c for c in opciones[clave] if c in columnas]
+    return opciones
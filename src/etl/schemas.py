@@ -0,0 +1,58 @@
+"""
+Registro de esquemas de ingesta para los datasets crudos.
+
+Cada esquema declara el dtype compacto de cada columna conocida:
+- Enteros anulables pequeños (Int8/Int16) en lugar de float64 por `assume_missing`.
+  Las columnas que luego se suman por estudiante usan Int16 para no desbordar.
+- Notas y promedios en float32 (dos decimales, rango 0-5).
+- Texto de baja cardinalidad como `category`; identificadores como string de Arrow.
+Las columnas del CSV que no estén en el esquema se dejan a la inferencia del parser.
+"""
+import hashlib
+import json
+
+ESQUEMAS = {
+    'dataset_estudiantes_v2': {
+        'estudiante_id': 'string[pyarrow]',
+        'genero': 'category',
+        'estrato': 'Int8',
+        'programa': 'category',
+        'puntaje_saber11': 'float32',
+        'colegio_procedencia': 'category',
+        'condicion_laboral': 'category',
+        'municipio_residencia': 'category',
+    },
+    'dataset_historico_v2': {
+        'estudiante_id': 'string[pyarrow]',
+        'anio_lectivo': 'Int16',
+        'periodo_lectivo': 'Int8',
+        'semestre_ordinal': 'Int8',
+        'estado_academico': 'category',
+        'promedio_semestral': 'float32',
+        'promedio_acumulado': 'float32',
+        'nota_final': 'float32',
+        'creditos_matriculados': 'Int16',
+        'creditos_aprobados': 'Int16',
+        'materias_reprobadas': 'Int16',
+    },
+}
+
+
+def obtener_esquema(nombre, columnas=None):
+    """
+    Devuelve el esquema del dataset `nombre`, restringido a `columnas` si se indica.
+    """
+    if nombre not in ESQUEMAS:
+        raise KeyError(f"No hay esquema registrado para el dataset: {nombre}")
+    esquema = ESQUEMAS[nombre]
+    if columnas is None:
+        return dict(esquema)
+    return {col: dtype for col, dtype in esquema.items() if col in columnas}
+
+
+def firma_esquema(nombre):
+    """
+    Hash estable del esquema. Cambiar un dtype invalida las copias cacheadas.
+    """
+    contenido = json.dumps(ESQUEMAS.get(nombre, {}), sort_keys=True)
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()[:12]
@@ -1,5 +1,6 @@
 import dask.dataframe as dd
 import pandas as pd
+import numpy as np
 import logging
 from src.validation.validator import AcademicValidator
 
@@ -11,18 +12,29 @@ class DataTransformer:
     Utiliza Dask para procesamiento distribuido/escalable.
     """
     
-    def __init__(self):
+    # 'agrupado': groupbys + merges independientes (varios shuffles de historico)
+    # 'un_shuffle': historico se reparte por estudiante_id una vez y el perfil
+    #               completo se calcula partición a partición
+    MODOS_PERFIL = ('agrupado', 'un_shuffle')
+
+    def __init__(self, modo_perfil='agrupado'):
+        if modo_perfil not in self.MODOS_PERFIL:
+            raise ValueError(f"Modo de perfil no soportado: {modo_perfil}. Opciones: {self.MODOS_PERFIL}")
         self.validator = AcademicValidator()
+        self.modo_perfil = modo_perfil
 
     def procesar(self, ddf_estudiantes, ddf_historico):
         """
         Calcula dataset final uniendo estudiantes con su historia académica reciente o agregada.
         """
-        logger.info("Iniciando transformación de datos...")
+        logger.info(f"Iniciando transformación de datos (perfil: {self.modo_perfil})...")
         
         # 1. Limpieza básica
         ddf_est = self._limpiar_estudiantes(ddf_estudiantes)
         ddf_hist = self._limpiar_historico(ddf_historico)
+
+        if self.modo_perfil == 'un_shuffle':
+            return self._procesar_un_shuffle(ddf_est, ddf_hist)
         
         # 2. Agregar información histórica (Perfilamiento de estudiante)
         # Calculamos el promedio acumulado más reciente y el estado actual
@@ -71,12 +83,162 @@ class DataTransformer:
         
         return ddf_final
 
+    def procesar_incremental(self, ddf_estudiantes, ddf_historico, ids_estudiantes):
+        """
+        Recalcula solo los perfiles de `ids_estudiantes`.
+        El resultado tiene el mismo esquema que `procesar` y se fusiona en la tabla maestra existente.
+        """
+        ids = list(ids_estudiantes)
+        logger.info(f"Transformación incremental: {len(ids)} estudiantes a recalcular")
+        ddf_est = ddf_estudiantes[ddf_estudiantes['estudiante_id'].isin(ids)]
+        ddf_hist = ddf_historico[ddf_historico['estudiante_id'].isin(ids)]
+        return self.procesar(ddf_est, ddf_hist)
+
+    @staticmethod
+    def calcular_huellas(ddf_estudiantes, ddf_historico, compute=True):
+        """
+        Huella por estudiante de sus filas crudas en estudiantes y en historico.
+
+        Cada huella es la suma (mod 2^64) de los hashes de sus filas: no depende del
+        orden ni del particionado, y cambia si se agrega, quita o modifica una fila.
+        Solo requiere una lectura y una reducción por grupo (sin shuffle de filas).
+
+        Con compute=False retorna las dos reducciones lazy, para calcularlas en el
+        mismo `dask.compute` que la escritura y leer los datos crudos una sola vez;
+        luego se combinan con `ensamblar_huellas`.
+        """
+        meta = pd.DataFrame({
+            'estudiante_id': ddf_estudiantes['estudiante_id']._meta,
+            'huella': pd.Series(dtype='uint64')
+        })
+        huella_est = ddf_estudiantes.map_partitions(_huella_filas, meta=meta) \
+            .groupby('estudiante_id')['huella'].sum()
+        meta = meta.assign(estudiante_id=ddf_historico['estudiante_id']._meta)
+        huella_hist = ddf_historico.map_partitions(_huella_filas, meta=meta) \
+            .groupby('estudiante_id')['huella'].sum()
+
+        if not compute:
+            return huella_est, huella_hist
+        return DataTransformer.ensamblar_huellas(*dd.compute(huella_est, huella_hist))
+
+    @staticmethod
+    def ensamblar_huellas(huella_est, huella_hist):
+        """
+        Une las huellas ya calculadas de estudiantes e historico en un DataFrame pandas.
+        """
+        # reindex con fill_value conserva uint64 (un NaN forzaría float64 y perdería bits)
+        ids = huella_est.index.union(huella_hist.index)
+        huellas = pd.DataFrame({
+            'huella_estudiante': huella_est.reindex(ids, fill_value=0),
+            'huella_historico': huella_hist.reindex(ids, fill_value=0),
+        })
+        return huellas.rename_axis('estudiante_id').reset_index()
+
+    @staticmethod
+    def detectar_cambios(huellas_actuales, huellas_previas):
+        """
+        Compara las huellas de dos ejecuciones.
+        Retorna (ids nuevos o modificados, ids que desaparecieron de los datos crudos).
+        """
+        comparacion = huellas_actuales.merge(
+            huellas_previas, on='estudiante_id', how='outer', suffixes=('', '_previa'), indicator=True
+        )
+        en_ambas = comparacion['_merge'] == 'both'
+        modificado = en_ambas & (
+            (comparacion['huella_estudiante'] != comparacion['huella_estudiante_previa']) |
+            (comparacion['huella_historico'] != comparacion['huella_historico_previa'])
+        )
+        nuevos_o_modificados = comparacion.loc[(comparacion['_merge'] == 'left_only') | modificado, 'estudiante_id']
+        eliminados = comparacion.loc[comparacion['_merge'] == 'right_only', 'estudiante_id']
+        return nuevos_o_modificados.tolist(), eliminados.tolist()
+
+    def _procesar_un_shuffle(self, ddf_est, ddf_hist):
+        """
+        Mismo resultado que el modo 'agrupado' con un único shuffle de historico.
+
+        Tras repartir por estudiante_id, todas las filas de un estudiante quedan en
+        la misma partición: sumas, último semestre y su promedio salen de una sola
+        pasada local. El merge con estudiantes es un `dd.merge` normal: solo mueve el
+        perfil (una fila por estudiante), no las filas de historico.
+
+        No se usa un merge partición a partición sobre los dos lados repartidos:
+        Dask no registra que las particiones de `hist_perfil` siguen alineadas con
+        las del shuffle, y los filtros posteriores sobre el resultado fallan con
+        más de una partición.
+        """
+        hist_perfil = self.perfil_historico(ddf_hist)
+        return dd.merge(ddf_est, hist_perfil, on='estudiante_id', how='inner')
+
+    @staticmethod
+    def perfil_historico(ddf_hist):
+        """
+        Perfil por estudiante de `ddf_hist` (totales, último semestre y su promedio)
+        con un único shuffle. La matriz de entrenamiento lo aplica a historia truncada.
+        """
+        columnas = ['estudiante_id', 'semestre_ordinal', 'promedio_acumulado',
+                    'creditos_aprobados', 'materias_reprobadas']
+        hist = ddf_hist[columnas].shuffle(on='estudiante_id')
+        return hist.map_partitions(_perfil_particion, meta=_perfil_particion(hist._meta))
+
     def _limpiar_estudiantes(self, ddf):
         # Estandarizacion
         if 'programa' in ddf.columns:
-            ddf['programa'] = ddf['programa'].str.upper().str.strip()
+            if isinstance(ddf['programa'].dtype, pd.CategoricalDtype):
+                # Con el esquema de ingesta 'programa' es categórico: se normalizan
+                # las categorías de cada partición en vez de cada fila.
+                ddf['programa'] = ddf['programa'].map_partitions(
+                    _normalizar_categorias, meta=ddf['programa']._meta
+                )
+            else:
+                ddf['programa'] = ddf['programa'].str.upper().str.strip()
         return ddf
 
     def _limpiar_historico(self, ddf):
         # Validar rangos
         return ddf
+
+
+def _normalizar_categorias(serie):
+    """
+    Mayúsculas y sin espacios sobre las categorías, fusionando las que colisionan.
+    """
+    limpias = serie.cat.categories.str.upper().str.strip()
+    categorias, remapeo = np.unique(np.asarray(limpias, dtype=object), return_inverse=True)
+    codigos = serie.cat.codes.to_numpy()
+    codigos = np.where(codigos >= 0, remapeo[codigos], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=categorias),
+        index=serie.index, name=serie.name
+    )
+
+
+def _perfil_particion(pdf):
+    """
+    Perfil de cada estudiante de una partición de historico ya repartida por estudiante_id.
+    Reproduce groupby-sum + merge con el semestre máximo del modo 'agrupado',
+    incluidos empates en el semestre máximo (una fila por cada empate).
+    """
+    grupos = pdf.groupby('estudiante_id', sort=False)
+    stats = grupos[['creditos_aprobados', 'materias_reprobadas']].sum().reset_index()
+    stats = stats.rename(columns={
+        'creditos_aprobados': 'total_creditos_aprobados',
+        'materias_reprobadas': 'total_materias_reprobadas'
+    })
+
+    max_semestre = grupos['semestre_ordinal'].transform('max')
+    es_ultimo = (pdf['semestre_ordinal'] == max_semestre).fillna(False)
+    es_ultimo |= pdf['semestre_ordinal'].isna() & max_semestre.isna()
+    ultimo_estado = pdf.loc[es_ultimo.astype(bool), ['estudiante_id', 'semestre_ordinal', 'promedio_acumulado']]
+    ultimo_estado = ultimo_estado.rename(columns={
+        'semestre_ordinal': 'ultimo_semestre_cursado',
+        'promedio_acumulado': 'promedio_ultimo_semestre'
+    })
+
+    return pd.merge(stats, ultimo_estado, on='estudiante_id', how='left')
+
+
+def _huella_filas(pdf):
+    return pd.DataFrame({
+        'estudiante_id': pdf['estudiante_id'],
+        'huella': pd.util.hash_pandas_object(pdf, index=False).to_numpy()
+    }, index=pdf.index)
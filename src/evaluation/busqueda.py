@@ -0,0 +1,201 @@
+"""
+Validación cruzada y búsqueda de hiperparámetros en paralelo.
+
+Cada tarea (candidato, fold) se ejecuta en un pool de procesos. La matriz de
+features no viaja con las tareas: X e y se guardan como .npy (o se reutilizan
+los del artefacto de ConstructorMatriz) y cada worker los abre una sola vez con
+mmap, así que todos los procesos comparten las mismas páginas del sistema
+operativo. Las tareas solo llevan parámetros y el número de fold; los índices
+de los folds se recalculan en el worker de forma determinista.
+
+Con `factor` > 1 la búsqueda usa successive halving: todos los candidatos se
+evalúan con `recurso_min` filas de entrenamiento, pasa el mejor 1/factor a la
+siguiente ronda con `factor` veces más filas, y así hasta usar el train completo.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEMILLA = 42
+
+# Grillas por defecto para los modelos de src.models.entrenamiento
+GRILLAS = {
+    'logistica': {'C': [0.01, 0.1, 1.0, 10.0]},
+    'hist_gb': {'learning_rate': [0.05, 0.1, 0.2], 'max_leaf_nodes': [15, 31, 63], 'l2_regularization': [0.0, 1.0]},
+    'xgboost': {'max_depth': [4, 6, 8], 'learning_rate': [0.05, 0.1], 'subsample': [0.8, 1.0]},
+}
+
+# Arreglos abiertos por cada worker (uno por proceso, ver _iniciar_worker)
+_COMPARTIDOS = {}
+
+
+def expandir_grilla(grilla):
+    """
+    Lista de dicts con todas las combinaciones de la grilla.
+    """
+    claves = sorted(grilla)
+    return [dict(zip(claves, valores)) for valores in product(*(grilla[c] for c in claves))]
+
+
+class BusquedaParalela:
+    """
+    Evalúa candidatos de un modelo con CV estratificada de `n_folds` en `n_workers` procesos.
+    """
+
+    def __init__(self, modelo, grilla=None, n_folds=5, n_workers=None, factor=3, recurso_min=None):
+        self.modelo = modelo
+        self.candidatos = expandir_grilla(grilla if grilla is not None else GRILLAS[modelo])
+        self.n_folds = n_folds
+        self.n_workers = n_workers or os.cpu_count()
+        self.factor = factor
+        self.recurso_min = recurso_min
+
+    def ejecutar(self, X, y, salida=None):
+        """
+        Retorna el leaderboard (DataFrame ordenado por AUC de la última ronda de cada candidato).
+        Si se pasa `salida`, lo guarda como CSV.
+        """
+        with tempfile.TemporaryDirectory(prefix="busqueda_") as tmp:
+            ruta_X, ruta_y = _ruta_compartida(X, Path(tmp) / "X.npy"), _ruta_compartida(y, Path(tmp) / "y.npy")
+            n_train = len(y) - len(y) // self.n_folds
+            rondas = self._rondas(n_train)
+            logger.info(
+                f"Búsqueda {self.modelo}: {len(self.candidatos)} candidatos x {self.n_folds} folds, "
+                f"rondas de {rondas} filas, {self.n_workers} procesos"
+            )
+
+            resultados, vivos = [], list(range(len(self.candidatos)))
+            with ProcessPoolExecutor(self.n_workers, initializer=_iniciar_worker,
+                                     initargs=(str(ruta_X), str(ruta_y))) as pool:
+                for ronda, recurso in enumerate(rondas):
+                    tareas = [(self.modelo, self.candidatos[i], fold, self.n_folds, recurso)
+                              for i in vivos for fold in range(self.n_folds)]
+                    inicio = time.perf_counter()
+                    folds = list(pool.map(_evaluar_fold, tareas, chunksize=1))
+                    tabla = self._resumir(vivos, folds, ronda, recurso)
+                    resultados.append(tabla)
+                    logger.info(
+                        f"Ronda {ronda}: {len(vivos)} candidatos con {recurso} filas en "
+                        f"{time.perf_counter() - inicio:.1f}s, mejor AUC {tabla['auc_media'].max():.4f}"
+                    )
+                    if ronda + 1 < len(rondas):
+                        n_siguiente = max(1, int(np.ceil(len(vivos) / self.factor)))
+                        vivos = tabla.nlargest(n_siguiente, 'auc_media')['candidato'].tolist()
+
+        leaderboard = _leaderboard(pd.concat(resultados, ignore_index=True))
+        if salida is not None:
+            Path(salida).parent.mkdir(parents=True, exist_ok=True)
+            leaderboard.to_csv(salida, index=False)
+            logger.info(f"Leaderboard guardado en {salida}")
+        return leaderboard
+
+    def _rondas(self, n_train):
+        """
+        Filas de entrenamiento por ronda; una sola ronda (train completo) sin successive halving.
+        """
+        if self.factor <= 1 or len(self.candidatos) == 1:
+            return [n_train]
+        n_rondas = int(np.floor(np.log(len(self.candidatos)) / np.log(self.factor))) + 1
+        recurso_min = self.recurso_min or max(n_train // self.factor ** (n_rondas - 1), 1)
+        rondas = [min(n_train, recurso_min * self.factor ** r) for r in range(n_rondas)]
+        rondas[-1] = n_train
+        return sorted(set(rondas))
+
+    def _resumir(self, vivos, folds, ronda, recurso):
+        metricas = pd.DataFrame(folds)
+        metricas['candidato'] = np.repeat(vivos, self.n_folds)
+        tabla = metricas.groupby('candidato', sort=False).agg(
+            auc_media=('auc', 'mean'), auc_std=('auc', 'std'),
+            ap_media=('average_precision', 'mean'),
+            segundos_ajuste=('segundos_ajuste', 'mean'),
+            filas_por_segundo_scoring=('filas_por_segundo_scoring', 'mean'),
+            # Filas realmente usadas por fold (el presupuesto `recurso` puede superar el train de un fold)
+            filas_train=('filas_train', 'mean'),
+        ).reset_index()
+        tabla['ronda'] = ronda
+        tabla['modelo'] = self.modelo
+        tabla['parametros'] = [json.dumps(self.candidatos[i], sort_keys=True) for i in tabla['candidato']]
+        return tabla
+
+
+def _leaderboard(resultados):
+    """
+    Una fila por candidato con su última ronda alcanzada; los que llegaron más lejos van primero.
+    """
+    ultima = resultados.sort_values('ronda').groupby('candidato').tail(1)
+    return ultima.sort_values(['ronda', 'auc_media'], ascending=False).reset_index(drop=True)[[
+        'modelo', 'candidato', 'parametros', 'ronda', 'filas_train', 'auc_media', 'auc_std',
+        'ap_media', 'segundos_ajuste', 'filas_por_segundo_scoring',
+    ]]
+
+
+def _ruta_compartida(arreglo, destino):
+    """
+    Ruta .npy abrible con mmap: la del propio arreglo si ya es un memmap de un .npy, o una copia en `destino`.
+    """
+    ruta = getattr(arreglo, 'filename', None)
+    if ruta is not None and str(ruta).endswith('.npy'):
+        return Path(ruta)
+    np.save(destino, np.asarray(arreglo))
+    return destino
+
+
+def _iniciar_worker(ruta_X, ruta_y):
+    # Un hilo por proceso: el paralelismo viene del pool, no de BLAS/OpenMP
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+
+    _COMPARTIDOS['X'] = np.load(ruta_X, mmap_mode='r')
+    _COMPARTIDOS['y'] = np.load(ruta_y, mmap_mode='r')
+
+
+def _indices_fold(y, fold, n_folds):
+    from sklearn.model_selection import StratifiedKFold
+
+    separador = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=SEMILLA)
+    for i, (train, test) in enumerate(separador.split(np.zeros(len(y)), y)):
+        if i == fold:
+            return train, test
+
+
+def _evaluar_fold(tarea):
+    from sklearn.metrics import average_precision_score, roc_auc_score
+    from src.models.entrenamiento import crear_modelo
+
+    nombre, parametros, fold, n_folds, recurso = tarea
+    X, y = _COMPARTIDOS['X'], _COMPARTIDOS['y']
+    train, test = _indices_fold(y, fold, n_folds)
+    if recurso < len(train):
+        # Submuestra fija por fold: las rondas siguientes contienen a las anteriores
+        train = np.random.default_rng(SEMILLA + fold).permutation(train)[:recurso]
+    train.sort()
+
+    if nombre == 'xgboost':
+        parametros = {**parametros, 'n_jobs': 1}
+    modelo = crear_modelo(nombre, **parametros)
+    inicio = time.perf_counter()
+    modelo.fit(X[train], y[train])
+    segundos_ajuste = time.perf_counter() - inicio
+
+    X_test = X[test]
+    inicio = time.perf_counter()
+    probabilidad = modelo.predict_proba(X_test)[:, 1]
+    segundos_scoring = time.perf_counter() - inicio
+
+    return {
+        'auc': roc_auc_score(y[test], probabilidad),
+        'average_precision': average_precision_score(y[test], probabilidad),
+        'filas_train': len(train),
+        'segundos_ajuste': segundos_ajuste,
+        'filas_por_segundo_scoring': len(test) / max(segundos_scoring, 1e-9),
+    }
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import dask
+import numpy as np
+import pandas as pd
+
+from src.etl.transform import DataTransformer
+
+logger = logging.getLogger(__name__)
+
+# Variables numéricas de la tabla maestra usadas por los modelos de deserción
+FEATURES_DESERCION = [
+    'estrato',
+    'puntaje_saber11',
+    'total_creditos_aprobados',
+    'total_materias_reprobadas',
+    'ultimo_semestre_cursado',
+    'promedio_ultimo_semestre',
+]
+
+# Punto de observación de cada estudiante (ver ConstructorMatriz); forma parte de la huella
+CORTE = 'semestre_anterior_al_evento'
+
+
+class ConstructorMatriz:
+    """
+    Construye la matriz de entrenamiento (X float32, y int8) desde master_table.parquet
+    y el histórico, y la guarda como artefacto en `cache_dir`:
+
+        matriz_desercion/
+            X.npy, y.npy          arreglos NumPy (se pueden abrir con mmap)
+            ids.parquet           estudiante_id de cada fila
+            manifest.json         variables, huella de las fuentes y tamaño
+
+    Cada estudiante se observa en un punto de corte: el semestre anterior a su primer
+    semestre con estado de deserción o, si no desertó, el anterior a su último semestre
+    observado. Las variables del histórico (totales, último semestre y su promedio) se
+    derivan solo de los semestres anteriores al corte, con el mismo perfil del ETL; la
+    etiqueta es si el semestre siguiente es de deserción. Así la matriz no ve el semestre
+    de deserción, y en producción el modelo puntúa la historia hasta la fecha. Las
+    demás variables (estrato, Saber 11) salen de la tabla maestra. Los estudiantes sin
+    semestres antes del corte quedan fuera.
+
+    Mientras la huella de las fuentes no cambie, el artefacto se reutiliza y reentrenar
+    no vuelve a derivar las variables.
+    """
+
+    def __init__(self, cache_dir, features=None, estado_desercion='Desertor'):
+        self.cache_dir = Path(cache_dir)
+        self.features = list(features or FEATURES_DESERCION)
+        self.estado_desercion = estado_desercion
+
+    def obtener(self, ruta_master, ddf_historico, huella_historico=None, mmap=True):
+        """
+        Retorna (X, y, ids, manifest) desde el artefacto, reconstruyéndolo si las fuentes cambiaron.
+        """
+        ruta = self.cache_dir / "matriz_desercion"
+        huella = self._huella(ruta_master, huella_historico)
+        manifest = self._leer_manifest(ruta)
+
+        if manifest is not None and manifest.get('huella') == huella:
+            logger.info(f"Matriz de features HIT: {ruta} ({manifest['filas']} filas)")
+        else:
+            logger.info("Matriz de features reconstruida (fuentes nuevas o modificadas)")
+            manifest = self._construir(ruta, ruta_master, ddf_historico, huella)
+
+        modo = 'r' if mmap else None
+        X = np.load(ruta / "X.npy", mmap_mode=modo)
+        y = np.load(ruta / "y.npy", mmap_mode=modo)
+        ids = pd.read_parquet(ruta / "ids.parquet")['estudiante_id']
+        return X, y, ids, manifest
+
+    def construir_features(self, pdf):
+        """
+        Matriz float32 de `pdf` en el orden de `self.features` (nulos como NaN).
+        """
+        matriz = np.empty((len(pdf), len(self.features)), dtype=np.float32)
+        for j, feature in enumerate(self.features):
+            matriz[:, j] = pdf[feature].to_numpy(dtype=np.float32, na_value=np.nan)
+        return matriz
+
+    def _construir(self, ruta, ruta_master, ddf_historico, huella):
+        limites, desertores = self._cortes(ddf_historico)
+
+        # Perfil del histórico con solo los semestres anteriores al corte de cada estudiante
+        hist = ddf_historico.map_partitions(_antes_del_corte, limites, meta=ddf_historico._meta)
+        perfil = DataTransformer.perfil_historico(hist).compute()
+        de_perfil = [f for f in self.features if f in perfil.columns]
+        de_master = [f for f in self.features if f not in perfil.columns]
+
+        master = pd.read_parquet(ruta_master, columns=['estudiante_id'] + de_master)
+        master = master.drop_duplicates('estudiante_id')
+        master['estudiante_id'] = master['estudiante_id'].astype(str)
+        perfil['estudiante_id'] = perfil['estudiante_id'].astype(str)
+        matriz = master.merge(perfil[['estudiante_id'] + de_perfil], on='estudiante_id', how='inner')
+
+        y = matriz['estudiante_id'].isin(desertores).astype(np.int8).to_numpy()
+        X = self.construir_features(matriz)
+
+        ruta.mkdir(parents=True, exist_ok=True)
+        np.save(ruta / "X.npy", X)
+        np.save(ruta / "y.npy", y)
+        matriz[['estudiante_id']].to_parquet(ruta / "ids.parquet", index=False)
+        manifest = {'huella': huella, 'features': self.features, 'filas': int(len(y)),
+                    'positivos': int(y.sum()), 'estado_desercion': self.estado_desercion,
+                    'corte': CORTE}
+        with open(ruta / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        logger.info(f"Matriz de features guardada: {len(y)} filas, {int(y.sum())} desertores "
+                    f"({len(master) - matriz['estudiante_id'].nunique()} estudiantes sin historia antes del corte)")
+        return manifest
+
+    def _cortes(self, ddf_historico):
+        """
+        Semestre de corte por estudiante (primer semestre de deserción o último observado)
+        e ids de los que desertaron.
+        """
+        hist = ddf_historico[['estudiante_id', 'semestre_ordinal', 'estado_academico']]
+        es_desertor = hist['estado_academico'].astype(str).str.strip().str.lower() == self.estado_desercion.lower()
+        desercion, ultimo = dask.compute(
+            hist[es_desertor].groupby('estudiante_id')['semestre_ordinal'].min(),
+            hist.groupby('estudiante_id')['semestre_ordinal'].max()
+        )
+        limites = desercion.reindex(ultimo.index).fillna(ultimo).astype('float64')
+        limites.index = limites.index.astype(str)
+        return limites, set(desercion.index.astype(str))
+
+    def _huella(self, ruta_master, huella_historico):
+        """
+        Tamaño y mtime de los archivos de la tabla maestra, huella del histórico y variables.
+        """
+        archivos = sorted(Path(ruta_master).rglob('*.parquet')) if Path(ruta_master).is_dir() else [Path(ruta_master)]
+        contenido = json.dumps({
+            'master': [(str(a.relative_to(ruta_master)) if a != Path(ruta_master) else a.name,
+                        a.stat().st_size, a.stat().st_mtime_ns) for a in archivos],
+            'historico': huella_historico,
+            'features': self.features,
+            'estado_desercion': self.estado_desercion,
+            'corte': CORTE,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _leer_manifest(ruta):
+        try:
+            with open(ruta / "manifest.json", encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+def _antes_del_corte(pdf, limites):
+    """
+    Filas de historico con semestre anterior al corte de su estudiante.
+    """
+    limite = pdf['estudiante_id'].astype(str).map(limites).to_numpy(dtype='float64', na_value=np.nan)
+    semestre = pdf['semestre_ordinal'].to_numpy(dtype='float64', na_value=np.nan)
+    return pdf[semestre < limite]
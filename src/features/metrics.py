@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 
 class AcademicMetrics:
     """
@@ -41,11 +42,95 @@ class AcademicMetrics:
             return 0.0
         return min(creditos_aprobados / creditos_totales_programa, 1.0)
 
+    @staticmethod
+    def calcular_indice_riesgo_vectorizado(promedio, tasa_reprobacion, semestre_actual):
+        """
+        Versión por arreglos de `calcular_indice_riesgo` (mismo resultado, elemento a elemento).
+
+        Acepta escalares, arreglos NumPy, Series de pandas o columnas Dask (en ese caso
+        se aplica con `map_partitions`). NaN en el promedio o la tasa da NaN, igual que
+        la versión escalar; un semestre NaN usa el factor 0.9.
+        """
+        return _aplicar(_indice_riesgo, promedio, tasa_reprobacion, semestre_actual)
+
+    @staticmethod
+    def calcular_tasa_progresion_vectorizada(creditos_aprobados, creditos_totales_programa):
+        """
+        Versión por arreglos de `calcular_tasa_progresion`.
+        Programas con 0 créditos dan 0.0; NaN se propaga como en la versión escalar.
+        """
+        return _aplicar(_tasa_progresion, creditos_aprobados, creditos_totales_programa)
+
     @staticmethod
     def probabilidad_desercion_logistica(features, coeficientes, intercepto):
         """
         Implementación manual de regresión logística para inferencia rápida.
         P(Y=1) = 1 / (1 + e^-(beta0 + beta*x))
+        Para lotes con nombres de variables ver `src.models.scoring.MotorScoringLogistico`.
         """
         z = intercepto + np.dot(features, coeficientes)
-        return 1 / (1 + np.exp(-z))
+        return sigmoide_estable(z)
+
+def sigmoide_estable(z):
+    """
+    1 / (1 + e^-z) sin desbordes: para z < 0 se evalúa como e^z / (1 + e^z),
+    así la exponencial nunca recibe un argumento positivo grande. Conserva el dtype
+    de punto flotante de `z` (float32 en el scoring por lotes).
+    """
+    z = np.asarray(z)
+    if not np.issubdtype(z.dtype, np.floating):
+        z = z.astype(np.float64)
+    e = np.exp(-np.abs(z))
+    uno = z.dtype.type(1)
+    resultado = np.where(z >= 0, uno / (uno + e), e / (uno + e))
+    return resultado if resultado.ndim else resultado.item()
+
+
+def _indice_riesgo(promedio, tasa_reprobacion, semestre_actual):
+    # Mismas operaciones y en el mismo orden que la versión escalar: resultados idénticos en float64
+    MAX_PROMEDIO = 5.0
+    w1, w2 = 0.5, 0.3
+
+    norm_promedio = np.minimum(promedio / MAX_PROMEDIO, 1.0)
+    risk_promedio = 1.0 - norm_promedio
+
+    factor_semestre = np.where(semestre_actual <= 2, 1.1, 0.9)
+
+    indice = (w1 * risk_promedio) + (w2 * tasa_reprobacion)
+    indice *= factor_semestre
+
+    return np.minimum(np.maximum(indice, 0.0), 1.0)
+
+
+def _tasa_progresion(creditos_aprobados, creditos_totales_programa):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tasa = np.minimum(creditos_aprobados / creditos_totales_programa, 1.0)
+    return np.where(creditos_totales_programa == 0, 0.0, tasa)
+
+
+def _como_arreglo(valor):
+    """
+    float64 NumPy; los nulos de dtypes anulables de pandas pasan a NaN.
+    """
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return valor.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(valor, dtype=np.float64)
+
+
+def _aplicar(funcion, *args):
+    """
+    Ejecuta `funcion` (sobre arreglos NumPy) conservando el tipo de la entrada:
+    Dask -> map_partitions, Series -> Series con el mismo índice, escalar -> float.
+    """
+    if any(hasattr(a, 'map_partitions') for a in args):
+        import dask.dataframe as dd
+
+        return dd.map_partitions(_aplicar, funcion, *args, meta=pd.Series(dtype='float64'))
+
+    resultado = funcion(*(_como_arreglo(a) for a in args))
+    serie = next((a for a in args if isinstance(a, pd.Series)), None)
+    if serie is not None:
+        return pd.Series(resultado, index=serie.index, dtype='float64')
+    if np.ndim(resultado) == 0:
+        return float(resultado)
+    return resultado
@@ -0,0 +1,115 @@
+"""
+Entrenamiento de modelos de deserción sobre la matriz de features cacheada.
+
+Modelos disponibles (`MODELOS`):
+- logistica: imputación por mediana + estandarización + regresión logística.
+  Además del estimador se exportan sus coeficientes en escala original para
+  MotorScoringLogistico (scoring por lotes sin scikit-learn).
+- hist_gb:   HistGradientBoostingClassifier (maneja NaN de forma nativa).
+- xgboost:   XGBClassifier con tree_method='hist' (importado solo si se usa).
+"""
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEMILLA = 42
+
+
+def _logistica(**params):
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return Pipeline([
+        ('imputador', SimpleImputer(strategy='median')),
+        ('escalador', StandardScaler()),
+        ('modelo', LogisticRegression(max_iter=1000, class_weight='balanced', **params)),
+    ])
+
+
+def _hist_gb(**params):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+
+    return HistGradientBoostingClassifier(random_state=SEMILLA, **params)
+
+
+def _xgboost(**params):
+    from xgboost import XGBClassifier
+
+    opciones = dict(tree_method='hist', n_estimators=300, learning_rate=0.1,
+                    eval_metric='auc', random_state=SEMILLA, n_jobs=-1)
+    return XGBClassifier(**{**opciones, **params})
+
+
+MODELOS = {
+    'logistica': _logistica,
+    'hist_gb': _hist_gb,
+    'xgboost': _xgboost,
+}
+
+
+def crear_modelo(nombre, **params):
+    if nombre not in MODELOS:
+        raise ValueError(f"Modelo desconocido: {nombre}. Opciones: {sorted(MODELOS)}")
+    return MODELOS[nombre](**params)
+
+
+def entrenar(nombre, X, y, test_size=0.2, **params):
+    """
+    Ajusta `nombre` con partición estratificada train/test y mide la corrida.
+    Retorna (modelo, metricas).
+    """
+    from sklearn.metrics import average_precision_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    indices = np.arange(len(y))
+    idx_train, idx_test = train_test_split(indices, test_size=test_size, stratify=y, random_state=SEMILLA)
+    # Con X memory-mapped solo se leen las filas de cada partición
+    X_train, X_test = np.asarray(X[np.sort(idx_train)]), np.asarray(X[np.sort(idx_test)])
+    y_train, y_test = np.asarray(y[np.sort(idx_train)]), np.asarray(y[np.sort(idx_test)])
+
+    modelo = crear_modelo(nombre, **params)
+    inicio = time.perf_counter()
+    modelo.fit(X_train, y_train)
+    segundos_ajuste = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    probabilidad = modelo.predict_proba(X_test)[:, 1]
+    segundos_scoring = time.perf_counter() - inicio
+
+    metricas = {
+        'auc': float(roc_auc_score(y_test, probabilidad)),
+        'average_precision': float(average_precision_score(y_test, probabilidad)),
+        'filas_train': int(len(y_train)),
+        'filas_test': int(len(y_test)),
+        'tasa_positivos': float(y.mean()),
+        'segundos_ajuste': round(segundos_ajuste, 3),
+        'filas_por_segundo_scoring': round(len(y_test) / max(segundos_scoring, 1e-9)),
+    }
+    logger.info(
+        f"{nombre}: AUC={metricas['auc']:.4f} ajuste={metricas['segundos_ajuste']}s "
+        f"scoring={metricas['filas_por_segundo_scoring']:,} filas/s"
+    )
+    return modelo, metricas
+
+
+def coeficientes_logistica(modelo, features):
+    """
+    Coeficientes de un pipeline 'logistica' llevados a la escala original de las variables,
+    en el formato de ConjuntoCoeficientes. La imputación usa las medianas del ajuste.
+    """
+    imputador = modelo.named_steps['imputador']
+    escalador = modelo.named_steps['escalador']
+    regresion = modelo.named_steps['modelo']
+
+    beta = regresion.coef_[0] / escalador.scale_
+    intercepto = regresion.intercept_[0] - float(np.sum(beta * escalador.mean_))
+    return {
+        'intercepto': float(intercepto),
+        'coeficientes': {f: float(b) for f, b in zip(features, beta)},
+        'imputacion': {f: float(m) for f, m in zip(features, imputador.statistics_)},
+    }
@@ -0,0 +1,133 @@
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RegistroModelos:
+    """
+    Registro local de modelos versionados.
+
+        <raiz>/<nombre>/v0001/
+            modelo.joblib       estimador scikit-learn / XGBoost serializado
+            metadatos.json      variables, métricas, tiempos, huella de la matriz
+            coeficientes.json   (modelos lineales) conjunto para MotorScoringLogistico
+
+    Las versiones son inmutables; `cargar` sin versión toma la más reciente.
+    """
+
+    def __init__(self, raiz):
+        self.raiz = Path(raiz)
+
+    def versiones(self, nombre):
+        directorio = self.raiz / nombre
+        if not directorio.exists():
+            return []
+        return sorted(d.name for d in directorio.iterdir() if re.fullmatch(r"v\d{4}", d.name))
+
+    def listar(self):
+        """
+        Tabla con la última versión y métricas de cada modelo registrado.
+        """
+        filas = []
+        for directorio in sorted(d for d in self.raiz.glob('*') if d.is_dir()) if self.raiz.exists() else []:
+            versiones = self.versiones(directorio.name)
+            if versiones:
+                metadatos = self.metadatos(directorio.name, versiones[-1])
+                filas.append({'modelo': directorio.name, 'version': versiones[-1],
+                              'versiones': len(versiones), **metadatos.get('metricas', {})})
+        return pd.DataFrame(filas)
+
+    def guardar(self, nombre, modelo, features, metadatos=None, coeficientes=None):
+        """
+        Guarda una nueva versión de `nombre` y retorna su identificador (ej. 'v0003').
+        """
+        versiones = self.versiones(nombre)
+        version = f"v{int(versiones[-1][1:]) + 1 if versiones else 1:04d}"
+        directorio = self.raiz / nombre / version
+        directorio.mkdir(parents=True)
+
+        joblib.dump(modelo, directorio / "modelo.joblib")
+        contenido = dict(metadatos or {}, nombre=nombre, version=version, features=list(features),
+                         fecha=datetime.now().isoformat(timespec='seconds'))
+        with open(directorio / "metadatos.json", 'w', encoding='utf-8') as f:
+            json.dump(contenido, f, indent=2, default=_serializable)
+        if coeficientes is not None:
+            with open(directorio / "coeficientes.json", 'w', encoding='utf-8') as f:
+                json.dump(dict(coeficientes, nombre=f"{nombre}_{version}"), f, indent=2, default=_serializable)
+
+        logger.info(f"Modelo registrado: {nombre} {version} ({directorio})")
+        return version
+
+    def metadatos(self, nombre, version=None):
+        with open(self._directorio(nombre, version) / "metadatos.json", encoding='utf-8') as f:
+            return json.load(f)
+
+    def cargar(self, nombre, version=None):
+        """
+        Retorna un ModeloRegistrado listo para puntuar.
+        """
+        directorio = self._directorio(nombre, version)
+        metadatos = self.metadatos(nombre, directorio.name)
+        modelo = joblib.load(directorio / "modelo.joblib")
+        return ModeloRegistrado(modelo, metadatos)
+
+    def ruta_coeficientes(self, nombre, version=None):
+        """
+        coeficientes.json de un modelo lineal (para MotorScoringLogistico), o None.
+        """
+        ruta = self._directorio(nombre, version) / "coeficientes.json"
+        return ruta if ruta.exists() else None
+
+    def _directorio(self, nombre, version=None):
+        versiones = self.versiones(nombre)
+        if not versiones:
+            raise FileNotFoundError(f"No hay versiones registradas de {nombre} en {self.raiz}")
+        version = version or versiones[-1]
+        if version not in versiones:
+            raise FileNotFoundError(f"Versión {version} de {nombre} no existe. Disponibles: {versiones}")
+        return self.raiz / nombre / version
+
+
+class ModeloRegistrado:
+    """
+    Estimador cargado del registro con sus variables: alinea columnas por nombre y
+    puntúa DataFrames pandas o Dask (por partición).
+    """
+
+    def __init__(self, modelo, metadatos):
+        self.modelo = modelo
+        self.metadatos = metadatos
+        self.features = metadatos['features']
+        self.columna = f"prob_{metadatos['nombre']}"
+
+    def predecir_proba(self, X):
+        """
+        Probabilidad de la clase positiva para una matriz ya alineada.
+        """
+        return self.modelo.predict_proba(X)[:, 1].astype(np.float32)
+
+    def puntuar(self, pdf):
+        matriz = np.empty((len(pdf), len(self.features)), dtype=np.float32)
+        for j, feature in enumerate(self.features):
+            matriz[:, j] = pdf[feature].to_numpy(dtype=np.float32, na_value=np.nan)
+        probabilidad = self.predecir_proba(matriz) if len(pdf) else np.empty(0, dtype=np.float32)
+        return pd.Series(probabilidad, index=pdf.index, name=self.columna)
+
+    def puntuar_dask(self, ddf):
+        return ddf.map_partitions(self.puntuar, meta=pd.Series(dtype='float32', name=self.columna))
+
+
+def _serializable(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return str(valor)
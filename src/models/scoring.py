@@ -0,0 +1,239 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.features.metrics import sigmoide_estable
+from src.models.registro import RegistroModelos
+
+logger = logging.getLogger(__name__)
+
+# Bandas del puntaje de riesgo (0-100): límite inferior y etiqueta, de mayor a menor
+BANDAS_RIESGO = [(70.0, 'Alto'), (40.0, 'Medio'), (0.0, 'Bajo')]
+
+
+class ConjuntoCoeficientes:
+    """
+    Coeficientes de una regresión logística con variables nombradas.
+
+    Formato JSON:
+        {"nombre": "desercion_v1", "intercepto": -1.2,
+         "coeficientes": {"promedio_ultimo_semestre": -0.8, ...},
+         "imputacion": {"promedio_ultimo_semestre": 3.0, ...}}
+
+    `imputacion` es opcional: una variable faltante sin valor de imputación
+    deja la probabilidad de esa fila en NaN.
+    """
+
+    def __init__(self, nombre, coeficientes, intercepto, imputacion=None):
+        self.nombre = nombre
+        self.features = list(coeficientes)
+        self.beta = np.asarray([coeficientes[f] for f in self.features], dtype=np.float32)
+        self.intercepto = np.float32(intercepto)
+        imputacion = imputacion or {}
+        self.imputacion = np.asarray(
+            [imputacion.get(f, np.nan) for f in self.features], dtype=np.float32
+        )
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(datos['nombre'], datos['coeficientes'], datos['intercepto'], datos.get('imputacion'))
+
+    @classmethod
+    def desde_json(cls, ruta):
+        with open(ruta, encoding='utf-8') as f:
+            return cls.desde_dict(json.load(f))
+
+    @property
+    def columna(self):
+        return f"prob_{self.nombre}"
+
+
+class MotorScoringLogistico:
+    """
+    Scoring por lotes de uno o varios conjuntos de coeficientes lado a lado.
+
+    Las columnas del DataFrame se alinean por nombre con las variables de cada
+    conjunto; el cálculo se hace en bloques float32 de `tamano_bloque` filas
+    (memoria temporal acotada) con una sigmoide estable. Sobre Dask se aplica
+    partición a partición con `map_partitions`.
+    """
+
+    def __init__(self, conjuntos, tamano_bloque=65_536):
+        self.conjuntos = list(conjuntos)
+        nombres = [c.nombre for c in self.conjuntos]
+        if len(set(nombres)) != len(nombres):
+            raise ValueError(f"Nombres de conjuntos de coeficientes repetidos: {nombres}")
+        self.tamano_bloque = tamano_bloque
+        # Unión ordenada de variables: cada partición se convierte a float32 una sola vez
+        self.features = list(dict.fromkeys(f for c in self.conjuntos for f in c.features))
+        self._indices = {
+            c.nombre: np.asarray([self.features.index(f) for f in c.features], dtype=np.intp)
+            for c in self.conjuntos
+        }
+
+    @classmethod
+    def cargar(cls, rutas, **kwargs):
+        """
+        Carga conjuntos desde archivos JSON (o todos los *.json de un directorio).
+        """
+        rutas = [rutas] if isinstance(rutas, (str, Path)) else list(rutas)
+        archivos = []
+        for ruta in map(Path, rutas):
+            archivos.extend(sorted(ruta.glob('*.json')) if ruta.is_dir() else [ruta])
+        conjuntos = [ConjuntoCoeficientes.desde_json(a) for a in archivos]
+        logger.info(f"Conjuntos de coeficientes cargados: {[c.nombre for c in conjuntos]}")
+        return cls(conjuntos, **kwargs)
+
+    @property
+    def columnas_salida(self):
+        return [c.columna for c in self.conjuntos]
+
+    def alinear(self, pdf):
+        """
+        Matriz float32 (filas x variables) en el orden de `self.features`; nulos como NaN.
+        """
+        faltantes = [f for f in self.features if f not in pdf.columns]
+        if faltantes:
+            raise KeyError(f"Variables requeridas por los coeficientes ausentes en la tabla: {faltantes}")
+        matriz = np.empty((len(pdf), len(self.features)), dtype=np.float32)
+        for j, feature in enumerate(self.features):
+            matriz[:, j] = pdf[feature].to_numpy(dtype=np.float32, na_value=np.nan)
+        return matriz
+
+    def puntuar(self, pdf):
+        """
+        Probabilidades (float32) de cada conjunto para un DataFrame pandas.
+        """
+        matriz = self.alinear(pdf)
+        salida = np.empty((len(pdf), len(self.conjuntos)), dtype=np.float32)
+        for inicio in range(0, len(pdf), self.tamano_bloque):
+            bloque = matriz[inicio:inicio + self.tamano_bloque]
+            for k, conjunto in enumerate(self.conjuntos):
+                x = bloque[:, self._indices[conjunto.nombre]]
+                faltantes = np.isnan(x)
+                if faltantes.any():
+                    x = np.where(faltantes, conjunto.imputacion, x)
+                z = x @ conjunto.beta + conjunto.intercepto
+                salida[inicio:inicio + len(bloque), k] = sigmoide_estable(z)
+        return pd.DataFrame(salida, columns=self.columnas_salida, index=pdf.index)
+
+    def puntuar_dask(self, ddf):
+        """
+        Probabilidades de cada conjunto sobre un Dask DataFrame (lazy, una tarea por partición).
+        """
+        meta = pd.DataFrame({c: pd.Series(dtype='float32') for c in self.columnas_salida})
+        return ddf.map_partitions(self.puntuar, meta=meta)
+
+    def agregar_probabilidades(self, df):
+        """
+        Devuelve `df` (pandas o Dask) con una columna `prob_<nombre>` por conjunto.
+        """
+        if hasattr(df, 'map_partitions'):
+            return df.map_partitions(_agregar, self, meta=_agregar(df._meta, self))
+        return _agregar(df, self)
+
+
+def _agregar(pdf, motor):
+    return pd.concat([pdf, motor.puntuar(pdf)], axis=1)
+
+
+def puntaje_riesgo(pdf):
+    """
+    Puntaje de riesgo 0-100: promedio (40), materias reprobadas (30) y créditos
+    aprobados (30). Las variables faltantes toman un valor neutro.
+    Única implementación: el dashboard (components/metrics.py) la importa.
+    """
+    puntaje = np.zeros(len(pdf), dtype=np.float64)
+    if 'promedio_ultimo_semestre' in pdf.columns:
+        gpa = _numerico(pdf['promedio_ultimo_semestre'], 3.0)
+        puntaje += np.maximum(0, (3.0 - gpa) / 3.0 * 40)
+    if 'total_materias_reprobadas' in pdf.columns:
+        reprobadas = _numerico(pdf['total_materias_reprobadas'], 0.0)
+        puntaje += np.minimum(reprobadas / 5 * 30, 30)
+    if 'total_creditos_aprobados' in pdf.columns:
+        creditos = _numerico(pdf['total_creditos_aprobados'], 30.0)
+        puntaje += np.maximum(0, (30 - creditos) / 30 * 30)
+    return np.minimum(puntaje, 100)
+
+
+def banda_riesgo(puntajes):
+    """
+    Etiqueta de banda ('Alto', 'Medio', 'Bajo') de cada puntaje según BANDAS_RIESGO.
+    """
+    puntajes = np.asarray(puntajes, dtype=np.float64)
+    return np.select([puntajes >= limite for limite, _ in BANDAS_RIESGO[:-1]],
+                     [etiqueta for _, etiqueta in BANDAS_RIESGO[:-1]], default=BANDAS_RIESGO[-1][1])
+
+
+def _numerico(serie, relleno):
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.where(np.isnan(valores), relleno, valores)
+
+
+class EtapaScoring:
+    """
+    Etapa de scoring del ETL: agrega a la tabla maestra `risk_score`, `risk_level`
+    y una columna `prob_<nombre>` por cada conjunto de coeficientes y modelo registrado.
+
+    Se aplica partición a partición (lazy), así que se calcula en la misma pasada
+    que la escritura del Parquet.
+    """
+
+    def __init__(self, motor=None, modelos=()):
+        self.motor = motor
+        self.modelos = list(modelos)
+
+    @classmethod
+    def desde_configuracion(cls, coeficientes_dir=None, registro_dir=None, modelos=()):
+        """
+        Usa todos los *.json de `coeficientes_dir` (si existe) y la última versión de
+        cada nombre de `modelos` en el registro.
+        """
+        motor = None
+        if coeficientes_dir is not None and any(Path(coeficientes_dir).glob('*.json')):
+            motor = MotorScoringLogistico.cargar(coeficientes_dir)
+        registro = RegistroModelos(registro_dir) if registro_dir is not None else None
+        cargados = [registro.cargar(nombre) for nombre in modelos] if registro else []
+        return cls(motor, cargados)
+
+    @property
+    def columnas(self):
+        columnas = ['risk_score', 'risk_level']
+        if self.motor is not None:
+            columnas += self.motor.columnas_salida
+        return columnas + [m.columna for m in self.modelos]
+
+    def firma(self):
+        """
+        Hash de los coeficientes y versiones de modelos: si cambia, los puntajes previos no son comparables.
+        """
+        contenido = {
+            'bandas': BANDAS_RIESGO,
+            'coeficientes': [
+                (c.nombre, c.features, c.beta.tolist(), float(c.intercepto), c.imputacion.tolist())
+                for c in (self.motor.conjuntos if self.motor is not None else [])
+            ],
+            'modelos': [(m.metadatos['nombre'], m.metadatos['version']) for m in self.modelos],
+        }
+        return hashlib.sha1(json.dumps(contenido, default=str).encode('utf-8')).hexdigest()[:12]
+
+    def puntuar(self, pdf):
+        """
+        `pdf` con las columnas de scoring agregadas (reemplaza las que ya existan).
+        """
+        puntajes = puntaje_riesgo(pdf)
+        partes = [
+            pdf.drop(columns=[c for c in self.columnas if c in pdf.columns]),
+            pd.DataFrame({'risk_score': puntajes, 'risk_level': banda_riesgo(puntajes)}, index=pdf.index),
+        ]
+        if self.motor is not None:
+            partes.append(self.motor.puntuar(pdf))
+        partes.extend(m.puntuar(pdf) for m in self.modelos)
+        return pd.concat(partes, axis=1)
+
+    def aplicar(self, ddf):
+        return ddf.map_partitions(self.puntuar, meta=self.puntuar(ddf._meta))
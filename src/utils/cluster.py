@@ -0,0 +1,143 @@
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import dask
+from dask.system import CPU_COUNT
+
+logger = logging.getLogger(__name__)
+
+MODOS_SCHEDULER = ('threads', 'processes', 'sync', 'local_cluster', 'distribuido')
+
+
+@contextmanager
+def scheduler_dask(modo='threads', direccion=None, n_workers=None, threads_por_worker=None,
+                   memoria_por_worker='auto'):
+    """
+    Activa el scheduler Dask del pipeline mientras dure el contexto.
+
+    - threads / processes / sync: schedulers locales; `n_workers` fija el tamaño del pool.
+    - local_cluster: `distributed.LocalCluster` de procesos en esta máquina, con
+      `n_workers`, `threads_por_worker` y `memoria_por_worker` (ej. "4GB").
+    - distribuido: se conecta a un scheduler existente en `direccion`.
+
+    Retorna el `distributed.Client` en los modos distribuidos, o None.
+    """
+    if modo not in MODOS_SCHEDULER:
+        raise ValueError(f"Scheduler no soportado: {modo}. Opciones: {MODOS_SCHEDULER}")
+
+    if modo in ('threads', 'processes', 'sync'):
+        with dask.config.set(scheduler=modo, num_workers=n_workers):
+            logger.info(f"Scheduler Dask local: {modo} (workers: {n_workers or 'por defecto'})")
+            yield None
+        return
+
+    from distributed import Client, LocalCluster
+
+    if modo == 'local_cluster':
+        with LocalCluster(n_workers=n_workers, threads_per_worker=threads_por_worker,
+                          memory_limit=memoria_por_worker, processes=True) as cluster, \
+                Client(cluster) as client:
+            logger.info(f"LocalCluster iniciado: {len(client.scheduler_info()['workers'])} workers "
+                        f"(dashboard: {client.dashboard_link})")
+            yield client
+        return
+
+    with Client(direccion) as client:
+        logger.info(f"Conectado a scheduler Dask: {direccion} "
+                    f"({len(client.scheduler_info()['workers'])} workers)")
+        yield client
+
+
+def direccion_scheduler(host, puerto):
+    """
+    Normaliza DASK_SCHEDULER_HOST a una dirección tcp://host:puerto.
+    """
+    if '://' in host:
+        return host
+    if ':' in host:
+        return f"tcp://{host}"
+    return f"tcp://{host}:{puerto}"
+
+
+class MonitorUtilizacion:
+    """
+    Mide la utilización de los workers mientras el contexto está activo:
+    tiempo ocupado en tareas / (tiempo de pared * slots de ejecución).
+
+    Con un Client usa el task stream del scheduler distribuido; sin él, el
+    Profiler de los schedulers locales (un slot por hilo/proceso del pool).
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self._registro = None
+        self.duracion = 0.0
+        self.tareas = []  # (worker, inicio, fin)
+
+    def __enter__(self):
+        if self.client is not None:
+            from distributed import get_task_stream
+            self._registro = get_task_stream(self.client)
+        else:
+            from dask.diagnostics import Profiler
+            self._registro = Profiler()
+        self._registro.__enter__()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duracion = time.perf_counter() - self._inicio
+        self._registro.__exit__(*exc)
+        if self.client is not None:
+            for tarea in self._registro.data:
+                for intervalo in tarea.get('startstops', ()):
+                    if intervalo.get('action') == 'compute':
+                        self.tareas.append((tarea['worker'], intervalo['start'], intervalo['stop']))
+        else:
+            self.tareas = [(t.worker_id, t.start_time, t.end_time) for t in self._registro.results]
+        return False
+
+    def _slots(self):
+        if self.client is not None:
+            workers = self.client.scheduler_info()['workers']
+            return {w: info.get('nthreads', 1) for w, info in workers.items()}
+        if dask.config.get('scheduler', None) == 'sync':
+            return {'local': 1}
+        return {'local': dask.config.get('num_workers', None) or CPU_COUNT}
+
+    def resumen(self):
+        """
+        Utilización global y por worker en el intervalo monitoreado.
+        """
+        ocupado = defaultdict(float)
+        for worker, inicio, fin in self.tareas:
+            clave = worker if self.client is not None else 'local'
+            ocupado[clave] += max(fin - inicio, 0.0)
+
+        slots = self._slots()
+        duracion = max(self.duracion, 1e-9)
+        por_worker = {
+            worker: ocupado.get(worker, 0.0) / (duracion * n)
+            for worker, n in slots.items()
+        }
+        total = sum(ocupado.values()) / (duracion * max(sum(slots.values()), 1))
+        return {'duracion_s': self.duracion, 'tareas': len(self.tareas),
+                'utilizacion': total, 'por_worker': por_worker}
+
+    def registrar(self, log=logger):
+        resumen = self.resumen()
+        log.info(f"Utilización de workers: {resumen['utilizacion']:.0%} en {resumen['duracion_s']:.1f} s "
+                 f"({resumen['tareas']} tareas)")
+        memoria = {}
+        if self.client is not None:
+            for worker, info in self.client.scheduler_info()['workers'].items():
+                memoria[worker] = (info.get('metrics', {}).get('memory', 0), info.get('memory_limit', 0))
+        for worker, utilizacion in resumen['por_worker'].items():
+            detalle = ""
+            if worker in memoria:
+                usada, limite = memoria[worker]
+                detalle = f" | memoria {usada / 2**30:.2f}/{limite / 2**30:.2f} GiB"
+            log.info(f"  {worker}: {utilizacion:.0%}{detalle}")
+        return resumen
@@ -0,0 +1,47 @@
+from dask.callbacks import Callback
+
+
+class ContadorEjecuciones(Callback):
+    """
+    Cuenta las ejecuciones de grafos Dask (cada compute/persist) y las tareas
+    ejecutadas mientras el contexto está activo. Un aumento entre corridas indica
+    que alguna rama volvió a recalcular el grafo completo.
+
+    Sin `client` usa los callbacks de los schedulers locales (threads/processes/sync).
+    Con un Client distribuido cuenta las computaciones que registra el scheduler
+    (una por grafo enviado con el scheduler ocioso) y las tareas de sus grupos.
+    """
+
+    def __init__(self, client=None):
+        super().__init__()
+        self.client = client
+        self.ejecuciones = 0
+        self.tareas = 0
+
+    def __enter__(self):
+        if self.client is not None:
+            self._inicio = self.client.run_on_scheduler(_reloj_scheduler)
+            return self
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        if self.client is not None:
+            self.ejecuciones, self.tareas = self.client.run_on_scheduler(_computaciones_desde, self._inicio)
+            return
+        super().__exit__(*args)
+
+    def _start(self, dsk):
+        self.ejecuciones += 1
+
+    def _posttask(self, key, result, dsk, state, id):
+        self.tareas += 1
+
+
+def _reloj_scheduler(dask_scheduler=None):
+    from distributed.metrics import time
+    return time()
+
+
+def _computaciones_desde(inicio, dask_scheduler=None):
+    computaciones = [c for c in dask_scheduler.computations if c.start >= inicio]
+    return len(computaciones), sum(len(grupo) for c in computaciones for grupo in c.groups)
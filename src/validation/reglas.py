@@ -0,0 +1,159 @@
+"""
+Registro declarativo de reglas de calidad para datos académicos.
+
+Cada regla es un dict con un `id` único y un `tipo`:
+- rango:       `columna` dentro de [`min`, `max`] (cualquiera de los dos puede omitirse).
+- no_nulo:     `columna` sin valores nulos.
+- comparacion: `izquierda` `operador` `derecha` entre dos columnas de la misma fila.
+- referencial: valores de `columna` dentro del conjunto `valores` (catálogo o tabla padre).
+
+Salvo `no_nulo`, los nulos no cuentan como violación (`permitir_nulos`, por defecto True).
+Una regla cuyas columnas no están en el DataFrame se omite.
+
+Para la cuarentena cada fila lleva una máscara de bits uint64 (bit i = regla i
+de la lista aplicable), así que una lista admite a lo sumo 64 reglas.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+REGLAS_ACADEMICAS = [
+    {'id': 'promedio_semestral_rango', 'tipo': 'rango', 'columna': 'promedio_semestral', 'min': 0.0, 'max': 5.0},
+    {'id': 'promedio_acumulado_rango', 'tipo': 'rango', 'columna': 'promedio_acumulado', 'min': 0.0, 'max': 5.0},
+    {'id': 'nota_final_rango', 'tipo': 'rango', 'columna': 'nota_final', 'min': 0.0, 'max': 5.0},
+    {'id': 'gpa_rango', 'tipo': 'rango', 'columna': 'gpa', 'min': 0.0, 'max': 5.0},
+    {'id': 'promedio_ultimo_semestre_rango', 'tipo': 'rango', 'columna': 'promedio_ultimo_semestre',
+     'min': 0.0, 'max': 5.0},
+    {'id': 'saber11_rango', 'tipo': 'rango', 'columna': 'puntaje_saber11', 'min': 0, 'max': 500},
+    {'id': 'estrato_rango', 'tipo': 'rango', 'columna': 'estrato', 'min': 1, 'max': 6},
+    {'id': 'total_creditos_no_negativo', 'tipo': 'rango', 'columna': 'total_creditos_aprobados', 'min': 0},
+    {'id': 'total_reprobadas_no_negativo', 'tipo': 'rango', 'columna': 'total_materias_reprobadas', 'min': 0},
+    {'id': 'estudiante_id_requerido', 'tipo': 'no_nulo', 'columna': 'estudiante_id'},
+    {'id': 'creditos_aprobados_le_matriculados', 'tipo': 'comparacion',
+     'izquierda': 'creditos_aprobados', 'operador': '<=', 'derecha': 'creditos_matriculados'},
+    # Mismo dominio que el CHECK de estudiantes.genero en sql/script_db_academica.sql
+    {'id': 'genero_catalogo', 'tipo': 'referencial', 'columna': 'genero', 'valores': ('M', 'F', 'O')},
+]
+
+_OPERADORES = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater,
+    '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal,
+}
+
+
+def columnas_regla(regla):
+    if regla['tipo'] == 'comparacion':
+        return [regla['izquierda'], regla['derecha']]
+    return [regla['columna']]
+
+
+def reglas_aplicables(reglas, columnas):
+    """
+    Reglas cuyas columnas están todas en `columnas`.
+    """
+    return [r for r in reglas if all(c in columnas for c in columnas_regla(r))]
+
+
+def _sin_na(mascara):
+    """
+    Máscara booleana numpy; NA (dtypes anulables) cuenta como False.
+    """
+    return np.asarray(pd.Series(mascara).fillna(False), dtype=bool)
+
+
+def violaciones_regla(pdf, regla):
+    """
+    Máscara numpy de filas de `pdf` que violan `regla`.
+    """
+    tipo = regla['tipo']
+    permitir_nulos = regla.get('permitir_nulos', True)
+
+    if tipo == 'no_nulo':
+        return pdf[regla['columna']].isna().to_numpy()
+
+    if tipo == 'rango':
+        valores = pdf[regla['columna']]
+        fuera = np.zeros(len(pdf), dtype=bool)
+        if regla.get('min') is not None:
+            fuera |= _sin_na(valores < regla['min'])
+        if regla.get('max') is not None:
+            fuera |= _sin_na(valores > regla['max'])
+        nulos = valores.isna().to_numpy()
+
+    elif tipo == 'comparacion':
+        izquierda, derecha = pdf[regla['izquierda']], pdf[regla['derecha']]
+        nulos = (izquierda.isna() | derecha.isna()).to_numpy()
+        cumple = _sin_na(_OPERADORES[regla['operador']](izquierda, derecha))
+        fuera = ~cumple & ~nulos
+
+    elif tipo == 'referencial':
+        valores = pdf[regla['columna']]
+        nulos = valores.isna().to_numpy()
+        fuera = ~valores.isin(list(regla['valores'])).to_numpy() & ~nulos
+
+    else:
+        raise ValueError(f"Tipo de regla no soportado: {tipo} (regla {regla['id']})")
+
+    return fuera | nulos if not permitir_nulos else fuera
+
+
+def evaluar_reglas(pdf, reglas):
+    """
+    Evalúa todas las reglas aplicables en una pasada vectorizada sobre `pdf`.
+    Retorna un DataFrame booleano (una columna por id de regla, True = violación).
+    """
+    return pd.DataFrame(
+        {r['id']: violaciones_regla(pdf, r) for r in reglas_aplicables(reglas, pdf.columns)},
+        index=pdf.index
+    )
+
+
+def contar_violaciones_particion(pdf, reglas):
+    """
+    Conteo de violaciones por regla de una partición, como DataFrame de una fila.
+    """
+    ids = [r['id'] for r in reglas]
+    conteos = evaluar_reglas(pdf, reglas).sum()
+    return pd.DataFrame([conteos.reindex(ids, fill_value=0).astype('int64').to_numpy()], columns=ids)
+
+
+def firma_reglas(reglas):
+    """
+    Hash estable de la lista de reglas. Si cambia, la cuarentena previa ya no es comparable.
+    """
+    contenido = json.dumps(reglas, sort_keys=True, default=list)
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()[:12]
+
+
+def mascara_violaciones(pdf, reglas):
+    """
+    Máscara de bits uint64 por fila con las reglas violadas (0 = fila válida).
+    """
+    if len(reglas) > 64:
+        raise ValueError(f"La máscara de violaciones admite a lo sumo 64 reglas ({len(reglas)} recibidas)")
+    mascara = np.zeros(len(pdf), dtype=np.uint64)
+    for bit, regla in enumerate(reglas):
+        mascara |= violaciones_regla(pdf, regla).astype(np.uint64) << np.uint64(bit)
+    return mascara
+
+
+def contar_bits_particion(mascaras, reglas):
+    """
+    Conteo por regla a partir de las máscaras de una partición, como DataFrame de una fila.
+    """
+    valores = np.asarray(mascaras, dtype=np.uint64)
+    conteos = [int(np.count_nonzero(valores & (np.uint64(1) << np.uint64(bit)))) for bit in range(len(reglas))]
+    return pd.DataFrame([conteos], columns=[r['id'] for r in reglas], dtype='int64')
+
+
+def etiquetas_violaciones(mascaras, reglas):
+    """
+    Ids de reglas violadas separados por coma, para cada máscara.
+    """
+    ids = [r['id'] for r in reglas]
+    return [
+        ",".join(ids[bit] for bit in range(len(ids)) if int(m) >> bit & 1)
+        for m in np.asarray(mascaras, dtype=np.uint64)
+    ]
@@ -0,0 +1,203 @@
+"""
+Sketches de memoria acotada para validación y perfilado de datos.
+
+- SketchKLL: cuantiles aproximados, fusionable entre particiones y grupos.
+- HyperLogLog: número aproximado de valores distintos.
+
+KLL (Karnin, Lang, Liberty 2016) guarda una jerarquía de compactadores: el nivel h contiene elementos
+que representan 2^h valores originales. Cuando un nivel supera su capacidad se
+ordena y se promueve la mitad de sus elementos (pares o impares al azar) al
+nivel siguiente. Las capacidades decrecen geométricamente hacia los niveles
+bajos, así que la memoria es O(k) independiente del número de valores.
+
+El error de rango normalizado sigue la aproximación empírica de Apache DataSketches
+(~99% de confianza): 2.296 / k^0.9723 para un cuantil, 2.446 / k^0.9433 para PMF/CDF
+(dos lados). Con k=200 el cuantil q estimado tiene rango real en [q - eps, q + eps]
+con eps ~1.33%.
+"""
+import numpy as np
+
+# (constante, exponente) del error de rango normalizado de KLL según DataSketches
+_ERROR_UN_CUANTIL = (2.296, 0.9723)
+_ERROR_DOS_LADOS = (2.446, 0.9433)
+
+
+def error_rango_normalizado(k, dos_lados=False):
+    """
+    Cota (~99% de confianza) del error de rango normalizado de un sketch KLL de parámetro `k`.
+    """
+    constante, exponente = _ERROR_DOS_LADOS if dos_lados else _ERROR_UN_CUANTIL
+    return constante / k ** exponente
+
+
+class SketchKLL:
+    """
+    Sketch de cuantiles aproximados sobre valores numéricos (los NaN se ignoran).
+    """
+
+    def __init__(self, k=200, semilla=None):
+        self.k = k
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.niveles = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(semilla)
+
+    @property
+    def epsilon(self):
+        """
+        Cota del error de rango normalizado de los cuantiles estimados.
+        """
+        return error_rango_normalizado(self.k)
+
+    def actualizar(self, valores):
+        """
+        Agrega un arreglo de valores (vectorizado: una compactación por lote).
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return self
+        self.n += len(valores)
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+        return self
+
+    def fusionar(self, otro):
+        """
+        Incorpora otro sketch (de otra partición o grupo) en este.
+        """
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0, dtype=np.float64))
+        for h, nivel in enumerate(otro.niveles):
+            self.niveles[h] = np.concatenate([self.niveles[h], nivel])
+        self._compactar()
+        return self
+
+    def cuantiles(self, qs):
+        """
+        Valores aproximados de los cuantiles `qs` (NaN si el sketch está vacío).
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind='stable')
+        valores, acumulado = valores[orden], np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+        resultado = valores[np.minimum(posiciones, len(valores) - 1)]
+        # Los extremos se conocen exactamente
+        resultado = np.where(qs <= 0, self.minimo, resultado)
+        return np.where(qs >= 1, self.maximo, resultado)
+
+    def cuantil(self, q):
+        return float(self.cuantiles([q])[0])
+
+    def _capacidad(self, h, altura):
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (altura - 1 - h))))
+
+    def _compactar(self):
+        while True:
+            altura = len(self.niveles)
+            desbordado = next(
+                (h for h, nivel in enumerate(self.niveles) if len(nivel) > self._capacidad(h, altura)), None
+            )
+            if desbordado is None:
+                return
+            nivel = np.sort(self.niveles[desbordado])
+            resto = nivel[len(nivel) - len(nivel) % 2:]
+            promovidos = nivel[:len(nivel) - len(resto)][self._rng.integers(2)::2]
+            self.niveles[desbordado] = resto
+            if desbordado + 1 == len(self.niveles):
+                self.niveles.append(np.empty(0, dtype=np.float64))
+            self.niveles[desbordado + 1] = np.concatenate([self.niveles[desbordado + 1], promovidos])
+
+
+def sketches_particion(pdf, columnas, por=None, k=200):
+    """
+    Sketches {(grupo, columna): SketchKLL} de una partición pandas.
+    Sin `por`, el grupo es None (toda la partición).
+    """
+    grupos = pdf.groupby(por, observed=True, sort=False) if por else [(None, pdf)]
+    sketches = {}
+    for grupo, sub in grupos:
+        for columna in columnas:
+            sketches[(grupo, columna)] = SketchKLL(k).actualizar(sub[columna].to_numpy(dtype=np.float64, na_value=np.nan))
+    return sketches
+
+
+def fusionar_sketches(*parciales):
+    """
+    Fusiona diccionarios de sketches por clave (grupo, columna).
+    """
+    total = {}
+    for parcial in parciales:
+        for clave, sketch in parcial.items():
+            if clave in total:
+                total[clave].fusionar(sketch)
+            else:
+                total[clave] = sketch
+    return total
+
+
+class HyperLogLog:
+    """
+    Estimador HyperLogLog de valores distintos (Flajolet et al. 2007) con 2^p registros.
+    Error estándar relativo ~1.04/sqrt(2^p): ~0.8% con p=14 y 16 KiB de memoria.
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registros = np.zeros(1 << p, dtype=np.uint8)
+
+    @property
+    def error_estandar(self):
+        return 1.04 / np.sqrt(len(self.registros))
+
+    def actualizar_hashes(self, hashes):
+        """
+        Agrega hashes uint64 (ej. `pd.util.hash_array`) de forma vectorizada.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return self
+        bits_resto = 64 - self.p
+        indices = (hashes >> np.uint64(bits_resto)).astype(np.int64)
+        resto = hashes & np.uint64((1 << bits_resto) - 1)
+        # Posición del primer 1 en los bits restantes (bits_resto + 1 si son todos 0)
+        rangos = (bits_resto - _longitud_bits(resto) + 1).astype(np.uint8)
+        np.maximum.at(self.registros, indices, rangos)
+        return self
+
+    def fusionar(self, otro):
+        np.maximum(self.registros, otro.registros, out=self.registros)
+        return self
+
+    def estimar(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimado = alfa * m * m / np.sum(np.ldexp(1.0, -self.registros.astype(np.int64)))
+        ceros = int(np.count_nonzero(self.registros == 0))
+        if estimado <= 5 * m and ceros:
+            # Rango pequeño: el estimador crudo tiene sesgo hasta ~5m; el conteo lineal no
+            estimado = m * np.log(m / ceros)
+        return float(estimado)
+
+
+def _longitud_bits(valores):
+    """
+    Número de bits significativos de cada uint64 (0 para 0), sin pasar por float.
+    """
+    valores = valores.copy()
+    longitud = np.zeros(valores.shape, dtype=np.int64)
+    for desplazamiento in (32, 16, 8, 4, 2, 1):
+        grandes = valores >= (np.uint64(1) << np.uint64(desplazamiento))
+        longitud[grandes] += desplazamiento
+        valores[grandes] >>= np.uint64(desplazamiento)
+    return longitud + (valores > 0)
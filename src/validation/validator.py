@@ -1,10 +1,24 @@
+import dask
 import pandas as pd
 import numpy as np
 import logging
+from pathlib import Path
+import pyarrow.parquet as pq
+from src.validation.sketches import sketches_particion, fusionar_sketches
+from src.validation.reglas import (
+    REGLAS_ACADEMICAS, reglas_aplicables, columnas_regla, evaluar_reglas, contar_violaciones_particion,
+    mascara_violaciones, contar_bits_particion, etiquetas_violaciones
+)
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Columna auxiliar con la máscara de reglas violadas (no se escribe en la salida)
+COLUMNA_MASCARA = '_violaciones'
+
+# Directorio Hive de los valores nulos de una columna de partición
+_PARTICION_NULA = '__HIVE_DEFAULT_PARTITION__'
+
 class AcademicValidator:
     """
     Clase para validación de datos académicos y calidad de datos.
@@ -21,43 +35,134 @@ class AcademicValidator:
         return True
 
     @staticmethod
-    def validar_reglas_negocio(df):
-        """
-        Aplica reglas de negocio académicas.
-        Retorna el DataFrame con una columna 'is_valid' y logs de errores.
-        """
-        # Inicializar máscara de validación
-        valid_mask = pd.Series(True, index=df.index)
-        
-        # Regla 1: Promedios (0-5.0)
-        for col in ['promedio_semestral', 'promedio_acumulado', 'nota_final', 'gpa']:
-            if col in df.columns:
-                mask_gpa = df[col].between(0.0, 5.0) | df[col].isna()
-                valid_mask &= mask_gpa
-                invalid_count = (~mask_gpa).sum()
-                if invalid_count > 0:
-                    logger.warning(f"Columna {col}: {invalid_count} registros fuera de rango [0-5].")
-
-        # Regla 2: Puntaje Saber 11 (0-500)
-        if 'puntaje_saber11' in df.columns:
-             mask_saber = df['puntaje_saber11'].between(0, 500) | df['puntaje_saber11'].isna()
-             valid_mask &= mask_saber
-             invalid_count = (~mask_saber).sum()
-             if invalid_count > 0:
-                 logger.warning(f"Saber 11: {invalid_count} registros fuera de rango [0-500].")
-
-        # Regla 3: Estrato (1-6)
-        if 'estrato' in df.columns:
-            mask_estrato = df['estrato'].between(1, 6) | df['estrato'].isna()
-            valid_mask &= mask_estrato
-            
-        # Regla 4: Créditos
-        if 'creditos_aprobados' in df.columns and 'creditos_matriculados' in df.columns:
-            mask_creditos = df['creditos_aprobados'] <= df['creditos_matriculados']
-            # Permitir casos donde matriculados sea 0 o nulo si aplica
-            valid_mask &= (mask_creditos | df['creditos_matriculados'].isna())
-
-        return valid_mask
+    def validar_reglas_negocio(df, reglas=REGLAS_ACADEMICAS):
+        """
+        Aplica reglas de negocio académicas (registro de `src.validation.reglas`).
+        Retorna la máscara de filas válidas y registra en el log las reglas violadas.
+        """
+        violaciones = evaluar_reglas(df, reglas)
+        for regla_id, invalid_count in violaciones.sum().items():
+            if invalid_count > 0:
+                logger.warning(f"Regla {regla_id}: {invalid_count} registros inválidos.")
+        return ~violaciones.any(axis=1)
+
+    @staticmethod
+    def validar_dataset(ddf, reglas=REGLAS_ACADEMICAS, compute=True):
+        """
+        Conteo de violaciones por regla sobre el Dask DataFrame completo.
+
+        Todas las reglas se evalúan en una sola pasada vectorizada por partición
+        (`map_partitions`) y los conteos se suman entre particiones.
+        Con compute=False retorna la reducción lazy, para calcularla en el mismo
+        `dask.compute` que la escritura y no releer los datos.
+        """
+        reglas = reglas_aplicables(reglas, ddf.columns)
+        meta = pd.DataFrame({r['id']: pd.Series(dtype='int64') for r in reglas})
+        conteos = ddf.map_partitions(contar_violaciones_particion, reglas, meta=meta).sum()
+        if not compute:
+            return conteos
+        return conteos.compute()
+
+    @staticmethod
+    def separar_cuarentena(ddf, reglas=REGLAS_ACADEMICAS):
+        """
+        Divide cada partición en filas válidas y filas en cuarentena en la misma pasada.
+
+        Las reglas se evalúan una vez por partición y dejan una máscara de bits por fila;
+        de ella salen las filas válidas, las inválidas (con `reglas_violadas`: ids
+        separados por coma) y los conteos por regla. Los tres resultados son lazy y
+        comparten el grafo: calculados en un mismo `dask.compute` no releen los datos.
+
+        Retorna (ddf_validas, ddf_cuarentena, conteos lazy).
+        """
+        reglas = reglas_aplicables(reglas, ddf.columns)
+        marcado = ddf.map_partitions(_marcar_particion, reglas, meta=_marcar_particion(ddf._meta, reglas))
+        invalida = marcado[COLUMNA_MASCARA] != 0
+
+        validas = marcado[~invalida].drop(columns=COLUMNA_MASCARA)
+        cuarentena = marcado[invalida]
+        cuarentena = cuarentena.map_partitions(
+            _etiquetar_particion, reglas, meta=_etiquetar_particion(cuarentena._meta, reglas)
+        )
+        meta = pd.DataFrame({r['id']: pd.Series(dtype='int64') for r in reglas})
+        conteos = marcado[COLUMNA_MASCARA].map_partitions(contar_bits_particion, reglas, meta=meta).sum()
+        return validas, cuarentena, conteos
+
+    @staticmethod
+    def contar_cuarentena(df_cuarentena, reglas=REGLAS_ACADEMICAS):
+        """
+        Conteo por regla a partir de la columna `reglas_violadas` de una cuarentena ya escrita.
+        """
+        reglas = reglas_aplicables(reglas, df_cuarentena.columns)
+        conteos = pd.Series(0, index=[r['id'] for r in reglas], dtype='int64')
+        if len(df_cuarentena):
+            violadas = df_cuarentena['reglas_violadas'].astype(str).str.split(',').explode().value_counts()
+            conteos = conteos.add(violadas, fill_value=0).astype('int64')
+        return conteos
+
+    @staticmethod
+    def validar_parquet(ruta, reglas=REGLAS_ACADEMICAS):
+        """
+        Valida una salida Parquet usando primero las estadísticas de los footers.
+
+        Por cada row group y regla se intenta probar con min/max/null_count que no hay
+        violaciones (rango dentro de los límites, no_nulo sin nulos; las columnas de
+        partición Hive se conocen por la ruta). Solo se decodifican los row groups con
+        alguna regla no demostrada, y de ellos solo las columnas de esas reglas.
+        Las reglas de comparación y referenciales no se prueban con estadísticas.
+
+        Retorna (conteos por regla, resumen {'row_groups', 'omitidos', 'decodificados'}).
+        """
+        ruta = Path(ruta)
+        archivos = sorted(ruta.rglob('*.parquet')) if ruta.is_dir() else [ruta]
+        conteos = {}
+        resumen = {'row_groups': 0, 'omitidos': 0, 'decodificados': 0}
+
+        for archivo in archivos:
+            constantes = _valores_particion(archivo, ruta)
+            pf = pq.ParquetFile(archivo)
+            columnas = list(pf.schema_arrow.names) + list(constantes)
+            aplicables = reglas_aplicables(reglas, columnas)
+            for regla in aplicables:
+                conteos.setdefault(regla['id'], 0)
+            indices = {nombre: i for i, nombre in enumerate(pf.schema_arrow.names)}
+
+            for rg in range(pf.metadata.num_row_groups):
+                resumen['row_groups'] += 1
+                meta_rg = pf.metadata.row_group(rg)
+                pendientes = [
+                    r for r in aplicables
+                    if not _regla_probada(r, meta_rg, indices, constantes)
+                ]
+                if not pendientes:
+                    resumen['omitidos'] += 1
+                    continue
+
+                resumen['decodificados'] += 1
+                leer = sorted({c for r in pendientes for c in columnas_regla(r) if c in indices})
+                pdf = pf.read_row_group(rg, columns=leer).to_pandas()
+                for columna, valor in constantes.items():
+                    pdf[columna] = np.nan if valor is None else valor
+                for regla_id, n in evaluar_reglas(pdf, pendientes).sum().items():
+                    conteos[regla_id] += int(n)
+
+        logger.info(f"Validación por estadísticas: {resumen['omitidos']}/{resumen['row_groups']} "
+                    f"row groups probados sin decodificar")
+        return pd.Series(conteos, dtype='int64'), resumen
+
+    @staticmethod
+    def registrar_violaciones(conteos):
+        """
+        Registra en el log los conteos por regla de `validar_dataset`.
+        Retorna un dict {id de regla: violaciones} serializable.
+        """
+        conteos = {regla_id: int(n) for regla_id, n in conteos.items()}
+        invalidas = {regla_id: n for regla_id, n in conteos.items() if n > 0}
+        if not invalidas:
+            logger.info(f"Validación completa: {len(conteos)} reglas sin violaciones.")
+        for regla_id, n in invalidas.items():
+            logger.warning(f"Regla {regla_id}: {n} registros inválidos.")
+        return conteos
 
     @staticmethod
     def detectar_outliers(df, columna, metodo='iqr', umbral=1.5):
@@ -72,3 +177,181 @@ class AcademicValidator:
             upper_bound = Q3 + (umbral * IQR)
             return ~df[columna].between(lower_bound, upper_bound)
         return pd.Series(False, index=df.index)
+
+    @staticmethod
+    def limites_outliers_aproximados(ddf, columnas, por=None, umbral=1.5, k=200):
+        """
+        Límites IQR por columna y grupo sobre un Dask DataFrame, sin materializarlo.
+
+        Cada partición construye un sketch de cuantiles KLL por (grupo, columna) y los
+        sketches se fusionan en árbol: una sola pasada para todas las columnas y grupos.
+        Retorna un DataFrame con [por], columna, q1, q3, limite_inferior,
+        limite_superior, n y error_rango (cota del error de rango normalizado).
+        """
+        columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+        parciales = [
+            dask.delayed(sketches_particion)(particion, columnas, por, k)
+            for particion in ddf.to_delayed()
+        ]
+        while len(parciales) > 1:
+            parciales = [
+                dask.delayed(fusionar_sketches)(*parciales[i:i + 8])
+                for i in range(0, len(parciales), 8)
+            ]
+        sketches = parciales[0].compute() if parciales else {}
+        return _tabla_limites(sketches, por, umbral)
+
+    @staticmethod
+    def detectar_outliers_aproximados(ddf, columnas, por=None, umbral=1.5, k=200):
+        """
+        Versión escalable de `detectar_outliers` (IQR) para Dask DataFrames.
+        Retorna (límites calculados, Dask DataFrame booleano lazy con una columna por
+        variable: True = outlier dentro de su grupo).
+        """
+        columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+        limites = AcademicValidator.limites_outliers_aproximados(ddf, columnas, por, umbral, k)
+        meta = pd.DataFrame({c: pd.Series(dtype=bool) for c in columnas})
+        marcas = ddf.map_partitions(_marcar_outliers, limites, columnas, por, meta=meta)
+        return limites, marcas
+
+    @staticmethod
+    def reporte_error_cuantiles(df_muestra, columnas, por=None, qs=(0.25, 0.75), k=200):
+        """
+        Compara cuantiles del sketch con los exactos de pandas sobre una muestra.
+        Reporta el error de rango observado junto a la cota teórica del sketch.
+        """
+        columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+        filas = []
+        for (grupo, columna), sketch in sketches_particion(df_muestra, columnas, por, k).items():
+            valores = np.sort(_valores_grupo(df_muestra, columna, por, grupo))
+            for q, aproximado in zip(qs, sketch.cuantiles(qs)):
+                exacto = np.quantile(valores, q) if len(valores) else np.nan
+                rango = np.searchsorted(valores, aproximado, side='right') / max(len(valores), 1)
+                filas.append({'grupo': grupo, 'columna': columna, 'q': q, 'exacto': exacto,
+                              'aproximado': aproximado, 'error_rango': abs(rango - q),
+                              'cota_error': sketch.epsilon, 'n': sketch.n})
+        return pd.DataFrame(filas)
+
+
+def _marcar_particion(pdf, reglas):
+    return pdf.assign(**{COLUMNA_MASCARA: mascara_violaciones(pdf, reglas)})
+
+
+def _etiquetar_particion(pdf, reglas):
+    # dtype string (no object): el meta de Dask de una columna object no tiene valores
+    # de ejemplo válidos y la escritura Parquet de la cuarentena falla con pandas 3
+    etiquetas = pd.Series(etiquetas_violaciones(pdf[COLUMNA_MASCARA], reglas), index=pdf.index, dtype='string')
+    return pdf.drop(columns=COLUMNA_MASCARA).assign(reglas_violadas=etiquetas)
+
+
+def _valores_grupo(pdf, columna, por, grupo):
+    """
+    Valores no nulos de `columna` para `grupo` (todo `pdf` si no hay agrupación).
+    """
+    if por:
+        claves = pdf[por] if isinstance(por, str) else pd.MultiIndex.from_frame(pdf[list(por)])
+        pdf = pdf[np.asarray(claves == grupo) if isinstance(por, str) else claves.isin([grupo])]
+    valores = pdf[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+    return valores[~np.isnan(valores)]
+
+
+def _tabla_limites(sketches, por, umbral):
+    filas = []
+    for (grupo, columna), sketch in sketches.items():
+        q1, q3 = sketch.cuantiles([0.25, 0.75])
+        iqr = q3 - q1
+        fila = {'columna': columna, 'q1': q1, 'q3': q3,
+                'limite_inferior': q1 - umbral * iqr, 'limite_superior': q3 + umbral * iqr,
+                'n': sketch.n, 'error_rango': sketch.epsilon}
+        if por:
+            claves = [por] if isinstance(por, str) else list(por)
+            grupo = grupo if isinstance(grupo, tuple) else (grupo,)
+            fila = dict(zip(claves, grupo), **fila)
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+def _marcar_outliers(pdf, limites, columnas, por):
+    """
+    Marca outliers de una partición con los límites de su grupo (NaN no es outlier).
+    """
+    marcas = pd.DataFrame(False, index=pdf.index, columns=columnas)
+    for columna in columnas:
+        lim = limites[limites['columna'] == columna]
+        if por:
+            claves = [por] if isinstance(por, str) else list(por)
+            lim = pdf[claves].merge(lim[claves + ['limite_inferior', 'limite_superior']], on=claves, how='left')
+            inferior, superior = lim['limite_inferior'].to_numpy(), lim['limite_superior'].to_numpy()
+        elif len(lim):
+            inferior, superior = lim['limite_inferior'].iloc[0], lim['limite_superior'].iloc[0]
+        else:
+            continue
+        valores = pdf[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            marcas[columna] = (valores < inferior) | (valores > superior)
+    return marcas
+
+
+def _valores_particion(archivo, raiz):
+    """
+    Columnas de partición Hive (`col=valor`) de la ruta de `archivo`, con valores numéricos si aplica.
+    El directorio de nulos (`col=__HIVE_DEFAULT_PARTITION__`) da None.
+    """
+    valores = {}
+    partes = archivo.relative_to(raiz).parts[:-1] if archivo != raiz else ()
+    for parte in partes:
+        columna, separador, valor = parte.partition('=')
+        if not separador:
+            continue
+        if valor == _PARTICION_NULA:
+            valores[columna] = None
+            continue
+        try:
+            valores[columna] = int(valor)
+        except ValueError:
+            try:
+                valores[columna] = float(valor)
+            except ValueError:
+                valores[columna] = valor
+    return valores
+
+
+def _regla_probada(regla, meta_rg, indices, constantes):
+    """
+    True si las estadísticas del row group garantizan que `regla` no tiene violaciones.
+    """
+    tipo, columna = regla['tipo'], regla.get('columna')
+    if tipo not in ('rango', 'no_nulo'):
+        return False
+
+    if columna in constantes:
+        valor = constantes[columna]
+        if valor is None:
+            # Todo el archivo es nulo en la columna
+            return tipo == 'rango' and regla.get('permitir_nulos', True)
+        minimo = maximo = valor
+        nulos = 0
+    else:
+        stats = meta_rg.column(indices[columna]).statistics
+        if stats is None or stats.null_count is None:
+            return False
+        nulos = stats.null_count
+        if tipo == 'no_nulo':
+            return nulos == 0
+        if not stats.has_min_max:
+            # Row group sin valores no nulos: ningún valor fuera de rango
+            return nulos == meta_rg.num_rows and regla.get('permitir_nulos', True)
+        minimo, maximo = stats.min, stats.max
+
+    if tipo == 'no_nulo':
+        return nulos == 0
+    if not regla.get('permitir_nulos', True) and nulos:
+        return False
+    try:
+        if regla.get('min') is not None and minimo < regla['min']:
+            return False
+        if regla.get('max') is not None and maximo > regla['max']:
+            return False
+    except TypeError:
+        return False
+    return True
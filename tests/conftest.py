@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+PROGRAMAS = [' ingenieria ', 'MEDICINA', 'Derecho', 'derecho ', 'ARTES']
+ESTADOS = ['Activo', 'En Riesgo', 'Desertor', 'Graduado']
+
+
+def generar_crudos(n_estudiantes=600, semilla=0):
+    """
+    Datos crudos sintéticos con los casos borde del perfil: programas con
+    mayúsculas/espacios distintos, estratos nulos, puntajes Saber 11 fuera de
+    rango, empates en el último semestre y un estudiante sin historico.
+    """
+    rng = np.random.default_rng(semilla)
+    ids = [f"E{i:06d}" for i in range(n_estudiantes)]
+    estudiantes = pd.DataFrame({
+        'estudiante_id': ids,
+        'genero': rng.choice(['M', 'F', 'O'], n_estudiantes),
+        'estrato': rng.integers(1, 7, n_estudiantes).astype(float),
+        'programa': rng.choice(PROGRAMAS, n_estudiantes),
+        'puntaje_saber11': rng.uniform(150, 480, n_estudiantes).round(1),
+        'colegio_procedencia': rng.choice(['Publico', 'Privado'], n_estudiantes),
+        'condicion_laboral': rng.choice(['Trabaja', 'No trabaja'], n_estudiantes),
+        'municipio_residencia': rng.choice(['A', 'B', 'C'], n_estudiantes),
+    })
+    estudiantes.loc[rng.random(n_estudiantes) < 0.03, 'estrato'] = np.nan
+    estudiantes.loc[rng.random(n_estudiantes) < 0.02, 'puntaje_saber11'] = 600  # fuera de rango
+
+    filas = []
+    for estudiante in ids:
+        for semestre in range(1, int(rng.integers(1, 9)) + 1):
+            filas.append((
+                estudiante, 2015 + semestre // 2, 1 + semestre % 2, semestre,
+                rng.choice(ESTADOS, p=[.7, .15, .1, .05]),
+                round(rng.uniform(1, 5), 2), round(rng.uniform(1, 5), 2), round(rng.uniform(0, 5), 2),
+                18, int(rng.integers(0, 19)), int(rng.integers(0, 4)),
+            ))
+    historico = pd.DataFrame(filas, columns=[
+        'estudiante_id', 'anio_lectivo', 'periodo_lectivo', 'semestre_ordinal', 'estado_academico',
+        'promedio_semestral', 'promedio_acumulado', 'nota_final',
+        'creditos_matriculados', 'creditos_aprobados', 'materias_reprobadas',
+    ])
+    empates = historico.groupby('estudiante_id').tail(1).sample(frac=0.02, random_state=semilla)
+    historico = pd.concat([historico, empates.assign(promedio_acumulado=1.11)], ignore_index=True)
+
+    sin_historico = estudiantes.iloc[[0]].assign(estudiante_id='SINHIST1')
+    estudiantes = pd.concat([estudiantes, sin_historico], ignore_index=True)
+    return estudiantes, historico
+
+
+def escribir_crudos(data_dir, estudiantes, historico):
+    raw = Path(data_dir) / "raw"
+    raw.mkdir(parents=True, exist_ok=True)
+    estudiantes.to_csv(raw / "dataset_estudiantes_v2.csv", index=False)
+    historico.to_csv(raw / "dataset_historico_v2.csv", index=False)
+    return data_dir
+
+
+def leer_crudos(data_dir):
+    """(estudiantes, historico) como Dask DataFrames de varias particiones"""
+    from src.etl.extract import DataExtractor
+    extractor = DataExtractor(data_dir, usar_cache=False, blocksize="8KB")
+    ddf_est, ddf_hist = extractor.leer_estudiantes(), extractor.leer_historico()
+    assert ddf_est.npartitions > 1 and ddf_hist.npartitions > 1
+    return ddf_est, ddf_hist
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Directorio de datos con data/raw/*.csv sintéticos"""
+    return escribir_crudos(tmp_path, *generar_crudos())
+
+
+@pytest.fixture
+def crudos(data_dir):
+    return leer_crudos(data_dir)
+
+
+def normalizar(pdf):
+    """Tabla comparable entre modos: categóricas como texto, columnas y filas ordenadas"""
+    pdf = pdf.copy()
+    for columna in pdf.columns:
+        if isinstance(pdf[columna].dtype, pd.CategoricalDtype):
+            pdf[columna] = pdf[columna].astype(str)
+    pdf = pdf[sorted(pdf.columns)]
+    return pdf.sort_values(list(pdf.columns)).reset_index(drop=True)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+
+from src.evaluation import busqueda
+from src.evaluation.busqueda import BusquedaParalela
+
+
+def test_una_ronda_de_halving(monkeypatch):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(301, 4)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(scale=1.5, size=301) > 0).astype(np.int8)
+    grilla = {'C': [0.001, 0.1, 10.0]}
+    buscador = BusquedaParalela('logistica', grilla, n_folds=3, n_workers=2, factor=3, recurso_min=60)
+    # 301 filas en 3 folds: train de 200 o 201 filas; la ronda final pide 201
+    assert buscador._rondas(201) == [60, 201]
+    filas_folds = [len(busqueda._indices_fold(y, fold, 3)[0]) for fold in range(3)]
+    assert sorted(filas_folds) == [200, 201, 201]
+
+    leaderboard = buscador.ejecutar(X, y)
+
+    # Ronda 0 recalculada en este proceso: pasa el mejor tercio (1 candidato)
+    monkeypatch.setattr(busqueda, '_COMPARTIDOS', {'X': X, 'y': y})
+    auc_ronda_0 = pd.Series({
+        i: np.mean([busqueda._evaluar_fold(('logistica', candidato, fold, 3, 60))['auc'] for fold in range(3)])
+        for i, candidato in enumerate(buscador.candidatos)
+    })
+    ganador = auc_ronda_0.nlargest(1).index[0]
+
+    assert leaderboard['candidato'].tolist()[0] == ganador
+    por_candidato = leaderboard.set_index('candidato')
+    assert por_candidato.loc[ganador, 'ronda'] == 1
+    assert por_candidato.loc[ganador, 'filas_train'] == pytest.approx(np.mean(filas_folds))
+    eliminados = por_candidato.drop(index=ganador)
+    assert (eliminados['ronda'] == 0).all() and (eliminados['filas_train'] == 60).all()
+    np.testing.assert_allclose(eliminados['auc_media'], auc_ronda_0.loc[eliminados.index])
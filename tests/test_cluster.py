@@ -0,0 +1,51 @@
+import dask
+import pandas as pd
+import pytest
+
+from conftest import normalizar
+from src.etl.transform import DataTransformer
+from src.models.scoring import EtapaScoring
+from src.utils.cluster import MonitorUtilizacion, direccion_scheduler, scheduler_dask
+from src.utils.ejecuciones import ContadorEjecuciones
+from src.validation.validator import AcademicValidator
+
+pytest.importorskip('distributed')
+
+
+def _etapas(ddf_est, ddf_hist):
+    ddf = EtapaScoring().aplicar(DataTransformer(modo_perfil='un_shuffle').procesar(ddf_est.copy(), ddf_hist))
+    return AcademicValidator.separar_cuarentena(ddf)
+
+
+def test_local_cluster_de_procesos_igual_al_scheduler_por_defecto(crudos):
+    esperado = dask.compute(*_etapas(*crudos))
+
+    with scheduler_dask('local_cluster', n_workers=2, threads_por_worker=1) as client:
+        assert len(client.scheduler_info()['workers']) == 2
+        with MonitorUtilizacion(client) as monitor, ContadorEjecuciones(client) as contador:
+            obtenido = dask.compute(*_etapas(*crudos))
+        resumen = monitor.resumen()
+
+    validas, cuarentena, conteos = obtenido
+    assert len(validas) > 0 and len(cuarentena) > 0
+    pd.testing.assert_frame_equal(normalizar(validas), normalizar(esperado[0]))
+    pd.testing.assert_frame_equal(normalizar(cuarentena), normalizar(esperado[1]))
+    pd.testing.assert_series_equal(conteos, esperado[2])
+    assert resumen['tareas'] > 0 and len(resumen['por_worker']) == 2
+    assert contador.ejecuciones == 1 and contador.tareas > 0
+
+
+def test_contador_de_ejecuciones_con_cliente_distribuido(crudos):
+    ddf_est, _ = crudos
+    with scheduler_dask('local_cluster', n_workers=1, threads_por_worker=2) as client:
+        with ContadorEjecuciones(client) as contador:
+            ddf_est['estrato'].sum().compute()
+            dask.compute(ddf_est['estrato'].max(), ddf_est['puntaje_saber11'].max())
+    assert contador.ejecuciones == 2
+    assert contador.tareas >= 2 * ddf_est.npartitions
+
+
+def test_direccion_scheduler():
+    assert direccion_scheduler('localhost', 8786) == 'tcp://localhost:8786'
+    assert direccion_scheduler('10.0.0.5:9000', 8786) == 'tcp://10.0.0.5:9000'
+    assert direccion_scheduler('tls://scheduler:8786', 1) == 'tls://scheduler:8786'
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+from src.validation.validator import AcademicValidator
+
+
+def test_cuarentena_se_escribe_y_cuenta_las_violaciones(tmp_path, crudos):
+    ddf = DataTransformer(modo_perfil='un_shuffle').procesar(*crudos)
+    loader = DataLoader('sqlite://', perfil_parquet='lectura_analitica')
+    validas, cuarentena, conteos = AcademicValidator.separar_cuarentena(ddf)
+    ruta_validas = tmp_path / "master_table.parquet"
+    ruta_cuarentena = tmp_path / "quarantine.parquet"
+
+    loader.guardar_parquet(validas, str(ruta_validas))
+    loader.guardar_parquet(cuarentena, str(ruta_cuarentena))
+
+    df_cuarentena = DataLoader.leer_particiones(ruta_cuarentena)
+    esperado = AcademicValidator.validar_dataset(ddf)
+    assert esperado['saber11_rango'] > 0
+    assert len(df_cuarentena) == int((ddf['puntaje_saber11'] > 500).sum().compute())
+    assert len(DataLoader.leer_particiones(ruta_validas)) + len(df_cuarentena) == len(ddf)
+    pd.testing.assert_series_equal(conteos.compute().sort_index(), esperado.sort_index(), check_names=False)
+    pd.testing.assert_series_equal(
+        AcademicValidator.contar_cuarentena(df_cuarentena).sort_index(), esperado.sort_index(), check_names=False
+    )
@@ -0,0 +1,102 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import ROOT_DIR
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+
+sys.path.append(str(ROOT_DIR / "dashboard"))
+from components import data_loader
+from components.memo import CallbackMemo, memoize, normalize_inputs
+from components.metrics_cube import MetricsCube
+
+
+@pytest.fixture
+def tabla_maestra(crudos):
+    return DataTransformer(modo_perfil='un_shuffle').procesar(*crudos)
+
+
+@pytest.fixture
+def snapshot(tmp_path, tabla_maestra):
+    """(tabla maestra Parquet, snapshot Arrow escrito a partir de ella)"""
+    ruta = tmp_path / "master_table.parquet"
+    DataLoader('sqlite://').guardar_parquet(tabla_maestra, str(ruta))
+    DataLoader.guardar_snapshot_arrow(ruta, tmp_path / "master_table.arrow")
+    return ruta, tmp_path / "master_table.arrow"
+
+
+def test_snapshot_sin_copias_en_enteros_nulables_y_categoricas(snapshot):
+    ruta, ruta_snapshot = snapshot
+    tabla = pa.ipc.open_file(pa.memory_map(str(ruta_snapshot), 'r')).read_all()
+    df = data_loader._to_pandas(tabla)
+
+    # estrato tiene nulos; programa es diccionario: ambas columnas apuntan al archivo mapeado
+    assert tabla.column('estrato').null_count > 0
+    for columna in ['estrato', 'total_creditos_aprobados', 'programa', 'estudiante_id']:
+        mapeada = tabla.column(columna).chunk(0)
+        vista = df[columna].array.__arrow_array__().chunk(0)
+        assert [b.address for b in vista.buffers() if b] == [b.address for b in mapeada.buffers() if b]
+
+    esperado = pd.read_parquet(ruta)
+    for columna in esperado.columns:
+        pd.testing.assert_series_equal(df[columna].astype(esperado[columna].dtype), esperado[columna], check_index=False)
+
+
+def test_cohortes_del_cubo_sin_una_medida(tabla_maestra):
+    df = tabla_maestra.compute()
+    esperado = df.groupby('ultimo_semestre_cursado').agg(
+        estudiantes=('estudiante_id', 'count'), gpa=('promedio_ultimo_semestre', 'mean'),
+        creditos=('total_creditos_aprobados', 'mean'),
+    ).reset_index()
+
+    cohortes = MetricsCube(df.drop(columns=['total_materias_reprobadas'])).cohort_stats()
+    assert list(cohortes.columns) == [
+        'Semestre', 'Total Estudiantes', 'Promedio GPA', 'Créditos Promedio', 'Materias Reprobadas Promedio'
+    ]
+    np.testing.assert_array_equal(cohortes['Semestre'], esperado['ultimo_semestre_cursado'])
+    np.testing.assert_array_equal(cohortes['Total Estudiantes'], esperado['estudiantes'])
+    np.testing.assert_allclose(cohortes['Promedio GPA'], esperado['gpa'], rtol=1e-6)
+    np.testing.assert_allclose(cohortes['Créditos Promedio'], esperado['creditos'], rtol=1e-9)
+    assert cohortes['Materias Reprobadas Promedio'].isna().all()
+
+
+def test_memo_cuenta_aciertos_y_desaloja_lru_por_bytes():
+    bloque = np.zeros(1000, dtype=np.uint8)
+    cache = CallbackMemo(max_bytes=2500)
+    llamadas = []
+    version = ['v1']
+
+    @memoize(lambda: version[0], name='bloques', cache=cache)
+    def calcular(clave):
+        llamadas.append(clave)
+        return bloque.copy()
+
+    calcular('a'), calcular('b'), calcular('a')
+    assert llamadas == ['a', 'b']
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+    assert cache.stats()['bytes'] == 2000
+
+    # Un tercer bloque no cabe: sale 'b', el menos usado recientemente
+    calcular('c')
+    assert cache.stats()['evictions'] == 1 and cache.stats()['entries'] == 2
+    calcular('a'), calcular('c'), calcular('b')
+    assert llamadas == ['a', 'b', 'c', 'b']
+    assert cache.stats() == dict(cache.stats(), hits=3, misses=4, evictions=2, entries=2, bytes=2000)
+
+    # Una salida mayor que el límite no se guarda; otra versión de datos no reutiliza entradas
+    cache.put('enorme', np.zeros(3000, dtype=np.uint8))
+    assert cache.get('enorme') == (False, None)
+    version[0] = 'v2'
+    calcular('b')
+    assert llamadas[-1] == 'b' and len(llamadas) == 5
+
+
+def test_normalizacion_de_entradas():
+    # Multiselección: el orden no importa; rango (low, high): sí
+    assert normalize_inputs([10, 2]) == normalize_inputs({2, 10}) == normalize_inputs(['2', 10, 'Todos'])
+    assert normalize_inputs((2, 10)) != normalize_inputs((10, 2))
+    assert normalize_inputs('Todos', [], '', ['Todos'], None) == (None,) * 5
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+from src.features.matriz import ConstructorMatriz
+from src.models.scoring import EtapaScoring, MotorScoringLogistico
+from src.models.registro import RegistroModelos
+
+pytest.importorskip('sklearn')
+
+from src.models.entrenamiento import coeficientes_logistica, entrenar
+
+
+@pytest.fixture
+def matriz(tmp_path, crudos):
+    """(constructor, ruta de la tabla maestra, X, y, ids)"""
+    ddf_est, ddf_hist = crudos
+    ruta = tmp_path / "master_table.parquet"
+    DataLoader('sqlite://').guardar_parquet(DataTransformer(modo_perfil='un_shuffle').procesar(ddf_est, ddf_hist), str(ruta))
+    constructor = ConstructorMatriz(tmp_path / "features")
+    X, y, ids, _ = constructor.obtener(ruta, ddf_hist)
+    return constructor, ruta, X, y, ids
+
+
+def test_matriz_solo_con_semestres_anteriores_al_corte(matriz, crudos):
+    constructor, _, X, y, ids = matriz
+    hist = crudos[1].compute().astype({'estudiante_id': str, 'estado_academico': str}).reset_index(drop=True)
+    semestre = hist['semestre_ordinal'].astype('float64')
+    desercion = semestre[hist['estado_academico'] == 'Desertor'].groupby(hist['estudiante_id']).min()
+    ultimo = semestre.groupby(hist['estudiante_id']).max()
+    limite = desercion.reindex(ultimo.index).fillna(ultimo)
+    previos = hist[semestre < hist['estudiante_id'].map(limite)]
+    esperado = previos.groupby('estudiante_id').agg(
+        ultimo_semestre_cursado=('semestre_ordinal', 'max'),
+        total_creditos_aprobados=('creditos_aprobados', 'sum'),
+        total_materias_reprobadas=('materias_reprobadas', 'sum'),
+    ).astype('float32')
+
+    obtenido = pd.DataFrame(np.asarray(X), columns=constructor.features, index=ids.astype(str).to_numpy())
+    obtenido = obtenido.groupby(level=0).first()
+    assert len(obtenido) == len(y) > 0
+    assert set(obtenido.index) <= set(esperado.index)
+    pd.testing.assert_frame_equal(obtenido[esperado.columns], esperado.loc[obtenido.index], check_names=False)
+    # Ninguna fila ve el semestre de deserción y la etiqueta es la deserción siguiente
+    assert (obtenido['ultimo_semestre_cursado'] < limite.loc[obtenido.index]).all()
+    np.testing.assert_array_equal(y, ids.astype(str).isin(desercion.index).astype(np.int8).to_numpy())
+    assert 0 < y.sum() < len(y)
+
+
+def test_entrenar_registrar_cargar_puntuar(tmp_path, matriz):
+    constructor, ruta, X, y, _ = matriz
+    modelo, metricas = entrenar('logistica', X, y)
+    assert metricas['filas_train'] + metricas['filas_test'] == len(y)
+
+    registro = RegistroModelos(tmp_path / "models")
+    version = registro.guardar(
+        'desercion_logistica', modelo, constructor.features,
+        metadatos={'modelo': 'logistica', 'metricas': metricas},
+        coeficientes=coeficientes_logistica(modelo, constructor.features)
+    )
+    assert version == 'v0001'
+    assert registro.listar()[['modelo', 'version']].values.tolist() == [['desercion_logistica', 'v0001']]
+
+    master = pd.read_parquet(ruta)
+    esperado = modelo.predict_proba(constructor.construir_features(master))[:, 1]
+
+    cargado = registro.cargar('desercion_logistica')
+    np.testing.assert_allclose(cargado.puntuar(master).to_numpy(), esperado, rtol=1e-6)
+
+    # Los coeficientes exportados (escala original) reproducen el pipeline sin scikit-learn
+    motor = MotorScoringLogistico.cargar(registro.ruta_coeficientes('desercion_logistica'))
+    np.testing.assert_allclose(motor.puntuar(master)['prob_desercion_logistica_v0001'], esperado, atol=1e-5)
+
+    # Scoring por lotes del ETL con la última versión del registro
+    etapa = EtapaScoring.desde_configuracion(registro_dir=registro.raiz, modelos=['desercion_logistica'])
+    puntuada = etapa.aplicar(DataLoader.leer_parquet_dask(ruta)).compute()
+    np.testing.assert_allclose(puntuada['prob_desercion_logistica'].to_numpy(),
+                               cargado.puntuar(puntuada).to_numpy(), rtol=1e-6)
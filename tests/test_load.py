@@ -0,0 +1,145 @@
+import dask
+import dask.dataframe as dd
+import pandas as pd
+import pytest
+
+from conftest import escribir_crudos, generar_crudos, leer_crudos, normalizar
+from src.etl import load
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+from src.utils.ejecuciones import ContadorEjecuciones
+from src.validation.validator import AcademicValidator
+
+
+def modificar_crudos(estudiantes, historico):
+    """
+    Cambios entre dos corridas: semestre nuevo para algunos estudiantes, cambio de
+    programa y de estrato (mueve filas entre particiones Hive) y un estudiante eliminado.
+    Retorna los nuevos crudos y los ids afectados.
+    """
+    estudiantes, historico = estudiantes.copy(), historico.copy()
+    nuevos = historico[historico['estudiante_id'].isin(['E000001', 'E000002'])].groupby('estudiante_id').tail(1)
+    historico = pd.concat([historico, nuevos.assign(semestre_ordinal=nuevos['semestre_ordinal'] + 1,
+                                                    promedio_acumulado=4.44)])
+    estudiantes.loc[estudiantes['estudiante_id'] == 'E000003', 'programa'] = 'ARTES'
+    estudiantes.loc[estudiantes['estudiante_id'] == 'E000004', 'estrato'] = None
+    estudiantes = estudiantes[estudiantes['estudiante_id'] != 'E000005']
+    historico = historico[historico['estudiante_id'] != 'E000005']
+    return estudiantes, historico, ['E000001', 'E000002', 'E000003', 'E000004', 'E000005']
+
+
+@pytest.mark.parametrize('particiones', [None, ['programa'], ['programa', 'estrato']])
+def test_actualizacion_incremental_igual_a_reconstruccion(tmp_path, particiones):
+    loader = DataLoader('sqlite://', particiones=particiones, perfil_parquet='lectura_analitica')
+    transformer = DataTransformer(modo_perfil='un_shuffle')
+    estudiantes, historico = generar_crudos()
+    ruta_incremental = tmp_path / "incremental" / "master_table.parquet"
+    ruta_completa = tmp_path / "completa" / "master_table.parquet"
+
+    ddf_est, ddf_hist = leer_crudos(escribir_crudos(tmp_path / "antes", estudiantes, historico))
+    loader.guardar_parquet(transformer.procesar(ddf_est, ddf_hist), str(ruta_incremental))
+
+    estudiantes, historico, ids = modificar_crudos(estudiantes, historico)
+    ddf_est, ddf_hist = leer_crudos(escribir_crudos(tmp_path / "despues", estudiantes, historico))
+    delta = transformer.procesar_incremental(ddf_est, ddf_hist, ids)
+    loader.actualizar_parquet(delta, str(ruta_incremental), ids)
+    loader.guardar_parquet(transformer.procesar(ddf_est, ddf_hist), str(ruta_completa))
+
+    incremental = DataLoader.leer_particiones(ruta_incremental)
+    completa = DataLoader.leer_particiones(ruta_completa)
+    assert 'E000005' not in set(incremental['estudiante_id'])
+    pd.testing.assert_frame_equal(normalizar(incremental), normalizar(completa), check_dtype=False)
+
+
+def test_tabla_existente_se_concatena_con_el_delta(tmp_path, crudos):
+    ruta = tmp_path / "master_table.parquet"
+    ddf = DataTransformer(modo_perfil='un_shuffle').procesar(*crudos)
+    loader = DataLoader('sqlite://', particiones=['programa', 'estrato'])
+    loader.guardar_parquet(ddf, str(ruta))
+
+    existente = loader._leer_existente(ruta, ddf._meta)
+    # fusionar_particiones puede juntar en un archivo particiones de la tabla y del delta
+    fusionada = dd.concat([existente, ddf[list(existente.columns)]]).repartition(npartitions=1).compute()
+    assert len(fusionada) == 2 * len(ddf)
+
+
+def test_actualizaciones_que_comparten_el_delta_en_una_ejecucion(tmp_path):
+    loader = DataLoader('sqlite://', particiones=['programa'])
+    transformer = DataTransformer(modo_perfil='un_shuffle')
+    estudiantes, historico = generar_crudos()
+    rutas = [tmp_path / "master_table.parquet", tmp_path / "quarantine.parquet"]
+
+    ddf = transformer.procesar(*leer_crudos(escribir_crudos(tmp_path / "antes", estudiantes, historico)))
+    dask.compute(*[loader.guardar_parquet(parte, str(ruta), compute=False)
+                   for parte, ruta in zip(AcademicValidator.separar_cuarentena(ddf), rutas)])
+
+    estudiantes, historico, ids = modificar_crudos(estudiantes, historico)
+    ddf_est, ddf_hist = leer_crudos(escribir_crudos(tmp_path / "despues", estudiantes, historico))
+    lecturas = []
+
+    def contar(pdf):
+        lecturas.append(len(pdf))
+        return pdf
+
+    delta = transformer.procesar_incremental(ddf_est, ddf_hist.map_partitions(contar, meta=ddf_hist._meta), ids)
+    escrituras = [loader.actualizar_parquet(parte, str(ruta), ids, compute=False)
+                  for parte, ruta in zip(AcademicValidator.separar_cuarentena(delta), rutas)]
+    with ContadorEjecuciones() as contador:
+        dask.compute(*escrituras)
+
+    assert contador.ejecuciones == 1
+    assert len(lecturas) == ddf_hist.npartitions
+    completa = AcademicValidator.separar_cuarentena(transformer.procesar(ddf_est, ddf_hist))
+    for ruta, esperada in zip(rutas, completa):
+        pd.testing.assert_frame_equal(normalizar(DataLoader.leer_particiones(ruta)),
+                                      normalizar(esperada.compute()), check_dtype=False)
+
+
+def test_copia_por_particiones_en_lotes_de_max_conexiones(tmp_path, monkeypatch, crudos):
+    ruta = tmp_path / "master_table.parquet"
+    DataLoader('sqlite://').guardar_parquet(DataTransformer(modo_perfil='un_shuffle').procesar(*crudos), str(ruta))
+    ejecuciones, lotes, copiadas = [], [], []
+
+    def contar(pdf):
+        ejecuciones.append(len(pdf))
+        return pdf
+
+    ddf = DataLoader.leer_parquet_dask(ruta)
+    ddf = ddf.map_partitions(contar, meta=ddf._meta)
+    compute = dask.compute
+
+    def compute_por_lote(*args, **kwargs):
+        # Al calcular un lote, todas las particiones anteriores ya se copiaron
+        lotes.append((len(args), len(copiadas)))
+        return compute(*args, **kwargs)
+
+    loader = DataLoader('sqlite://', max_conexiones=3)
+    monkeypatch.setattr(load.dask, 'compute', compute_por_lote)
+    monkeypatch.setattr(loader, '_copiar_particion', lambda pdf, tabla, columnas: copiadas.append(pdf) or len(pdf))
+
+    filas = loader._copiar_particiones(ddf, 'master_table', list(ddf.columns))
+
+    assert ddf.npartitions > 3
+    assert max(n for n, _ in lotes) == 3 and sum(n for n, _ in lotes) == ddf.npartitions
+    assert [previas for _, previas in lotes] == list(range(0, ddf.npartitions, 3))
+    # Cada archivo se lee una sola vez
+    assert len(ejecuciones) == len(copiadas) == ddf.npartitions
+    assert filas == len(pd.read_parquet(ruta))
+
+
+def test_upsert_desempata_claves_repetidas_por_orden_de_carga(monkeypatch, crudos):
+    ddf_est, _ = crudos
+    loader = DataLoader('sqlite://')
+    copiadas, sentencias = [], []
+    monkeypatch.setattr(loader, '_crear_staging', lambda nombre, columnas, orden_carga=False: '"staging"')
+    monkeypatch.setattr(loader, '_copiar_particiones',
+                        lambda ddf, tabla, columnas: copiadas.append(ddf[columnas].compute()))
+    monkeypatch.setattr(loader, '_ejecutar', lambda *s: sentencias.extend(s) or [(0, 0, 0)])
+
+    loader.upsert_sql(ddf_est, 'estudiantes')
+
+    # Posición de cada fila en la fuente: única, creciente y con el número de partición arriba
+    orden = copiadas[0][load.ORDEN_CARGA]
+    assert len(orden) == len(ddf_est) and orden.is_unique and orden.is_monotonic_increasing
+    assert (orden // 2 ** 32).nunique() == ddf_est.npartitions > 1
+    assert f'ORDER BY "estudiante_id", "{load.ORDEN_CARGA}" DESC' in sentencias[0]
@@ -0,0 +1,84 @@
+import itertools
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.metrics import AcademicMetrics
+
+NAN = float('nan')
+PROMEDIOS = [NAN, -1.0, 0.0, 2.5, 2.9999999999999996, 3.0, 4.99, 5.0, 5.0000001, 7.5]
+TASAS = [NAN, -0.5, 0.0, 0.1, 1 / 3, 1.0, 1.5]
+SEMESTRES = [NAN, 0, 1, 2, 2.0000001, 3, 10]
+APROBADOS = [NAN, -10.0, 0.0, 1.0, 59.5, 160.0, 160.0000001, 500.0]
+TOTALES = [NAN, 0.0, -0.0, 1.0, 160.0, 170.0]
+
+
+def _escalares(funcion, *columnas):
+    return np.array([funcion(*fila) for fila in zip(*columnas)], dtype=np.float64)
+
+
+def _combinaciones(*valores):
+    return [list(columna) for columna in zip(*itertools.product(*valores))]
+
+
+def test_indice_riesgo_vectorizado_igual_a_escalar():
+    promedio, tasa, semestre = _combinaciones(PROMEDIOS, TASAS, SEMESTRES)
+    esperado = _escalares(AcademicMetrics.calcular_indice_riesgo, promedio, tasa, semestre)
+
+    obtenido = AcademicMetrics.calcular_indice_riesgo_vectorizado(
+        np.array(promedio), np.array(tasa), np.array(semestre)
+    )
+
+    assert np.isnan(esperado).any()
+    np.testing.assert_array_equal(obtenido, esperado)
+
+
+def test_tasa_progresion_vectorizada_igual_a_escalar():
+    aprobados, totales = _combinaciones(APROBADOS, TOTALES)
+    esperado = _escalares(AcademicMetrics.calcular_tasa_progresion, aprobados, totales)
+
+    obtenido = AcademicMetrics.calcular_tasa_progresion_vectorizada(np.array(aprobados), np.array(totales))
+
+    np.testing.assert_array_equal(obtenido, esperado)
+
+
+@pytest.mark.parametrize('promedio, tasa, semestre', [
+    (NAN, 0.2, 1), (3.0, NAN, 1), (3.0, 0.2, NAN), (0.0, 0.0, 2), (0.0, 0.0, 3), (5.0, 1.0, 1), (10.0, 0.0, 1),
+])
+def test_indice_riesgo_escalar_por_escalar(promedio, tasa, semestre):
+    esperado = AcademicMetrics.calcular_indice_riesgo(promedio, tasa, semestre)
+    obtenido = AcademicMetrics.calcular_indice_riesgo_vectorizado(promedio, tasa, semestre)
+    assert isinstance(obtenido, float)
+    np.testing.assert_array_equal(obtenido, esperado)
+
+
+@pytest.mark.parametrize('aprobados, totales', [(NAN, 0.0), (10.0, 0.0), (NAN, 160.0), (10.0, NAN), (200.0, 160.0)])
+def test_tasa_progresion_escalar_por_escalar(aprobados, totales):
+    esperado = AcademicMetrics.calcular_tasa_progresion(aprobados, totales)
+    obtenido = AcademicMetrics.calcular_tasa_progresion_vectorizada(aprobados, totales)
+    assert isinstance(obtenido, float)
+    np.testing.assert_array_equal(obtenido, esperado)
+
+
+def test_series_anulables_y_dask():
+    pdf = pd.DataFrame({
+        'promedio': pd.array([4.2, None, 1.0, 3.0], dtype='Float32'),
+        'tasa': [0.1, 0.2, 0.9, NAN],
+        'semestre': pd.array([1, 3, None, 2], dtype='Int8'),
+    }, index=[10, 11, 12, 13])
+    esperado = _escalares(
+        AcademicMetrics.calcular_indice_riesgo,
+        pdf['promedio'].to_numpy(dtype=np.float64, na_value=np.nan),
+        pdf['tasa'].to_numpy(),
+        pdf['semestre'].to_numpy(dtype=np.float64, na_value=np.nan),
+    )
+
+    serie = AcademicMetrics.calcular_indice_riesgo_vectorizado(pdf['promedio'], pdf['tasa'], pdf['semestre'])
+    ddf = dd.from_pandas(pdf, npartitions=2)
+    perezoso = AcademicMetrics.calcular_indice_riesgo_vectorizado(ddf['promedio'], ddf['tasa'], ddf['semestre'])
+
+    assert serie.index.equals(pdf.index)
+    np.testing.assert_array_equal(serie.to_numpy(), esperado)
+    np.testing.assert_array_equal(perezoso.compute().to_numpy(), esperado)
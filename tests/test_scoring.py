@@ -0,0 +1,45 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT_DIR
+from src.etl.transform import DataTransformer
+from src.models.scoring import BANDAS_RIESGO, EtapaScoring
+
+sys.path.append(str(ROOT_DIR / "dashboard"))
+from components.metrics import (
+    HIGH_RISK_SCORE, calculate_risk_score, calculate_risk_scores_vectorized, risk_levels
+)
+
+
+@pytest.fixture
+def tabla_maestra(crudos):
+    return DataTransformer(modo_perfil='un_shuffle').procesar(*crudos)
+
+
+def test_puntajes_del_etl_y_del_dashboard_coinciden(tabla_maestra):
+    puntuada = EtapaScoring().aplicar(tabla_maestra).compute()
+    df = puntuada.drop(columns=['risk_score', 'risk_level'])
+
+    scores = calculate_risk_scores_vectorized(df)
+    levels = risk_levels(scores)
+
+    np.testing.assert_array_equal(scores.to_numpy(), puntuada['risk_score'].to_numpy())
+    np.testing.assert_array_equal(levels.to_numpy(), puntuada['risk_level'].to_numpy())
+    assert set(levels) == {etiqueta for _, etiqueta in BANDAS_RIESGO}
+
+
+def test_version_fila_a_fila_del_dashboard(tabla_maestra):
+    df = tabla_maestra.head(50, npartitions=-1)
+    df.loc[df.index[0], 'promedio_ultimo_semestre'] = np.nan
+
+    por_fila = df.apply(calculate_risk_score, axis=1).to_numpy()
+
+    np.testing.assert_allclose(por_fila, calculate_risk_scores_vectorized(df).to_numpy(), rtol=0, atol=1e-12)
+
+
+def test_bandas_en_los_limites():
+    scores = pd.Series([0.0, 39.999, 40.0, 69.999, HIGH_RISK_SCORE, 100.0])
+    assert risk_levels(scores).tolist() == ['Bajo', 'Bajo', 'Medio', 'Medio', 'Alto', 'Alto']
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.validation.sketches import SketchKLL, error_rango_normalizado
+from src.validation.validator import AcademicValidator
+
+QS = np.linspace(0.01, 0.99, 99)
+
+
+def test_cota_de_error_de_datasketches():
+    assert error_rango_normalizado(200) == pytest.approx(0.0133, abs=1e-4)
+    assert error_rango_normalizado(200, dos_lados=True) == pytest.approx(0.0165, abs=1e-4)
+    assert SketchKLL(200).epsilon == error_rango_normalizado(200)
+
+
+@pytest.mark.parametrize('k', [50, 200])
+def test_error_de_rango_observado_dentro_de_la_cota(k):
+    errores = []
+    for semilla in range(10):
+        valores = np.random.default_rng(semilla).normal(size=100_000)
+        # Sketches por partición fusionados, como en limites_outliers_aproximados
+        sketch = SketchKLL(k, semilla=semilla)
+        for i, parte in enumerate(np.array_split(valores, 16)):
+            sketch.fusionar(SketchKLL(k, semilla=100 * semilla + i).actualizar(parte))
+        rangos = np.searchsorted(np.sort(valores), sketch.cuantiles(QS), side='right') / len(valores)
+        errores.append(np.abs(rangos - QS))
+
+    errores = np.concatenate(errores)
+    assert errores.max() > 0
+    assert np.mean(errores <= sketch.epsilon) >= 0.99
+
+
+def test_reporte_error_cuantiles_dentro_de_la_cota():
+    rng = np.random.default_rng(0)
+    muestra = pd.DataFrame({'grupo': rng.choice(['a', 'b'], 50_000), 'x': rng.exponential(size=50_000)})
+
+    reporte = AcademicValidator.reporte_error_cuantiles(muestra, 'x', por='grupo', qs=QS)
+
+    assert len(reporte) == 2 * len(QS)
+    assert (reporte['error_rango'] <= reporte['cota_error']).mean() >= 0.99
@@ -0,0 +1,74 @@
+import os
+import uuid
+
+import dask.dataframe as dd
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+
+# Ej. postgresql+psycopg2://postgres@localhost:5432/opitlearn_test
+DATABASE_URL = os.getenv("OPITLEARN_TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="OPITLEARN_TEST_DATABASE_URL no definida")
+
+
+@pytest.fixture
+def tabla():
+    """Nombre de tabla único; se elimina al terminar"""
+    nombre = f"prueba_{uuid.uuid4().hex[:8]}"
+    yield nombre
+    with create_engine(DATABASE_URL).begin() as conexion:
+        conexion.execute(text(f'DROP TABLE IF EXISTS "{nombre}"'))
+
+
+def leer_tabla(nombre):
+    return pd.read_sql_table(nombre, create_engine(DATABASE_URL))
+
+
+@pytest.mark.parametrize('staging', [True, False])
+def test_copy_desde_parquet(tmp_path, crudos, tabla, staging):
+    ruta = tmp_path / "master_table.parquet"
+    DataLoader('sqlite://', particiones=['programa']).guardar_parquet(DataTransformer().procesar(*crudos), str(ruta))
+    ddf = DataLoader.leer_parquet_dask(ruta, columnas=['estudiante_id', 'programa', 'promedio_ultimo_semestre'])
+    loader = DataLoader(DATABASE_URL, max_conexiones=2)
+
+    assert loader.guardar_en_sql_copy(ddf, tabla, staging=staging) == len(ddf)
+    # replace: la segunda carga no duplica filas
+    assert loader.guardar_en_sql_copy(ddf, tabla, if_exists='replace', staging=staging) == len(ddf)
+
+    orden = ['estudiante_id', 'promedio_ultimo_semestre']
+    cargada = leer_tabla(tabla).sort_values(orden).reset_index(drop=True)
+    esperada = ddf.compute().astype({'promedio_ultimo_semestre': 'float64'}).sort_values(orden).reset_index(drop=True)
+    assert len(cargada) == len(esperada)
+    assert (cargada['programa'] == esperada['programa'].astype(str)).all()
+    pd.testing.assert_series_equal(cargada['promedio_ultimo_semestre'], esperada['promedio_ultimo_semestre'],
+                                   check_exact=False, rtol=1e-6)
+
+
+def test_upsert_cuenta_insertadas_actualizadas_y_sin_cambios(tabla):
+    with create_engine(DATABASE_URL).begin() as conexion:
+        conexion.execute(text(f'CREATE TABLE "{tabla}" (estudiante_id text PRIMARY KEY, promedio double precision)'))
+    loader = DataLoader(DATABASE_URL, max_conexiones=2)
+
+    def fuente(filas):
+        pdf = pd.DataFrame(filas, columns=['estudiante_id', 'promedio'])
+        return dd.from_pandas(pdf, chunksize=4, sort=False)
+
+    inicial = fuente([('E1', 1.0), ('E2', 2.0), ('E3', 3.0), ('E4', 4.0)])
+    assert loader.upsert_sql(inicial, tabla, claves=['estudiante_id']) == {
+        'insertados': 4, 'actualizados': 0, 'sin_cambios': 0}
+
+    # Claves repetidas: gana la última fila de la fuente, dentro de una partición (E2)
+    # y entre particiones (E3, la segunda partición empieza en E5)
+    delta = fuente([('E1', 1.0), ('E2', 9.0), ('E3', 9.0), ('E2', 2.5), ('E5', 5.0), ('E3', 3.5)])
+    assert delta.npartitions == 2 and len(delta.partitions[0]) == 4
+    assert loader.upsert_sql(delta, tabla, claves=['estudiante_id']) == {
+        'insertados': 1, 'actualizados': 2, 'sin_cambios': 1}
+
+    cargada = leer_tabla(tabla).set_index('estudiante_id')['promedio'].sort_index()
+    assert cargada.to_dict() == {'E1': 1.0, 'E2': 2.5, 'E3': 3.5, 'E4': 4.0, 'E5': 5.0}
+    # Repetir el mismo delta no escribe nada
+    assert loader.upsert_sql(delta, tabla, claves=['estudiante_id']) == {
+        'insertados': 0, 'actualizados': 0, 'sin_cambios': 4}
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from conftest import normalizar
+from src.etl.transform import DataTransformer
+
+
+@pytest.fixture
+def perfiles(crudos):
+    ddf_est, ddf_hist = crudos
+    return {
+        modo: DataTransformer(modo_perfil=modo).procesar(ddf_est.copy(), ddf_hist)
+        for modo in DataTransformer.MODOS_PERFIL
+    }
+
+
+def test_modos_de_perfil_dan_la_misma_tabla(perfiles):
+    agrupado = perfiles['agrupado'].compute()
+    un_shuffle = perfiles['un_shuffle'].compute()
+    assert len(agrupado) > 0
+    pd.testing.assert_frame_equal(normalizar(agrupado), normalizar(un_shuffle), check_dtype=False)
+
+
+@pytest.mark.parametrize('modo', DataTransformer.MODOS_PERFIL)
+def test_filtro_posterior_sobre_varias_particiones(perfiles, modo):
+    ddf = perfiles[modo]
+    completo = ddf.compute()
+
+    filtrado = ddf[ddf['total_materias_reprobadas'] > 3].compute()
+
+    esperado = completo[completo['total_materias_reprobadas'] > 3]
+    assert 0 < len(filtrado) < len(completo)
+    pd.testing.assert_frame_equal(normalizar(filtrado), normalizar(esperado))
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from src.etl.load import DataLoader
+from src.etl.transform import DataTransformer
+from src.validation.reglas import REGLAS_ACADEMICAS
+from src.validation.validator import AcademicValidator
+
+REGLAS = REGLAS_ACADEMICAS + [
+    {'id': 'estrato_requerido', 'tipo': 'no_nulo', 'columna': 'estrato'},
+    {'id': 'programa_catalogo', 'tipo': 'referencial', 'columna': 'programa', 'valores': ('ARTES', 'MEDICINA')},
+]
+
+
+@pytest.mark.parametrize('particiones', [None, ['programa', 'estrato']])
+def test_validar_parquet_igual_a_validar_dataset(tmp_path, crudos, particiones):
+    ddf = DataTransformer(modo_perfil='un_shuffle').procesar(*crudos)
+    ruta = tmp_path / "master_table.parquet"
+    DataLoader('sqlite://', particiones=particiones, perfil_parquet='lectura_analitica').guardar_parquet(ddf, str(ruta))
+    if particiones:
+        # Estratos nulos: directorio estrato=__HIVE_DEFAULT_PARTITION__
+        assert any(ruta.rglob('estrato=__HIVE_DEFAULT_PARTITION__'))
+
+    esperado = AcademicValidator.validar_dataset(ddf, REGLAS)
+    conteos, resumen = AcademicValidator.validar_parquet(ruta, REGLAS)
+
+    assert esperado['estrato_requerido'] > 0
+    pd.testing.assert_series_equal(conteos.sort_index(), esperado.sort_index(), check_names=False)
+    assert resumen['row_groups'] > 0
@@ -1,15 +1,34 @@
-import pandas as pd
-
-# Load the curated data
-df = pd.read_parquet('data/curated/master_table.parquet')
-
-print('=== DATA QUALITY REPORT ===\n')
-print(f'Total Records: {len(df)}')
-print(f'Total Columns: {len(df.columns)}')
-print(f'\nColumns: {list(df.columns)}')
-print(f'\nMissing Values:\n{df.isnull().sum()}')
-print(f'\nUnique Students: {df["estudiante_id"].nunique()}')
-print(f'\nPrograms Distribution:')
-print(df['programa'].value_counts())
-print(f'\nSample Data (first 3 rows):')
-print(df.head(3))
+"""
+Reporte de calidad de la tabla maestra.
+
+Recorre master_table.parquet por lotes (memoria acotada) en lugar de cargarlo
+completo. Con --json guarda el reporte para compararlo entre ejecuciones.
+
+Uso:
+    python verify_data.py [--ruta data/curated/master_table.parquet] [--json reporte.json]
+"""
+import argparse
+import json
+
+from src.validation.reporte_calidad import generar_reporte, formatear_reporte
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ruta', default='data/curated/master_table.parquet')
+    parser.add_argument('--json', help='Ruta donde guardar el reporte en JSON')
+    parser.add_argument('--conteos', nargs='*', default=['programa'],
+                        help='Columnas con distribución de valores')
+    args = parser.parse_args()
+
+    reporte = generar_reporte(args.ruta, columnas_conteo=args.conteos)
+    print(formatear_reporte(reporte))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False, sort_keys=True, default=str)
+        print(f"\nReporte JSON: {args.json}")
+
+
+if __name__ == '__main__':
+    main()